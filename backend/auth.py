@@ -1,35 +1,121 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from jose import JWTError, jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from database import get_db
+from typing import Optional, Tuple
+from database import get_db, get_async_db
 from models import User
+from cache import TTLCache
+from hashing import password_hasher, HashingPoolFull, HashingPoolBroken
+import hashing
+import hashlib
 import os
+import time
 
 # Security config
 SECRET_KEY = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-# Password hashing - using sha256_crypt to avoid bcrypt 72-byte limit
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
-
 # Bearer token
 security = HTTPBearer()
 
+# Principal cache - skips the users lookup for tokens seen recently
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "4096"))
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+principal_cache = TTLCache(max_entries=AUTH_CACHE_MAX_ENTRIES, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached, read-only snapshot of the authenticated user"""
+    id: str
+    email: str
+    full_name: Optional[str] = None
+    avatar_url: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            avatar_url=user.avatar_url
+        )
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def invalidate_user(user_id: str) -> int:
+    """Drop every cached principal for a user"""
+    return principal_cache.discard_where(lambda principal: principal.id == user_id)
+
+
+# Evict once the change commits: evicting at flush would let a concurrent
+# request re-cache the old committed row before the commit lands
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _note_principal_change(mapper, connection, target):
+    object_session(target).info.setdefault("changed_principals", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_principals(session):
+    for user_id in session.info.pop("changed_principals", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_principals(session):
+    session.info.pop("changed_principals", None)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # Encode and truncate password to 72 bytes for bcrypt compatibility
-    plain_password = plain_password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.verify(plain_password, hashed_password)
+    return hashing.verify_password(plain_password, hashed_password)[0]
 
 
 def get_password_hash(password: str) -> str:
-    # Encode and truncate password to 72 bytes for bcrypt compatibility
-    password = password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
-    return pwd_context.hash(password)
+    return hashing.hash_password(password)
+
+
+hashing_busy_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Too many concurrent sign-ins, please retry shortly",
+    headers={"Retry-After": "1"},
+)
+
+hashing_unavailable_exception = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Sign-in is temporarily unavailable, please retry shortly",
+    headers={"Retry-After": "1"},
+)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash on the password worker pool; 503 when the pool is saturated or a worker died"""
+    try:
+        return await password_hasher.hash(password)
+    except HashingPoolFull:
+        raise hashing_busy_exception
+    except HashingPoolBroken:
+        raise hashing_unavailable_exception
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify on the password worker pool; returns (valid, new_hash_if_rehash_due)"""
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HashingPoolFull:
+        raise hashing_busy_exception
+    except HashingPoolBroken:
+        raise hashing_unavailable_exception
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
@@ -39,29 +125,67 @@ def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _decode_token(token: str) -> dict:
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    if payload.get("sub") is None:
+        raise credentials_exception
+    return payload
+
+
+def _cache_principal(cache_key: str, payload: dict, user: User) -> CurrentUser:
+    principal = CurrentUser.from_model(user)
+    # Never serve a cached principal past the token's own expiry
+    exp = payload.get("exp")
+    principal_cache.set(cache_key, principal, ttl_seconds=exp - time.time() if exp else None)
+    return principal
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """Dependency to get current authenticated user"""
     token = credentials.credentials
+    cache_key = _token_key(token)
     
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+    payload = _decode_token(token)
+    user = db.query(User).filter(User.id == payload["sub"]).first()
+    if user is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    return _cache_principal(cache_key, payload, user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> CurrentUser:
+    """Async variant of get_current_user for routes on the AsyncSession path"""
+    token = credentials.credentials
+    cache_key = _token_key(token)
+    
+    cached = principal_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    payload = _decode_token(token)
+    result = await db.execute(select(User).where(User.id == payload["sub"]))
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
     
-    return user
+    return _cache_principal(cache_key, payload, user)
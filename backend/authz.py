@@ -0,0 +1,133 @@
+"""
+Team membership and access checks shared by the routers.
+
+A user's memberships (team_id -> role) are loaded with one query and kept in
+a per-process TTL cache, so team-scoped requests normally skip the
+team_members lookup entirely. FastAPI resolves get_memberships once per
+request, however many checks a handler makes. Writes to team_members drop the
+affected users' entries once they commit (dropping them at flush would let a
+concurrent request re-cache the old rows before the commit lands); other
+workers catch up within the TTL.
+"""
+from fastapi import Depends, HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from database import get_db, get_async_db
+from models import Decision, TeamMember, User
+from auth import get_current_user, get_current_user_async
+from cache import TTLCache
+import os
+
+MEMBERSHIP_CACHE_MAX_ENTRIES = int(os.getenv("MEMBERSHIP_CACHE_MAX_ENTRIES", "4096"))
+MEMBERSHIP_CACHE_TTL_SECONDS = float(os.getenv("MEMBERSHIP_CACHE_TTL_SECONDS", "30"))
+
+membership_cache = TTLCache(max_entries=MEMBERSHIP_CACHE_MAX_ENTRIES, ttl_seconds=MEMBERSHIP_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class Memberships:
+    """Read-only snapshot of the teams a user belongs to and their role in each"""
+    user_id: str
+    roles: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def team_ids(self) -> FrozenSet[str]:
+        return frozenset(self.roles)
+
+    def is_member(self, team_id: Optional[str]) -> bool:
+        return team_id is not None and team_id in self.roles
+
+    def role(self, team_id: str) -> Optional[str]:
+        return self.roles.get(team_id)
+
+    def require_member(self, team_id: str, detail: str = "Not a member of this team"):
+        if not self.is_member(team_id):
+            raise HTTPException(status_code=403, detail=detail)
+
+    def can_access(self, owner_id: str, team_id: Optional[str]) -> bool:
+        """Owner OR member of the row's team"""
+        return owner_id == self.user_id or self.is_member(team_id)
+
+    def require_access(self, owner_id: str, team_id: Optional[str], detail: str = "Not authorized"):
+        if not self.can_access(owner_id, team_id):
+            raise HTTPException(status_code=403, detail=detail)
+
+    def accessible(self, rows: Iterable) -> List:
+        """Batch check: the rows (anything with user_id and team_id) the user may see"""
+        return [row for row in rows if self.can_access(row.user_id, row.team_id)]
+
+
+def membership_query(user_id: str):
+    return select(TeamMember.team_id, TeamMember.role).where(TeamMember.user_id == user_id)
+
+
+def invalidate_memberships(*user_ids: str):
+    for user_id in user_ids:
+        membership_cache.pop(user_id)
+
+
+@event.listens_for(TeamMember, "after_insert")
+@event.listens_for(TeamMember, "after_update")
+@event.listens_for(TeamMember, "after_delete")
+def _note_membership_change(mapper, connection, target):
+    """Remember whose memberships changed in this transaction (old and new user on a move)"""
+    changed = object_session(target).info.setdefault("changed_memberships", set())
+    history = get_history(target, "user_id")
+    changed.update(user_id for user_id in (target.user_id, *history.deleted) if user_id is not None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_memberships(session):
+    invalidate_memberships(*session.info.pop("changed_memberships", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_memberships(session):
+    session.info.pop("changed_memberships", None)
+
+
+def load_memberships(db: Session, user_id: str) -> Memberships:
+    memberships = membership_cache.get(user_id)
+    if memberships is None:
+        memberships = Memberships(user_id, dict(db.execute(membership_query(user_id)).all()))
+        membership_cache.set(user_id, memberships)
+    return memberships
+
+
+def get_memberships(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+) -> Memberships:
+    """Per-request membership resolver (memberships come from the primary)"""
+    return load_memberships(db, current_user.id)
+
+
+async def get_memberships_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+) -> Memberships:
+    memberships = membership_cache.get(current_user.id)
+    if memberships is None:
+        result = await db.execute(membership_query(current_user.id))
+        memberships = Memberships(current_user.id, dict(result.all()))
+        membership_cache.set(current_user.id, memberships)
+    return memberships
+
+
+def decision_owners_query(decision_ids: Iterable[str]):
+    """Owner and team of each decision, for batch access checks"""
+    return select(Decision.id, Decision.user_id, Decision.team_id).where(Decision.id.in_(set(decision_ids)))
+
+
+def require_decision_access(db: Session, memberships: Memberships, decision_id: str, action: str = "access"):
+    """404 if the decision is missing, 403 unless the user owns it or is in its team.
+    Async handlers use: await db.run_sync(require_decision_access, memberships, decision_id)"""
+    owner = db.execute(decision_owners_query([decision_id])).first()
+    if owner is None:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    memberships.require_access(owner.user_id, owner.team_id, f"Not authorized to {action} this decision")
+    return owner
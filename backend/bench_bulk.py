@@ -0,0 +1,80 @@
+"""
+Bulk decision benchmark for DecisionLog
+Creates, updates and deletes the same number of decisions twice: once with
+one HTTP call per decision and once through POST /decisions/bulk. Run against
+a live server:
+
+    python bench_bulk.py [count]
+"""
+import requests
+import random
+import string
+import sys
+import time
+
+BASE_URL = "http://localhost:8000"
+
+
+def random_email():
+    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"bench_{suffix}@example.com"
+
+
+def setup():
+    """Register a fresh account and return its auth headers"""
+    res = requests.post(f"{BASE_URL}/auth/register", json={
+        "email": random_email(), "password": "benchpass123", "full_name": "Bench User"
+    }, timeout=30)
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def single_calls(session, headers, count):
+    def create():
+        return [session.post(f"{BASE_URL}/decisions/", json={"title": f"Single {i}"}, headers=headers).json()["id"]
+                for i in range(count)]
+    create_time, ids = timed(create)
+    update_time, _ = timed(lambda: [
+        session.put(f"{BASE_URL}/decisions/{i}", json={"status": "reviewed"}, headers=headers) for i in ids
+    ])
+    delete_time, _ = timed(lambda: [session.delete(f"{BASE_URL}/decisions/{i}", headers=headers) for i in ids])
+    return create_time, update_time, delete_time
+
+
+def bulk_calls(session, headers, count):
+    def bulk(operations):
+        res = session.post(f"{BASE_URL}/decisions/bulk", json={"operations": operations}, headers=headers)
+        res.raise_for_status()
+        return res.json()["results"]
+    create_time, results = timed(lambda: bulk([
+        {"op": "create", "data": {"title": f"Bulk {i}"}} for i in range(count)
+    ]))
+    ids = [r["id"] for r in results]
+    update_time, _ = timed(lambda: bulk([{"op": "update", "id": i, "data": {"status": "reviewed"}} for i in ids]))
+    delete_time, _ = timed(lambda: bulk([{"op": "delete", "id": i} for i in ids]))
+    return create_time, update_time, delete_time
+
+
+def run_benchmark(count=200):
+    headers = setup()
+    session = requests.Session()
+    single = single_calls(session, headers, count)
+    batched = bulk_calls(session, headers, count)
+
+    print("\n" + "=" * 70)
+    print(f"{count} decisions: single-item calls vs POST /decisions/bulk")
+    print("=" * 70)
+    for name, one, many in zip(("create", "update", "delete"), single, batched):
+        print(f"{name:<8} single={one * 1000:9.1f}ms  bulk={many * 1000:9.1f}ms  speedup={one / many:6.1f}x")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    run_benchmark(count)
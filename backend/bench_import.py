@@ -0,0 +1,86 @@
+"""
+Bulk import benchmark for DecisionLog
+Generates NDJSON files of synthetic decisions (about a fifth of them tagged)
+and imports each through importer.run_import, the code path behind
+POST /decisions/import, reporting rows per second. Runs in-process against
+DATABASE_URL, by default a scratch SQLite file that is recreated each run:
+
+    python bench_import.py [count ...]      # default: 10000 100000 1000000
+"""
+import os
+import sys
+import tempfile
+
+SCRATCH_DB = os.path.join(tempfile.gettempdir(), "bench_import.db")
+if "DATABASE_URL" not in os.environ:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(SCRATCH_DB + suffix):
+            os.remove(SCRATCH_DB + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{SCRATCH_DB}"
+
+import json
+import random
+import time
+from database import Base, SessionLocal, engine
+from migrations import run_migrations
+from models import User
+from importer import IMPORT_BATCH_SIZE, run_import
+
+STATUSES = ["pending", "in_progress", "reviewed", "done"]
+OUTCOMES = ["success", "failure", "unknown"]
+TAGS = [f"tag-{n}" for n in range(50)]
+
+
+def write_input(path, count):
+    rng = random.Random(count)
+    with open(path, "w") as f:
+        for i in range(count):
+            record = {
+                "title": f"Imported decision {i}",
+                "context": "Background " * rng.randint(1, 20),
+                "choice_made": f"Option {rng.randint(1, 4)}",
+                "confidence_level": rng.randint(1, 5),
+                "status": rng.choice(STATUSES),
+                "outcome": rng.choice(OUTCOMES),
+            }
+            if rng.random() < 0.2:
+                record["tags"] = rng.sample(TAGS, 2)
+            f.write(json.dumps(record) + "\n")
+
+
+def setup():
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    with SessionLocal() as db:
+        user = User(email=f"bench_import_{random.randint(0, 10**9)}@example.com", password_hash="x", full_name="Bench")
+        db.add(user)
+        db.commit()
+        return user.id
+
+
+def run_benchmark(counts):
+    user_id = setup()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in counts:
+            path = os.path.join(tmp, f"{count}.ndjson")
+            write_input(path, count)
+            with SessionLocal() as db, open(path) as f:
+                start = time.perf_counter()
+                summary = run_import(db, f, "ndjson", user_id)
+                elapsed = time.perf_counter() - start
+            if summary["error"] or summary["imported"] != count:
+                raise SystemExit(f"Import of {count} rows failed: {summary}")
+            results.append((count, elapsed))
+
+    print("\n" + "=" * 70)
+    print(f"Bulk import into {engine.dialect.name}, batches of {IMPORT_BATCH_SIZE}")
+    print("=" * 70)
+    for count, elapsed in results:
+        print(f"{count:>9} rows  {elapsed:8.2f}s  {count / elapsed:10.0f} rows/s")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    run_benchmark(counts)
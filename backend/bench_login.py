@@ -0,0 +1,111 @@
+"""
+Login storm benchmark for DecisionLog
+Hammers /auth/login from many threads while a probe measures the latency of
+an ordinary authenticated endpoint. Run against a live server:
+
+    python bench_login.py [concurrency] [seconds]
+
+Compare runs with PASSWORD_HASH_WORKERS=0 (hash on the request threadpool)
+and the default process pool on the server side.
+"""
+import requests
+import random
+import string
+import sys
+import threading
+import time
+
+BASE_URL = "http://localhost:8000"
+
+PASSWORD = "benchpass123"
+
+
+def random_email():
+    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"bench_{suffix}@example.com"
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(name, samples):
+    print(f"{name:<22} n={len(samples):<6} "
+          f"p50={percentile(samples, 50) * 1000:8.1f}ms "
+          f"p95={percentile(samples, 95) * 1000:8.1f}ms "
+          f"p99={percentile(samples, 99) * 1000:8.1f}ms")
+
+
+def setup():
+    """Register one account to log in with and return (email, token)"""
+    email = random_email()
+    res = requests.post(f"{BASE_URL}/auth/register", json={
+        "email": email, "password": PASSWORD, "full_name": "Bench User"
+    }, timeout=30)
+    res.raise_for_status()
+    return email, res.json()["access_token"]
+
+
+def login_worker(email, stop, latencies, statuses):
+    session = requests.Session()
+    while not stop.is_set():
+        start = time.perf_counter()
+        res = session.post(f"{BASE_URL}/auth/login", json={"email": email, "password": PASSWORD}, timeout=60)
+        elapsed = time.perf_counter() - start
+        statuses.append(res.status_code)
+        if res.status_code == 200:
+            latencies.append(elapsed)
+
+
+def probe_worker(token, stop, latencies):
+    session = requests.Session()
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        session.get(f"{BASE_URL}/decisions/", headers=headers, timeout=60)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.05)
+
+
+def run_benchmark(concurrency=32, seconds=15):
+    email, token = setup()
+
+    # Baseline probe latency with no login traffic
+    idle = []
+    stop = threading.Event()
+    probe = threading.Thread(target=probe_worker, args=(token, stop, idle))
+    probe.start()
+    time.sleep(3)
+    stop.set()
+    probe.join()
+
+    login_latencies, statuses, busy = [], [], []
+    stop = threading.Event()
+    threads = [threading.Thread(target=login_worker, args=(email, stop, login_latencies, statuses))
+               for _ in range(concurrency)]
+    threads.append(threading.Thread(target=probe_worker, args=(token, stop, busy)))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    print("\n" + "=" * 70)
+    print(f"Login storm: {concurrency} clients for {seconds}s")
+    print("=" * 70)
+    summarize("login (200)", login_latencies)
+    print(f"{'login 503 rejections':<22} {statuses.count(503)} of {len(statuses)}")
+    summarize("GET /decisions/ idle", idle)
+    summarize("GET /decisions/ storm", busy)
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    seconds = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    run_benchmark(concurrency, seconds)
@@ -0,0 +1,90 @@
+"""
+Vote concurrency benchmark for DecisionLog
+Many threads cast votes on one decision at once: each voter's casts race
+each other (double clicks) and every voter races everyone else (a busy
+team decision). Reports throughput, latency percentiles and failures, then
+checks that each voter ended up with exactly one vote and that the tallies
+add up. Run against a live server:
+
+    python bench_votes.py [voters] [casts_per_voter] [threads]
+"""
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import random
+import statistics
+import string
+import sys
+import time
+
+BASE_URL = "http://localhost:8000"
+CHOICES = ["approve", "reject", "abstain"]
+
+
+def random_email():
+    suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    return f"bench_{suffix}@example.com"
+
+
+def register():
+    res = requests.post(f"{BASE_URL}/auth/register", json={
+        "email": random_email(), "password": "benchpass123", "full_name": "Bench Voter"
+    }, timeout=30)
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+
+def setup(voters):
+    """A team with `voters` members and one team decision for them to vote on"""
+    owner = register()
+    team = requests.post(f"{BASE_URL}/teams/", json={"name": "Vote bench"}, headers=owner, timeout=30).json()
+    members = [owner]
+    for _ in range(voters - 1):
+        headers = register()
+        requests.post(f"{BASE_URL}/teams/join", json={"invite_code": team["invite_code"]}, headers=headers, timeout=30).raise_for_status()
+        members.append(headers)
+    decision = requests.post(f"{BASE_URL}/decisions/", json={"title": "Contested", "team_id": team["id"]},
+                             headers=owner, timeout=30).json()
+    return decision["id"], members
+
+
+def run_benchmark(voters=8, casts=25, threads=16):
+    decision_id, members = setup(voters)
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=threads))
+    jobs = [(headers, random.choice(CHOICES)) for headers in members for _ in range(casts)]
+    random.shuffle(jobs)
+
+    def cast(job):
+        headers, choice = job
+        start = time.perf_counter()
+        try:
+            status = session.post(f"{BASE_URL}/votes/", json={"decision_id": decision_id, "vote": choice}, headers=headers).status_code
+        except requests.RequestException:
+            status = None  # e.g. the server dropped the connection on an unhandled error
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(cast, jobs))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    failures = sum(1 for _, status in results if status != 200)
+    summary = session.get(f"{BASE_URL}/votes/decision/{decision_id}", headers=members[0]).json()
+    tallied = sum(summary[f"{choice}_count"] for choice in CHOICES)
+    consistent = tallied == len(summary["voters"]) == voters
+
+    print("\n" + "=" * 70)
+    print(f"{len(jobs)} casts by {voters} voters on one decision, {threads} threads")
+    print("=" * 70)
+    print(f"throughput  {len(jobs) / elapsed:8.1f} casts/s")
+    print(f"latency     p50={statistics.median(latencies) * 1000:.1f}ms  "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms  max={latencies[-1] * 1000:.1f}ms")
+    print(f"failures    {failures}")
+    print(f"final rows  {len(summary['voters'])} voters, tallies sum to {tallied} ({'ok' if consistent else 'MISMATCH'})")
+    print("=" * 70 + "\n")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:4]]
+    run_benchmark(*args)
@@ -0,0 +1,33 @@
+"""
+Opaque keyset cursors shared by the paginated endpoints. A cursor is the
+sort key of the last row served, JSON-encoded and base64url'd; a malformed
+one is a 400.
+"""
+from fastapi import HTTPException
+from datetime import datetime
+import base64
+import json
+
+
+def pack_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def unpack_cursor(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(row) -> str:
+    """Keyset cursor for the (created_at, id) position of a row"""
+    return pack_cursor([row.created_at.isoformat(), row.id])
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, row_id = unpack_cursor(cursor)
+        if not isinstance(row_id, str):
+            raise TypeError("cursor id must be a string")
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -1,23 +1,247 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from fastapi import Request
+from cache import TTLCache
+import bisect
+import hashlib
 import os
+import threading
+import time
 
 # SQLite database file
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./decisionlog.db")
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
 
-# Create engine
-connect_args = {}
-if SQLALCHEMY_DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
+# Connection pool. pool_size + max_overflow should cover
+# the worker threadpool, otherwise requests queue on checkout; main.py
+# checks this at startup.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "30"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Async request path (AsyncSession on aiosqlite / asyncpg). When enabled,
+# main.py mounts the async auth, chat, votes and decisions routers.
+ASYNC_DB = os.getenv("ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+# SQLite performance profile, applied to every new connection.
+# SQLITE_PROFILE=default keeps SQLite's own settings; individual pragmas can
+# be overridden with SQLITE_PRAGMA_<NAME>, e.g. SQLITE_PRAGMA_MMAP_SIZE=0.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_PROFILES = {
+    "performance": {
+        "journal_mode": "WAL",       # readers no longer block on writers
+        "synchronous": "NORMAL",     # fsync at checkpoints, not every commit
+        "cache_size": -64000,        # page cache in KiB (64 MB)
+        "mmap_size": 268435456,      # 256 MB memory-mapped reads
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,        # ms to wait for a lock before SQLITE_BUSY
+    },
+    "default": {},
+}
+SQLITE_PRAGMA_NAMES = ["journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout"]
+# Prepared statements kept per connection by the sqlite3 driver
+SQLITE_STATEMENT_CACHE_SIZE = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+# Compiled SQL kept by SQLAlchemy per engine
+QUERY_CACHE_SIZE = int(os.getenv("SQLALCHEMY_QUERY_CACHE_SIZE", "500"))
+
+
+def _sqlite_pragmas() -> dict:
+    if SQLITE_PROFILE not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE {SQLITE_PROFILE!r}, expected one of {list(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[SQLITE_PROFILE])
+    for name in SQLITE_PRAGMA_NAMES:
+        override = os.getenv(f"SQLITE_PRAGMA_{name.upper()}")
+        if override:
+            pragmas[name] = override
+    return pragmas
+
+
+SQLITE_PRAGMAS = _sqlite_pragmas() if IS_SQLITE else {}
+
+
+class CheckoutWaitHistogram:
+    """Cumulative histogram of time spent waiting for a pooled connection"""
+
+    BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+            self.total = 0
+            self.sum_ms = 0.0
+            self.max_ms = 0.0
+            self.timeouts = 0
+
+    def observe(self, wait_ms: float):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.BUCKETS_MS, wait_ms)] += 1
+            self.total += 1
+            self.sum_ms += wait_ms
+            self.max_ms = max(self.max_ms, wait_ms)
+
+    def timed_out(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{b}ms" for b in self.BUCKETS_MS] + ["gt_5000ms"]
+            return {
+                "buckets": dict(zip(labels, self.counts)),
+                "count": self.total,
+                "mean_ms": round(self.sum_ms / self.total, 3) if self.total else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+pool_checkout_wait = CheckoutWaitHistogram()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited"""
 
+    histogram = pool_checkout_wait
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.histogram.timed_out()
+            raise
+        finally:
+            self.histogram.observe((time.perf_counter() - start) * 1000)
+
+
+read_pool_checkout_wait = CheckoutWaitHistogram()
+
+
+class ReadReplicaQueuePool(InstrumentedQueuePool):
+    histogram = read_pool_checkout_wait
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or "mode=memory" in url or url.rstrip("/") == "sqlite:")
+
+
+def _connect_args(url: str) -> dict:
+    if not url.startswith("sqlite"):
+        return {}
+    return {
+        "check_same_thread": False,
+        "cached_statements": SQLITE_STATEMENT_CACHE_SIZE
+    }
+
+
+def _pool_args(url: str, poolclass=None) -> dict:
+    # In-memory SQLite keeps SQLAlchemy's single-connection pool
+    pool_args = {}
+    if not _is_sqlite_memory(url):
+        pool_args = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+        if poolclass is not None:
+            pool_args["poolclass"] = poolclass
+    if not url.startswith("sqlite"):
+        pool_args["pool_recycle"] = DB_POOL_RECYCLE
+        pool_args["pool_pre_ping"] = DB_POOL_PRE_PING
+    return pool_args
+
+
+def _sqlite_pragma_hook(pragmas: dict):
+    def apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return apply_sqlite_pragmas
+
+
+# Create engine
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args=connect_args
+    SQLALCHEMY_DATABASE_URL,
+    connect_args=_connect_args(SQLALCHEMY_DATABASE_URL),
+    query_cache_size=QUERY_CACHE_SIZE,
+    **_pool_args(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool)
 )
 
+if IS_SQLITE:
+    event.listen(engine, "connect", _sqlite_pragma_hook(SQLITE_PRAGMAS))
+
+# Read replica for safe GET handlers. Point READ_DATABASE_URL at a replica, or
+# for local testing at the primary SQLite file opened read-only, e.g.
+# sqlite:///file:./decisionlog.db?mode=ro&uri=true
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# After a write, a client's reads stay on the primary for this many seconds
+READ_STICKY_SECONDS = float(os.getenv("READ_STICKY_SECONDS", "0"))
+# journal_mode is a write; the primary owns it
+READ_SQLITE_PRAGMAS = {k: v for k, v in _sqlite_pragmas().items() if k != "journal_mode"}
+
+read_engine = None
+if READ_DATABASE_URL:
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        connect_args=_connect_args(READ_DATABASE_URL),
+        query_cache_size=QUERY_CACHE_SIZE,
+        **_pool_args(READ_DATABASE_URL, ReadReplicaQueuePool)
+    )
+    if READ_DATABASE_URL.startswith("sqlite"):
+        event.listen(read_engine, "connect", _sqlite_pragma_hook(READ_SQLITE_PRAGMAS))
+
+
+def sqlite_pragma_report() -> dict:
+    """Effective values of the profile pragmas, as seen by a pooled connection"""
+    if not IS_SQLITE:
+        return {}
+    with engine.connect() as conn:
+        report = {name: conn.exec_driver_sql(f"PRAGMA {name}").scalar() for name in SQLITE_PRAGMA_NAMES}
+    report["profile"] = SQLITE_PROFILE
+    report["statement_cache_size"] = SQLITE_STATEMENT_CACHE_SIZE
+    return report
+
+
+def pool_capacity(target_engine=None):
+    """Most connections the pool will hand out at once (None = unbounded)"""
+    pool = (target_engine or engine).pool
+    if not isinstance(pool, QueuePool):
+        return None
+    return pool.size() + pool._max_overflow if pool._max_overflow > -1 else None
+
+
+def pool_status(target_engine=None) -> dict:
+    """Current occupancy of an engine's connection pool (primary by default)"""
+    pool = (target_engine or engine).pool
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    status = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "capacity": pool_capacity(target_engine),
+        "timeout": pool.timeout(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        status["checkout_wait"] = pool.histogram.snapshot()
+    return status
+
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
 
 # Base class for models
 Base = declarative_base()
@@ -29,3 +253,102 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Clients (by Authorization header) that wrote within READ_STICKY_SECONDS
+recent_writers = TTLCache(max_entries=10000, ttl_seconds=READ_STICKY_SECONDS)
+
+
+def _client_key(request: Request):
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()
+
+
+def note_write(request: Request):
+    """Pin this client's reads to the primary for the stickiness window"""
+    key = _client_key(request)
+    if key and READ_STICKY_SECONDS > 0:
+        recent_writers.set(key, True)
+
+
+def _use_primary_for_read(request: Request) -> bool:
+    key = _client_key(request)
+    return key is not None and recent_writers.get(key) is not None
+
+
+# Dependency for read-only handlers: replica when configured, unless the
+# client wrote recently (read-your-writes)
+def get_read_db(request: Request):
+    if ReadSessionLocal is None or _use_primary_for_read(request):
+        db = SessionLocal()
+    else:
+        db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver"""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect in ("postgres", "postgresql"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncReadSessionLocal = None
+
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        query_cache_size=QUERY_CACHE_SIZE,
+        **_pool_args(SQLALCHEMY_DATABASE_URL)
+    )
+
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", _sqlite_pragma_hook(SQLITE_PRAGMAS))
+
+    # expire_on_commit=False: attribute access after commit must not trigger IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    if READ_DATABASE_URL:
+        async_read_engine = create_async_engine(
+            _async_database_url(READ_DATABASE_URL),
+            query_cache_size=QUERY_CACHE_SIZE,
+            **_pool_args(READ_DATABASE_URL)
+        )
+        if READ_DATABASE_URL.startswith("sqlite"):
+            event.listen(async_read_engine.sync_engine, "connect", _sqlite_pragma_hook(READ_SQLITE_PRAGMAS))
+        AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+# Dependency to get an async DB session
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set ASYNC_DB=true")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Async counterpart of get_read_db
+async def get_async_read_db(request: Request):
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database path is disabled; set ASYNC_DB=true")
+    factory = AsyncSessionLocal
+    if AsyncReadSessionLocal is not None and not _use_primary_for_read(request):
+        factory = AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
@@ -0,0 +1,77 @@
+"""
+Conditional GET support.
+
+Writes bump per-scope counters in scope_versions (database triggers, see
+migration 4). A GET handler names the scopes its response is built from;
+check_etag() reads their versions with one primary-key lookup, hashes them
+with the request URL and the caller into a strong ETag, and raises
+NotModified when the client already holds that version, before any rows
+are loaded or serialized.
+"""
+from fastapi import Request, Response
+from sqlalchemy import select, or_
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from models import ScopeVersion
+import hashlib
+import json
+import os
+
+# Change to invalidate every outstanding ETag, e.g. after a response format change
+ETAG_SALT = os.getenv("ETAG_SALT", "1")
+
+
+class NotModified(Exception):
+    """Raised by check_etag(); main.py turns it into a bodyless 304"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def scope_versions_query(scopes: List[str], extra_scopes=None):
+    """Versions of the given scopes, plus those named by an optional select() of scope strings"""
+    condition = ScopeVersion.scope.in_(scopes)
+    if extra_scopes is not None:
+        condition = or_(condition, ScopeVersion.scope.in_(extra_scopes))
+    return select(ScopeVersion.scope, ScopeVersion.version).where(condition)
+
+
+def compute_etag(request: Request, user_id: str, scopes: List[str], versions: dict, salt: Optional[str] = None) -> str:
+    state = {scope: 0 for scope in scopes}
+    state.update(versions)
+    parts = [
+        ETAG_SALT,
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        user_id,
+        sorted(state.items()),
+    ]
+    if salt is not None:
+        parts.append(salt)
+    raw = json.dumps(parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def check_etag(db: Session, request: Request, response: Response, user_id: str, scopes: List[str], extra_scopes=None, salt: Optional[str] = None):
+    """
+    Set ETag on the response, or raise NotModified if If-None-Match already
+    matches. Call after the permission checks and before loading rows.
+    salt covers anything else the response depends on, e.g. today's date.
+    Async handlers use: await db.run_sync(check_etag, request, response, ...)
+    Returns the scope versions read, for handlers that key their own caches on them.
+    """
+    versions = dict(db.execute(scope_versions_query(scopes, extra_scopes)).all())
+    etag = compute_etag(request, user_id, scopes, versions, salt)
+    if _matches(request.headers.get("if-none-match"), etag):
+        raise NotModified(etag)
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but revalidate before every use
+    response.headers["Cache-Control"] = "private, no-cache"
+    return versions
@@ -0,0 +1,126 @@
+"""
+Password hashing off the request threadpool.
+
+sha256_crypt runs hundreds of thousands of rounds per call, so hashing is
+done in a small dedicated process pool. The number of in-flight jobs is
+capped; callers past the cap are rejected immediately instead of queueing.
+If a worker dies the pool is unusable, so it is discarded and the next call
+starts a new one.
+
+This module is imported by the worker processes, so it must stay free of
+database and app imports.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from passlib.context import CryptContext
+from passlib.hash import sha256_crypt
+from typing import Optional, Tuple
+import asyncio
+import multiprocessing
+import os
+import threading
+
+# Rounds for new hashes; defaults to passlib's own default for sha256_crypt
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", str(sha256_crypt.default_rounds)))
+# Re-hash on successful login when the stored rounds differ from the configured ones
+PASSWORD_REHASH_ON_LOGIN = os.getenv("PASSWORD_REHASH_ON_LOGIN", "false").lower() in ("1", "true", "yes")
+# 0 disables the process pool and hashes on a worker thread instead
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Jobs allowed in flight (running + queued) before new requests get a 503
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(max(PASSWORD_HASH_WORKERS, 1) * 8)))
+
+
+def _build_context() -> CryptContext:
+    settings = {"sha256_crypt__default_rounds": PASSWORD_HASH_ROUNDS}
+    if PASSWORD_REHASH_ON_LOGIN:
+        # Pinning min/max makes needs_update() flag hashes made with other rounds
+        settings["sha256_crypt__min_rounds"] = PASSWORD_HASH_ROUNDS
+        settings["sha256_crypt__max_rounds"] = PASSWORD_HASH_ROUNDS
+    # Using sha256_crypt to avoid bcrypt 72-byte limit
+    return CryptContext(schemes=["sha256_crypt"], deprecated="auto", **settings)
+
+
+pwd_context = _build_context()
+
+
+def _normalize(password: str) -> str:
+    # Encode and truncate password to 72 bytes for bcrypt compatibility
+    return password.encode('utf-8')[:72].decode('utf-8', errors='ignore')
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(_normalize(password))
+
+
+def verify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Returns (valid, new_hash); new_hash is set only when a rehash is due"""
+    plain_password = _normalize(plain_password)
+    if PASSWORD_REHASH_ON_LOGIN:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    return pwd_context.verify(plain_password, hashed_password), None
+
+
+class HashingPoolFull(Exception):
+    """Raised when the hashing pool already has max_pending jobs in flight"""
+
+
+class HashingPoolBroken(Exception):
+    """Raised when a worker died mid-job; the next call starts a fresh pool"""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: forking a threaded server process is not safe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        # A pool with a dead worker rejects every later submit, so drop it for good
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingPoolFull()
+        try:
+            if self.workers > 0:
+                executor = self._get_executor()
+                try:
+                    return await asyncio.wrap_future(executor.submit(fn, *args))
+                except BrokenProcessPool:
+                    self._discard_executor(executor)
+                    raise HashingPoolBroken()
+            return await asyncio.to_thread(fn, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
@@ -0,0 +1,310 @@
+"""
+Bulk import of decisions from NDJSON or CSV.
+
+Input is read as a stream and validated in chunks of IMPORT_BATCH_SIZE
+records. Each chunk is written with one multi-row INSERT per table (COPY on
+Postgres) and committed on its own, so an interrupted import keeps every
+chunk it finished. The returned checkpoint is the number of input records
+consumed; passing it back as `skip` resumes after them. Records may carry
+their own id (e.g. from /decisions/export); ids that already exist are
+skipped, so replaying a chunk never duplicates it.
+
+Tags are given by name ("tags": [...] in NDJSON, "a;b" in CSV), looked up
+for the whole chunk at once, and created if missing.
+
+POST /decisions/import takes an uploaded file. From the command line:
+    python importer.py FILE --email USER [--team TEAM_ID] [--format csv|ndjson]
+                       [--batch-size N] [--checkpoint PATH]
+"""
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from pydantic import BaseModel, ValidationError, field_validator
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from models import Decision, Tag, DecisionTag, generate_uuid
+import csv
+import io
+import json
+import os
+import sys
+import time
+import uuid
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "5000"))
+MAX_IMPORT_ERRORS = 100
+
+DECISION_COLUMNS = [
+    "id", "user_id", "team_id", "title", "context", "choice_made", "confidence_level",
+    "status", "outcome", "notes", "created_at", "updated_at",
+]
+
+
+class ImportRecord(BaseModel):
+    """One input record (DecisionCreate's fields); the team comes from the import, not the record"""
+    title: str
+    context: Optional[str] = None
+    choice_made: Optional[str] = None
+    confidence_level: int = 3
+    status: str = "pending"
+    outcome: str = "unknown"
+    notes: Optional[str] = None
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    tags: List[str] = []
+
+    @field_validator("id")
+    @classmethod
+    def _check_id(cls, value):
+        if value is not None:
+            uuid.UUID(value)
+        return value
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _split_tags(cls, value):
+        if isinstance(value, str):
+            value = value.split(";")
+        return [name.strip() for name in value or [] if name and name.strip()]
+
+
+def read_records(stream: Iterable[str], import_format: str) -> Iterator:
+    """Raw records from NDJSON lines or CSV rows; CSV blanks count as missing.
+    An unparseable NDJSON line comes through as its ValueError and is rejected"""
+    if import_format == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+        return
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'record'}: {e['msg']}" for e in error.errors())
+    return str(error)
+
+
+def _utc_naive(value: Optional[datetime], default: datetime) -> datetime:
+    if value is None:
+        return default
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def validate_chunk(raw: List[Tuple[int, object]], user_id: str, team_id: Optional[str]):
+    """(rows to insert, tag names per row id, errors) for one chunk of (record number, raw record)"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+    rows, tags, errors = [], {}, []
+    for number, data in raw:
+        try:
+            if isinstance(data, Exception):
+                raise data
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+            record = ImportRecord(**data)
+        except ValueError as e:  # includes ValidationError
+            errors.append({"record": number, "detail": _describe(e)})
+            continue
+        created_at = _utc_naive(record.created_at, now)
+        row = {
+            **record.model_dump(include=set(DECISION_COLUMNS)),
+            "id": record.id or generate_uuid(),
+            "user_id": user_id,
+            "team_id": team_id,
+            "created_at": created_at,
+            "updated_at": _utc_naive(record.updated_at, created_at),
+        }
+        rows.append(row)
+        if record.tags:
+            tags[row["id"]] = record.tags
+    return rows, tags, errors
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    text = str(value)
+    return text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def insert_decisions(db: Session, rows: List[dict]):
+    """COPY on Postgres (psycopg2); a batched executemany INSERT elsewhere"""
+    if db.get_bind().dialect.name == "postgresql":
+        cursor = db.connection().connection.cursor()
+        if hasattr(cursor, "copy_expert"):
+            buffer = io.StringIO("".join(
+                "\t".join(_copy_value(row[column]) for column in DECISION_COLUMNS) + "\n" for row in rows
+            ))
+            cursor.copy_expert(f"COPY decisions ({', '.join(DECISION_COLUMNS)}) FROM STDIN", buffer)
+            return
+    # Core insert on the table: executemany without the ORM bulk bookkeeping
+    db.execute(insert(Decision.__table__), [{column: row[column] for column in DECISION_COLUMNS} for row in rows])
+
+
+class TagResolver:
+    """Tag name -> id for one user, created in bulk on first sight and remembered for the run"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.ids = {}
+
+    def resolve(self, db: Session, names: Iterable[str]) -> dict:
+        missing = set(names) - self.ids.keys()
+        if missing:
+            found = db.execute(select(Tag.name, Tag.id).where(Tag.user_id == self.user_id, Tag.name.in_(missing))).all()
+            self.ids.update(found)
+            new_tags = [{"id": generate_uuid(), "user_id": self.user_id, "name": name}
+                        for name in sorted(missing - self.ids.keys())]
+            if new_tags:
+                db.execute(insert(Tag.__table__), new_tags)
+                self.ids.update((tag["name"], tag["id"]) for tag in new_tags)
+        return self.ids
+
+
+def write_chunk(db: Session, rows: List[dict], tags: dict, resolver: TagResolver) -> Tuple[int, int]:
+    """Insert one validated chunk and commit; returns (imported, skipped as already present)"""
+    existing = set(db.execute(select(Decision.id).where(Decision.id.in_([row["id"] for row in rows]))).scalars())
+    fresh, seen = [], set()
+    for row in rows:
+        if row["id"] not in existing and row["id"] not in seen:
+            seen.add(row["id"])
+            fresh.append(row)
+    if fresh:
+        insert_decisions(db, fresh)
+        names = {name for row in fresh for name in tags.get(row["id"], ())}
+        if names:
+            tag_ids = resolver.resolve(db, names)
+            links = {(row["id"], tag_ids[name]) for row in fresh for name in tags.get(row["id"], ())}
+            db.execute(insert(DecisionTag.__table__), [{"decision_id": d, "tag_id": t} for d, t in sorted(links)])
+    db.commit()
+    return len(fresh), len(rows) - len(fresh)
+
+
+def run_import(
+    db: Session,
+    stream: Iterable[str],
+    import_format: str,
+    user_id: str,
+    team_id: Optional[str] = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    skip: int = 0,
+    on_progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    Import decisions owned by user_id (and team_id, if given). Stops at the
+    first write or parse failure with summary["error"] set; summary["checkpoint"]
+    always counts the records safely behind us.
+    """
+    started = time.perf_counter()
+    summary = {
+        "processed": 0, "imported": 0, "skipped_existing": 0, "rejected": 0,
+        "batches": 0, "checkpoint": skip, "errors": [], "error": None,
+        "elapsed_seconds": 0.0, "rows_per_second": 0.0,
+    }
+    resolver = TagResolver(user_id)
+
+    def flush(chunk):
+        rows, tags, errors = validate_chunk(chunk, user_id, team_id)
+        imported, skipped = write_chunk(db, rows, tags, resolver) if rows else (0, 0)
+        elapsed = time.perf_counter() - started
+        summary.update(
+            processed=summary["processed"] + len(chunk),
+            imported=summary["imported"] + imported,
+            skipped_existing=summary["skipped_existing"] + skipped,
+            rejected=summary["rejected"] + len(errors),
+            batches=summary["batches"] + 1,
+            checkpoint=chunk[-1][0],
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round((summary["imported"] + imported) / elapsed, 1) if elapsed else 0.0,
+        )
+        summary["errors"].extend(errors[:MAX_IMPORT_ERRORS - len(summary["errors"])])
+        if on_progress:
+            on_progress(summary)
+
+    chunk = []
+    try:
+        for number, data in enumerate(read_records(stream, import_format), start=1):
+            if number <= skip:
+                continue
+            chunk.append((number, data))
+            if len(chunk) >= batch_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    except (SQLAlchemyError, csv.Error, UnicodeDecodeError) as e:
+        db.rollback()
+        summary["error"] = f"{type(e).__name__}: {str(e).splitlines()[0]}"
+    return summary
+
+
+def _load_checkpoint(path: Optional[str], source: str) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        state = json.load(f)
+    return state["checkpoint"] if state.get("source") == source else 0
+
+
+def _save_checkpoint(path: str, source: str, checkpoint: int):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"source": source, "checkpoint": checkpoint}, f)
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    import argparse
+    from database import SessionLocal, engine, Base
+    from migrations import run_migrations
+    from models import User, TeamMember
+
+    parser = argparse.ArgumentParser(description="Import decisions from NDJSON or CSV")
+    parser.add_argument("file")
+    parser.add_argument("--email", required=True, help="Owner of the imported decisions")
+    parser.add_argument("--team", help="Team to import into (the owner must be a member)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--checkpoint", help="Progress file; rerun with the same path to resume")
+    args = parser.parse_args()
+
+    import_format = args.format or ("csv" if args.file.endswith(".csv") else "ndjson")
+    source = os.path.abspath(args.file)
+    skip = _load_checkpoint(args.checkpoint, source)
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    db = SessionLocal()
+    user = db.query(User).filter(User.email == args.email).first()
+    if user is None:
+        sys.exit(f"No user with email {args.email}")
+    if args.team and not db.query(TeamMember).filter(TeamMember.team_id == args.team, TeamMember.user_id == user.id).first():
+        sys.exit(f"{args.email} is not a member of team {args.team}")
+
+    def report(summary):
+        if args.checkpoint:
+            _save_checkpoint(args.checkpoint, source, summary["checkpoint"])
+        print(f"{summary['checkpoint']} records  {summary['imported']} imported  {summary['skipped_existing']} existing  "
+              f"{summary['rejected']} rejected  {summary['rows_per_second']:.0f} rows/s", file=sys.stderr)
+
+    if skip:
+        print(f"Resuming after record {skip}", file=sys.stderr)
+    with open(args.file, encoding="utf-8-sig", newline="") as f:
+        summary = run_import(db, f, import_format, user.id, args.team, args.batch_size, skip, report)
+    db.close()
+    for error in summary["errors"]:
+        print(f"record {error['record']}: {error['detail']}", file=sys.stderr)
+    if summary["error"]:
+        sys.exit(f"Stopped after record {summary['checkpoint']}: {summary['error']}")
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    print(json.dumps(summary, indent=2))
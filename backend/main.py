@@ -1,15 +1,54 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from routers import decisions, teams, tags, comments, votes, chat, bot, whiteboards
+from routers import decisions, teams, tags, comments, votes, chat, bot, whiteboards, analytics, debug
 from routers.auth_routes import router as auth_router
-from database import engine, Base
+from database import engine, async_engine, Base, ASYNC_DB, READ_STICKY_SECONDS, note_write, sqlite_pragma_report, pool_capacity
+from hashing import password_hasher
+from migrations import run_migrations
+from etags import NotModified
+from contextlib import asynccontextmanager
+import anyio.to_thread
+import logging
 import uvicorn
 import os
 
-# Create database tables
+logger = logging.getLogger("uvicorn.error")
+
+# Threads available to sync routes and dependencies (anyio default: 40)
+WORKER_THREADS = os.getenv("WORKER_THREADS")
+
+
+def configure_threadpool():
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    if WORKER_THREADS:
+        limiter.total_tokens = int(WORKER_THREADS)
+    threads = int(limiter.total_tokens)
+    capacity = pool_capacity()
+    if capacity is not None and capacity < threads:
+        logger.warning(
+            "DB pool capacity (%d = DB_POOL_SIZE + DB_MAX_OVERFLOW) is below the %d worker threads; "
+            "busy requests will queue on pool checkout", capacity, threads
+        )
+    else:
+        logger.info("Worker threads: %d, DB pool capacity: %s", threads, capacity or "unbounded")
+
+# Create database tables, then bring existing ones up to the current schema
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_threadpool()
+    pragmas = sqlite_pragma_report()
+    if pragmas:
+        logger.info("SQLite settings: %s", ", ".join(f"{k}={v}" for k, v in pragmas.items()))
+    yield
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
-app = FastAPI(title="DecisionLog API")
+
+app = FastAPI(title="DecisionLog API", lifespan=lifespan)
 
 # CORS middleware - allow all origins
 origins = [
@@ -24,8 +63,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+
+@app.exception_handler(NotModified)
+async def not_modified(request: Request, exc: NotModified):
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "private, no-cache"})
+
+# Read-your-writes: after a successful write, keep the client's reads on the primary
+if READ_STICKY_SECONDS > 0:
+    @app.middleware("http")
+    async def sticky_reads_after_write(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            note_write(request)
+        return response
+
+# Async implementations come first so they take over the routes they define;
+# anything they don't define still falls through to the sync routers below
+if ASYNC_DB:
+    from routers import auth_async, decisions_async, votes_async, chat_async
+    app.include_router(auth_async.router)
+    app.include_router(decisions_async.router)
+    app.include_router(votes_async.router)
+    app.include_router(chat_async.router)
+
 # Include Routers
 app.include_router(auth_router)
 app.include_router(decisions.router)
@@ -36,6 +99,8 @@ app.include_router(votes.router)
 app.include_router(chat.router)
 app.include_router(bot.router)
 app.include_router(whiteboards.router)
+app.include_router(analytics.router)
+app.include_router(debug.router)
 
 @app.get("/")
 def root():
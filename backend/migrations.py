@@ -0,0 +1,653 @@
+"""
+Versioned schema migrations for DecisionLog.
+
+create_all() only creates missing tables, so anything added to an existing
+table (indexes, constraints, columns) ships as a numbered migration here.
+Each migration runs once, in order, inside its own transaction, and is
+recorded in schema_migrations. Migrations must also be safe on a fresh
+database where create_all() already built the current schema.
+
+Runs automatically at startup (main.py), or by hand:
+    python migrations.py            # apply pending migrations
+    python migrations.py --status   # list applied / pending
+    python migrations.py --native-ids  # Postgres: move key columns to uuid
+    python migrations.py --rebuild-search  # SQLite: re-sync decisions_fts and its search keys
+    python migrations.py --verify-stats    # report decision_stats / vote_tallies / comment_counts drift
+    python migrations.py --rebuild-stats   # recount decision_stats, vote_tallies and comment_counts
+"""
+from sqlalchemy import text, inspect
+from sqlalchemy.types import Uuid
+from sqlalchemy.engine import Connection, Engine
+from datetime import datetime
+import sys
+
+MIGRATIONS = []
+
+
+def migration(version: int, description: str):
+    """Register a migration function taking a Connection"""
+    def register(fn):
+        if any(v == version for v, _, _ in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version {version}")
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+def _ensure_version_table(conn: Connection):
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_versions(engine: Engine) -> set:
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        return {row[0] for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def run_migrations(engine: Engine) -> list:
+    """Apply pending migrations in order; returns the versions applied"""
+    done = applied_versions(engine)
+    applied = []
+    for version, description, fn in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as conn:
+            fn(conn)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+                {"v": version, "d": description, "t": datetime.utcnow()}
+            )
+        applied.append(version)
+    return applied
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+# --- Migrations -------------------------------------------------------------
+
+@migration(1, "Indexes for router query shapes; unique votes and team memberships")
+def _indexes_and_uniqueness(conn: Connection):
+    # Keep the latest vote per (decision, user) before enforcing uniqueness
+    conn.execute(text(
+        "DELETE FROM votes WHERE EXISTS ("
+        " SELECT 1 FROM votes newer"
+        " WHERE newer.decision_id = votes.decision_id AND newer.user_id = votes.user_id"
+        " AND (newer.created_at > votes.created_at"
+        "  OR (newer.created_at = votes.created_at AND newer.id > votes.id)))"
+    ))
+    # Keep the earliest membership per (team, user)
+    conn.execute(text(
+        "DELETE FROM team_members WHERE EXISTS ("
+        " SELECT 1 FROM team_members older"
+        " WHERE older.team_id = team_members.team_id AND older.user_id = team_members.user_id"
+        " AND (older.joined_at < team_members.joined_at"
+        "  OR (older.joined_at = team_members.joined_at AND older.id < team_members.id)))"
+    ))
+    for statement in [
+        "CREATE INDEX IF NOT EXISTS ix_decisions_user_created ON decisions (user_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_decisions_team_created ON decisions (team_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_tags_user ON tags (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_decision_tags_tag ON decision_tags (tag_id)",
+        "CREATE INDEX IF NOT EXISTS ix_comments_decision_created ON comments (decision_id, created_at)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_votes_decision_user ON votes (decision_id, user_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_team_members_team_user ON team_members (team_id, user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_team_members_user ON team_members (user_id)",
+        "CREATE INDEX IF NOT EXISTS ix_messages_team_created ON messages (team_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_whiteboards_team_updated ON whiteboards (team_id, updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_whiteboards_user_team_updated ON whiteboards (user_id, team_id, updated_at)",
+    ]:
+        conn.execute(text(statement))
+
+
+@migration(2, "Keyset pagination indexes on decisions (scope, created_at, id)")
+def _decision_keyset_indexes(conn: Connection):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_decisions_user_created_id ON decisions (user_id, created_at, id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_decisions_team_created_id ON decisions (team_id, created_at, id)"))
+    # Superseded: the new indexes share their leading columns
+    conn.execute(text("DROP INDEX IF EXISTS ix_decisions_user_created"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_decisions_team_created"))
+
+
+@migration(3, "Full-text search index over decision text")
+def _decision_search_index(conn: Connection):
+    if conn.dialect.name == "sqlite":
+        # External-content FTS5 table: stores only the index, kept in sync by triggers
+        conn.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS decisions_fts USING fts5("
+            "title, context, choice_made, notes, "
+            "content='decisions', content_rowid='rowid', tokenize='porter unicode61')"
+        ))
+        columns = "title, context, choice_made, notes"
+        new_values = "new.rowid, new.title, new.context, new.choice_made, new.notes"
+        old_values = "'delete', old.rowid, old.title, old.context, old.choice_made, old.notes"
+        for statement in [
+            f"CREATE TRIGGER IF NOT EXISTS decisions_fts_insert AFTER INSERT ON decisions BEGIN "
+            f"INSERT INTO decisions_fts (rowid, {columns}) VALUES ({new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS decisions_fts_delete AFTER DELETE ON decisions BEGIN "
+            f"INSERT INTO decisions_fts (decisions_fts, rowid, {columns}) VALUES ({old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS decisions_fts_update AFTER UPDATE OF {columns} ON decisions BEGIN "
+            f"INSERT INTO decisions_fts (decisions_fts, rowid, {columns}) VALUES ({old_values}); "
+            f"INSERT INTO decisions_fts (rowid, {columns}) VALUES ({new_values}); END",
+        ]:
+            conn.execute(text(statement))
+        conn.execute(text("INSERT INTO decisions_fts (decisions_fts) VALUES ('rebuild')"))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "ALTER TABLE decisions ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(context, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(choice_made, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(notes, '')), 'C')) STORED"
+        ))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_decisions_search ON decisions USING GIN (search_vector)"))
+
+
+def rebuild_search_index(conn: Connection):
+    """
+    SQLite: give every decision a search key and re-index decisions_fts from
+    the decisions table (see migration 9). Postgres needs nothing.
+    """
+    if conn.dialect.name == "sqlite":
+        conn.execute(text("DELETE FROM decisions_search_keys WHERE decision_id NOT IN (SELECT id FROM decisions)"))
+        conn.execute(text(
+            "INSERT INTO decisions_search_keys (decision_id) SELECT id FROM decisions "
+            "WHERE id NOT IN (SELECT decision_id FROM decisions_search_keys) ORDER BY rowid"
+        ))
+        conn.execute(text("INSERT INTO decisions_fts (decisions_fts) VALUES ('rebuild')"))
+
+
+# The scopes a row belongs to, for the scope_versions triggers. {row} is NEW
+# or OLD; an UPDATE bumps the scopes of both. NULL scopes are skipped.
+SCOPE_SOURCES = {
+    "decisions": [
+        "SELECT 'decisions:user:' || {row}.user_id AS scope",
+        "SELECT 'decisions:team:' || {row}.team_id AS scope",
+        "SELECT 'decision:' || {row}.id AS scope",
+    ],
+    # Tag links change tag-filtered decision lists
+    "decision_tags": [
+        "SELECT 'decisions:user:' || user_id AS scope FROM decisions WHERE id = {row}.decision_id",
+        "SELECT 'decisions:team:' || team_id AS scope FROM decisions WHERE id = {row}.decision_id",
+        "SELECT 'decision:' || {row}.decision_id AS scope",
+    ],
+    "comments": ["SELECT 'decision:' || {row}.decision_id AS scope"],
+    "votes": ["SELECT 'decision:' || {row}.decision_id AS scope"],
+    "messages": ["SELECT 'chat:' || {row}.team_id AS scope"],
+    "whiteboards": [
+        "SELECT 'whiteboards:user:' || {row}.user_id AS scope",
+        "SELECT 'whiteboards:team:' || {row}.team_id AS scope",
+        "SELECT 'whiteboard:' || {row}.id AS scope",
+    ],
+    "tags": ["SELECT 'tags:user:' || {row}.user_id AS scope"],
+    "team_members": [
+        "SELECT 'teams:user:' || {row}.user_id AS scope",
+        "SELECT 'team:' || {row}.team_id AS scope",
+    ],
+    "teams": [
+        "SELECT 'teams:user:' || user_id AS scope FROM team_members WHERE team_id = {row}.id",
+        "SELECT 'team:' || {row}.id AS scope",
+    ],
+}
+
+
+def _bump_scopes_sql(table: str, rows: list) -> str:
+    sources = " UNION ".join(source.format(row=row) for row in rows for source in SCOPE_SOURCES[table])
+    return (
+        f"INSERT INTO scope_versions (scope, version) "
+        f"SELECT scope, 1 FROM ({sources}) AS touched WHERE scope IS NOT NULL "
+        f"ON CONFLICT (scope) DO UPDATE SET version = scope_versions.version + 1"
+    )
+
+
+@migration(4, "scope_versions triggers for conditional GETs")
+def _scope_version_triggers(conn: Connection):
+    for table in SCOPE_SOURCES:
+        if conn.dialect.name == "sqlite":
+            for op, rows in (("insert", ["new"]), ("update", ["old", "new"]), ("delete", ["old"])):
+                conn.execute(text(
+                    f"CREATE TRIGGER IF NOT EXISTS scope_versions_{table}_{op} AFTER {op.upper()} ON {table} "
+                    f"BEGIN {_bump_scopes_sql(table, rows)}; END"
+                ))
+        elif conn.dialect.name == "postgresql":
+            conn.execute(text(
+                f"CREATE OR REPLACE FUNCTION scope_versions_{table}() RETURNS trigger AS $$ BEGIN "
+                f"IF TG_OP = 'INSERT' THEN {_bump_scopes_sql(table, ['NEW'])}; "
+                f"ELSIF TG_OP = 'DELETE' THEN {_bump_scopes_sql(table, ['OLD'])}; "
+                f"ELSE {_bump_scopes_sql(table, ['OLD', 'NEW'])}; END IF; "
+                f"RETURN NULL; END $$ LANGUAGE plpgsql"
+            ))
+            conn.execute(text(f"DROP TRIGGER IF EXISTS scope_versions_{table} ON {table}"))
+            conn.execute(text(
+                f"CREATE TRIGGER scope_versions_{table} AFTER INSERT OR UPDATE OR DELETE ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION scope_versions_{table}()"
+            ))
+
+
+
+# Columns of decision_stats and the decision field/value each one counts
+DECISION_STATS_COLUMNS = {
+    "success": ("outcome", "success"),
+    "failure": ("outcome", "failure"),
+    "unknown": ("outcome", "unknown"),
+    "pending": ("status", "pending"),
+    "in_progress": ("status", "in_progress"),
+    "reviewed": ("status", "reviewed"),
+    "done": ("status", "done"),
+}
+STATS_FIELDS = ["total"] + list(DECISION_STATS_COLUMNS)
+STATS_SCOPES = "SELECT 'user:' || {row}.user_id AS scope UNION ALL SELECT 'team:' || {row}.team_id AS scope"
+
+
+def _apply_stats_delta_sql(row: str, sign: str) -> str:
+    """Add (+) or remove (-) one decision row's contribution to its user and team stats"""
+    deltas = [f"{sign}1"] + [
+        f"CASE WHEN {row}.{field} = '{value}' THEN {sign}1 ELSE 0 END"
+        for field, value in DECISION_STATS_COLUMNS.values()
+    ]
+    return (
+        f"INSERT INTO decision_stats (scope, {', '.join(STATS_FIELDS)}) "
+        f"SELECT scope, {', '.join(deltas)} FROM ({STATS_SCOPES.format(row=row)}) AS touched WHERE scope IS NOT NULL "
+        f"ON CONFLICT (scope) DO UPDATE SET "
+        + ", ".join(f"{c} = decision_stats.{c} + excluded.{c}" for c in STATS_FIELDS)
+    )
+
+
+def _stats_changed(old: str, new: str) -> str:
+    return " OR ".join(f"{old}.{c} IS DISTINCT FROM {new}.{c}" for c in ("user_id", "team_id", "status", "outcome"))
+
+
+@migration(5, "decision_stats maintained by triggers")
+def _decision_stats_triggers(conn: Connection):
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS decision_stats_insert AFTER INSERT ON decisions "
+            f"BEGIN {_apply_stats_delta_sql('new', '+')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS decision_stats_delete AFTER DELETE ON decisions "
+            f"BEGIN {_apply_stats_delta_sql('old', '-')}; END"
+        ))
+        # SQLite spells IS DISTINCT FROM as IS NOT
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS decision_stats_update AFTER UPDATE OF user_id, team_id, status, outcome ON decisions "
+            f"WHEN {_stats_changed('old', 'new').replace('IS DISTINCT FROM', 'IS NOT')} "
+            f"BEGIN {_apply_stats_delta_sql('old', '-')}; {_apply_stats_delta_sql('new', '+')}; END"
+        ))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            f"CREATE OR REPLACE FUNCTION decision_stats_apply() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_apply_stats_delta_sql('OLD', '-')}; END IF; "
+            f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_apply_stats_delta_sql('NEW', '+')}; END IF; "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS decision_stats_write ON decisions"))
+        conn.execute(text(
+            "CREATE TRIGGER decision_stats_write AFTER INSERT OR DELETE ON decisions "
+            "FOR EACH ROW EXECUTE FUNCTION decision_stats_apply()"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS decision_stats_update ON decisions"))
+        conn.execute(text(
+            f"CREATE TRIGGER decision_stats_update AFTER UPDATE OF user_id, team_id, status, outcome ON decisions "
+            f"FOR EACH ROW WHEN ({_stats_changed('OLD', 'NEW')}) EXECUTE FUNCTION decision_stats_apply()"
+        ))
+    rebuild_decision_stats(conn)
+
+
+def _recomputed_stats_sql() -> str:
+    """decision_stats rows computed from scratch with one pass over decisions"""
+    sums = ["COUNT(*)"] + [
+        f"SUM(CASE WHEN {field} = '{value}' THEN 1 ELSE 0 END)"
+        for field, value in DECISION_STATS_COLUMNS.values()
+    ]
+    return " UNION ALL ".join(
+        f"SELECT '{prefix}:' || {column} AS scope, {', '.join(sums)} FROM decisions "
+        f"WHERE {column} IS NOT NULL GROUP BY {column}"
+        for prefix, column in (("user", "user_id"), ("team", "team_id"))
+    )
+
+
+def _lock_decisions(conn: Connection):
+    # Postgres: hold off decision writes so the recount matches what the triggers see
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("LOCK TABLE decisions IN SHARE MODE"))
+
+
+def rebuild_decision_stats(conn: Connection):
+    """Recount decision_stats from the decisions table"""
+    _lock_decisions(conn)
+    conn.execute(text("DELETE FROM decision_stats"))
+    conn.execute(text(f"INSERT INTO decision_stats (scope, {', '.join(STATS_FIELDS)}) {_recomputed_stats_sql()}"))
+
+
+def _count_drift(conn: Connection, stored_sql: str, actual_sql: str, width: int) -> dict:
+    """Keys whose stored counters differ from a recount: key -> (stored, actual)"""
+    actual = {row[0]: tuple(row[1:]) for row in conn.execute(text(actual_sql))}
+    stored = {row[0]: tuple(row[1:]) for row in conn.execute(text(stored_sql))}
+    empty = (0,) * width
+    return {
+        key: (stored.get(key, empty), actual.get(key, empty))
+        for key in stored.keys() | actual.keys()
+        if stored.get(key, empty) != actual.get(key, empty)
+    }
+
+
+def verify_decision_stats(conn: Connection) -> dict:
+    """Scopes whose stored stats differ from a recount: scope -> (stored, actual)"""
+    _lock_decisions(conn)
+    stored_sql = f"SELECT scope, {', '.join(STATS_FIELDS)} FROM decision_stats"
+    return _count_drift(conn, stored_sql, _recomputed_stats_sql(), len(STATS_FIELDS))
+
+
+VOTE_CHOICES = ["approve", "reject", "abstain"]
+
+
+def _apply_tally_delta_sql(row: str, sign: str) -> str:
+    """Add (+) or remove (-) one vote from its decision's tally"""
+    deltas = ", ".join(f"CASE WHEN {row}.vote = '{choice}' THEN {sign}1 ELSE 0 END" for choice in VOTE_CHOICES)
+    return (
+        f"INSERT INTO vote_tallies (decision_id, {', '.join(VOTE_CHOICES)}) "
+        f"SELECT {row}.decision_id, {deltas} WHERE {row}.decision_id IS NOT NULL "
+        f"ON CONFLICT (decision_id) DO UPDATE SET "
+        + ", ".join(f"{c} = vote_tallies.{c} + excluded.{c}" for c in VOTE_CHOICES)
+    )
+
+
+@migration(6, "vote_tallies maintained by triggers; voter list index")
+def _vote_tally_triggers(conn: Connection):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_votes_decision_created_id ON votes (decision_id, created_at, id)"))
+    changed = "OLD.decision_id IS DISTINCT FROM NEW.decision_id OR OLD.vote IS DISTINCT FROM NEW.vote"
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS vote_tallies_insert AFTER INSERT ON votes "
+            f"BEGIN {_apply_tally_delta_sql('new', '+')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS vote_tallies_delete AFTER DELETE ON votes "
+            f"BEGIN {_apply_tally_delta_sql('old', '-')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS vote_tallies_update AFTER UPDATE OF decision_id, vote ON votes "
+            f"WHEN {changed.replace('IS DISTINCT FROM', 'IS NOT')} "
+            f"BEGIN {_apply_tally_delta_sql('old', '-')}; {_apply_tally_delta_sql('new', '+')}; END"
+        ))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            f"CREATE OR REPLACE FUNCTION vote_tallies_apply() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_apply_tally_delta_sql('OLD', '-')}; END IF; "
+            f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_apply_tally_delta_sql('NEW', '+')}; END IF; "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS vote_tallies_write ON votes"))
+        conn.execute(text(
+            "CREATE TRIGGER vote_tallies_write AFTER INSERT OR DELETE ON votes "
+            "FOR EACH ROW EXECUTE FUNCTION vote_tallies_apply()"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS vote_tallies_update ON votes"))
+        conn.execute(text(
+            f"CREATE TRIGGER vote_tallies_update AFTER UPDATE OF decision_id, vote ON votes "
+            f"FOR EACH ROW WHEN ({changed}) EXECUTE FUNCTION vote_tallies_apply()"
+        ))
+    rebuild_vote_tallies(conn)
+
+
+def _recomputed_tallies_sql() -> str:
+    sums = ", ".join(f"SUM(CASE WHEN vote = '{choice}' THEN 1 ELSE 0 END)" for choice in VOTE_CHOICES)
+    return f"SELECT decision_id, {sums} FROM votes GROUP BY decision_id"
+
+
+def _lock_votes(conn: Connection):
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("LOCK TABLE votes IN SHARE MODE"))
+
+
+def rebuild_vote_tallies(conn: Connection):
+    """Recount vote_tallies from the votes table (drops tallies of deleted decisions)"""
+    _lock_votes(conn)
+    conn.execute(text("DELETE FROM vote_tallies"))
+    conn.execute(text(f"INSERT INTO vote_tallies (decision_id, {', '.join(VOTE_CHOICES)}) {_recomputed_tallies_sql()}"))
+
+
+def verify_vote_tallies(conn: Connection) -> dict:
+    """Decisions whose stored tally differs from a recount: decision_id -> (stored, actual)"""
+    _lock_votes(conn)
+    stored_sql = f"SELECT decision_id, {', '.join(VOTE_CHOICES)} FROM vote_tallies"
+    return _count_drift(conn, stored_sql, _recomputed_tallies_sql(), len(VOTE_CHOICES))
+
+
+def _apply_comment_delta_sql(row: str, sign: str) -> str:
+    """Add (+) or remove (-) one comment from its decision's count"""
+    return (
+        f"INSERT INTO comment_counts (decision_id, count) "
+        f"SELECT {row}.decision_id, {sign}1 WHERE {row}.decision_id IS NOT NULL "
+        f"ON CONFLICT (decision_id) DO UPDATE SET count = comment_counts.count + excluded.count"
+    )
+
+
+@migration(7, "comment_counts maintained by triggers; comment page index")
+def _comment_count_triggers(conn: Connection):
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_comments_decision_created_id ON comments (decision_id, created_at, id)"))
+    # Superseded: the new index shares its leading columns
+    conn.execute(text("DROP INDEX IF EXISTS ix_comments_decision_created"))
+    changed = "OLD.decision_id IS DISTINCT FROM NEW.decision_id"
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS comment_counts_insert AFTER INSERT ON comments "
+            f"BEGIN {_apply_comment_delta_sql('new', '+')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS comment_counts_delete AFTER DELETE ON comments "
+            f"BEGIN {_apply_comment_delta_sql('old', '-')}; END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS comment_counts_update AFTER UPDATE OF decision_id ON comments "
+            f"WHEN {changed.replace('IS DISTINCT FROM', 'IS NOT')} "
+            f"BEGIN {_apply_comment_delta_sql('old', '-')}; {_apply_comment_delta_sql('new', '+')}; END"
+        ))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            f"CREATE OR REPLACE FUNCTION comment_counts_apply() RETURNS trigger AS $$ BEGIN "
+            f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_apply_comment_delta_sql('OLD', '-')}; END IF; "
+            f"IF TG_OP IN ('UPDATE', 'INSERT') THEN {_apply_comment_delta_sql('NEW', '+')}; END IF; "
+            f"RETURN NULL; END $$ LANGUAGE plpgsql"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS comment_counts_write ON comments"))
+        conn.execute(text(
+            "CREATE TRIGGER comment_counts_write AFTER INSERT OR DELETE ON comments "
+            "FOR EACH ROW EXECUTE FUNCTION comment_counts_apply()"
+        ))
+        conn.execute(text("DROP TRIGGER IF EXISTS comment_counts_update ON comments"))
+        conn.execute(text(
+            f"CREATE TRIGGER comment_counts_update AFTER UPDATE OF decision_id ON comments "
+            f"FOR EACH ROW WHEN ({changed}) EXECUTE FUNCTION comment_counts_apply()"
+        ))
+    rebuild_comment_counts(conn)
+
+
+RECOMPUTED_COMMENT_COUNTS_SQL = "SELECT decision_id, COUNT(*) FROM comments GROUP BY decision_id"
+
+
+def _lock_comments(conn: Connection):
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("LOCK TABLE comments IN SHARE MODE"))
+
+
+def rebuild_comment_counts(conn: Connection):
+    """Recount comment_counts from the comments table (drops counts of deleted decisions)"""
+    _lock_comments(conn)
+    conn.execute(text("DELETE FROM comment_counts"))
+    conn.execute(text(f"INSERT INTO comment_counts (decision_id, count) {RECOMPUTED_COMMENT_COUNTS_SQL}"))
+
+
+def verify_comment_counts(conn: Connection) -> dict:
+    """Decisions whose stored comment count differs from a recount: decision_id -> (stored, actual)"""
+    _lock_comments(conn)
+    return _count_drift(conn, "SELECT decision_id, count FROM comment_counts", RECOMPUTED_COMMENT_COUNTS_SQL, 1)
+
+
+@migration(8, "Threaded comments: parent_id, depth and materialized path")
+def _comment_threads(conn: Connection):
+    postgres = conn.dialect.name == "postgresql"
+    if not has_column(conn, "comments", "path"):
+        id_type = next(c["type"] for c in inspect(conn).get_columns("comments") if c["name"] == "id")
+        conn.execute(text(f"ALTER TABLE comments ADD COLUMN parent_id {id_type.compile(dialect=conn.dialect)}"))
+        conn.execute(text("ALTER TABLE comments ADD COLUMN depth INTEGER NOT NULL DEFAULT 0"))
+        # Byte-order collation, as in models.PathType
+        conn.execute(text('ALTER TABLE comments ADD COLUMN path VARCHAR COLLATE "C"' if postgres else "ALTER TABLE comments ADD COLUMN path VARCHAR"))
+    # Existing comments become top-level threads; same format as models.thread_segment
+    if postgres:
+        segment = "to_char(created_at, 'YYYYMMDDHH24MISS') || id::text || '/'"
+    else:
+        segment = "strftime('%Y%m%d%H%M%S', created_at) || id || '/'"
+    conn.execute(text(f"UPDATE comments SET path = {segment} WHERE path IS NULL"))
+    if postgres:
+        conn.execute(text("ALTER TABLE comments ALTER COLUMN path SET NOT NULL"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_comments_decision_path ON comments (decision_id, path)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_comments_decision_depth_path ON comments (decision_id, depth, path)"))
+
+
+@migration(9, "SQLite search index keyed by a stable integer instead of decisions.rowid")
+def _stable_search_keys(conn: Connection):
+    """
+    Migration 3 keyed decisions_fts on the implicit rowid of decisions, whose
+    primary key is a string, and VACUUM may renumber such rowids: search would
+    then quietly return the wrong decisions. decisions_search_keys gives each
+    decision an INTEGER PRIMARY KEY (which VACUUM keeps), and the FTS table
+    reads its content through a view joining the two.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    for trigger in ("insert", "delete", "update"):
+        conn.execute(text(f"DROP TRIGGER IF EXISTS decisions_fts_{trigger}"))
+    conn.execute(text("DROP TABLE IF EXISTS decisions_fts"))
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS decisions_search_keys ("
+        "search_key INTEGER PRIMARY KEY, decision_id VARCHAR NOT NULL UNIQUE)"
+    ))
+    columns = "title, context, choice_made, notes"
+    conn.execute(text(
+        f"CREATE VIEW IF NOT EXISTS decisions_search AS SELECT k.search_key, "
+        f"{', '.join(f'd.{c}' for c in columns.split(', '))} "
+        f"FROM decisions_search_keys k JOIN decisions d ON d.id = k.decision_id"
+    ))
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE decisions_fts USING fts5({columns}, "
+        f"content='decisions_search', content_rowid='search_key', tokenize='porter unicode61')"
+    ))
+    key = "(SELECT search_key FROM decisions_search_keys WHERE decision_id = {row}.id)"
+    new_values = f"{key.format(row='new')}, new.title, new.context, new.choice_made, new.notes"
+    old_values = f"'delete', {key.format(row='old')}, old.title, old.context, old.choice_made, old.notes"
+    for statement in [
+        f"CREATE TRIGGER decisions_fts_insert AFTER INSERT ON decisions BEGIN "
+        f"INSERT INTO decisions_search_keys (decision_id) VALUES (new.id); "
+        f"INSERT INTO decisions_fts (rowid, {columns}) VALUES ({new_values}); END",
+        f"CREATE TRIGGER decisions_fts_delete AFTER DELETE ON decisions BEGIN "
+        f"INSERT INTO decisions_fts (decisions_fts, rowid, {columns}) VALUES ({old_values}); "
+        f"DELETE FROM decisions_search_keys WHERE decision_id = old.id; END",
+        f"CREATE TRIGGER decisions_fts_update AFTER UPDATE OF {columns} ON decisions BEGIN "
+        f"INSERT INTO decisions_fts (decisions_fts, rowid, {columns}) VALUES ({old_values}); "
+        f"INSERT INTO decisions_fts (rowid, {columns}) VALUES ({new_values}); END",
+    ]:
+        conn.execute(text(statement))
+    rebuild_search_index(conn)
+
+
+# --- One-off conversions -----------------------------------------------------
+
+def convert_ids_to_native_uuid(conn: Connection, metadata) -> list:
+    """
+    Postgres only: rewrite every IdType column from varchar to uuid (16 bytes
+    instead of 37+) for ID_STORAGE=native. Foreign keys are dropped and
+    re-created around the type change. Values are unchanged, so the API keeps
+    returning the same IDs. Returns the columns converted.
+    """
+    from models import IdType
+
+    if conn.dialect.name != "postgresql":
+        raise RuntimeError("Native uuid keys are only available on Postgres")
+    insp = inspect(conn)
+    pending = {}
+    for table in metadata.sorted_tables:
+        if not insp.has_table(table.name):
+            continue
+        current = {c["name"]: c["type"] for c in insp.get_columns(table.name)}
+        columns = [
+            c.name for c in table.columns
+            if isinstance(c.type, IdType) and c.name in current
+            and not isinstance(current[c.name], Uuid)
+        ]
+        if columns:
+            pending[table.name] = columns
+    if not pending:
+        return []
+
+    foreign_keys = [
+        (table, fk) for table in metadata.tables
+        if insp.has_table(table) for fk in insp.get_foreign_keys(table)
+    ]
+    for table, fk in foreign_keys:
+        conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{fk["name"]}"'))
+    for table, columns in pending.items():
+        changes = ", ".join(f"ALTER COLUMN {c} TYPE uuid USING {c}::uuid" for c in columns)
+        conn.execute(text(f"ALTER TABLE {table} {changes}"))
+    for table, fk in foreign_keys:
+        ondelete = fk.get("options", {}).get("ondelete")
+        conn.execute(text(
+            f'ALTER TABLE {table} ADD CONSTRAINT "{fk["name"]}" '
+            f'FOREIGN KEY ({", ".join(fk["constrained_columns"])}) '
+            f'REFERENCES {fk["referred_table"]} ({", ".join(fk["referred_columns"])})'
+            + (f" ON DELETE {ondelete}" if ondelete else "")
+        ))
+    return [f"{table}.{c}" for table, columns in pending.items() for c in columns]
+
+
+if __name__ == "__main__":
+    from database import engine, Base
+    import models  # noqa: F401 - registers tables on Base
+
+    Base.metadata.create_all(bind=engine)
+    if "--native-ids" in sys.argv:
+        with engine.begin() as conn:
+            converted = convert_ids_to_native_uuid(conn, Base.metadata)
+        print(f"Converted to uuid: {', '.join(converted)}" if converted else "Key columns already use uuid")
+    elif "--rebuild-search" in sys.argv:
+        with engine.begin() as conn:
+            rebuild_search_index(conn)
+        print("Search index rebuilt")
+    elif "--verify-stats" in sys.argv:
+        with engine.begin() as conn:
+            drift = {
+                "decision_stats": (verify_decision_stats(conn), STATS_FIELDS),
+                "vote_tallies": (verify_vote_tallies(conn), VOTE_CHOICES),
+                "comment_counts": (verify_comment_counts(conn), ["count"]),
+            }
+        for table, (rows, fields) in drift.items():
+            for key, (stored, actual) in sorted(rows.items()):
+                print(f"{table} {key}: stored {dict(zip(fields, stored))} actual {dict(zip(fields, actual))}")
+        drifted = sum(len(rows) for rows, _ in drift.values())
+        print(f"{drifted} rows drifted (run --rebuild-stats)" if drifted else "Maintained counters are consistent")
+        sys.exit(1 if drifted else 0)
+    elif "--rebuild-stats" in sys.argv:
+        with engine.begin() as conn:
+            rebuild_decision_stats(conn)
+            rebuild_vote_tallies(conn)
+            rebuild_comment_counts(conn)
+        print("decision_stats, vote_tallies and comment_counts rebuilt")
+    elif "--status" in sys.argv:
+        done = applied_versions(engine)
+        for version, description, _ in MIGRATIONS:
+            print(f"{'applied' if version in done else 'pending'}  {version:>3}  {description}")
+    else:
+        applied = run_migrations(engine)
+        print(f"Applied migrations: {applied}" if applied else "Database is up to date")
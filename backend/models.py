@@ -1,23 +1,101 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Boolean, Index, event
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from database import Base
+from datetime import datetime, timezone
+import os
+import secrets
+import threading
+import time
 import uuid
 
+# Key strategy for new rows: "uuid4" (random) or "uuid7" (time-ordered, so
+# inserts append to the right edge of the B-tree). Both are standard
+# 36-character UUID strings, so existing IDs and the API are unaffected.
+ID_STRATEGY = os.getenv("ID_STRATEGY", "uuid4")
+# "native" stores keys in Postgres' 16-byte uuid type instead of varchar;
+# existing databases convert with: python migrations.py --native-ids
+ID_STORAGE = os.getenv("ID_STORAGE", "text")
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = [0, 0]  # last millisecond, sequence within it
+
+
+def uuid7() -> uuid.UUID:
+    """RFC 9562 UUIDv7: 48-bit ms timestamp, 12-bit sequence, 62 random bits"""
+    with _uuid7_lock:
+        ms = time.time_ns() // 1_000_000
+        if ms <= _uuid7_last[0]:
+            # Same (or skewed-back) millisecond: keep IDs monotonic
+            ms = _uuid7_last[0]
+            seq = _uuid7_last[1] + 1
+            if seq > 0xFFF:
+                ms, seq = ms + 1, 0
+        else:
+            seq = secrets.randbits(10)  # random start leaves room to count up
+        _uuid7_last[0], _uuid7_last[1] = ms, seq
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= seq << 64
+    value |= 0b10 << 62
+    value |= secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
 def generate_uuid():
+    if ID_STRATEGY == "uuid7":
+        return str(uuid7())
     return str(uuid.uuid4())
 
+
+# SQLite compares DATETIME columns as text. Store Python-side values in the
+# same format as CURRENT_TIMESTAMP (server defaults) so that range and
+# keyset predicates compare like with like.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"),
+    "sqlite"
+)
+
+
+class IdType(TypeDecorator):
+    """Primary/foreign key column: native uuid on Postgres when ID_STORAGE=native, text elsewhere"""
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql" and ID_STORAGE == "native":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String())
+
+    def process_bind_param(self, value, dialect):
+        # A uuid column rejects malformed input with a DataError (a 500). Such an
+        # id can't name a stored row, so bind NO_SUCH_ID instead: lookups miss
+        # and the routers answer 404 as they do with text keys.
+        if value is not None and dialect.name == "postgresql" and ID_STORAGE == "native":
+            try:
+                uuid.UUID(str(value))
+            except ValueError:
+                return NO_SUCH_ID
+        return value
+
+
+# The nil UUID: never generated, so it matches no row
+NO_SUCH_ID = str(uuid.UUID(int=0))
+
+
 # User model
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(String, primary_key=True, default=generate_uuid)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
     email = Column(String, unique=True, nullable=False, index=True)
     password_hash = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     avatar_url = Column(String, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     decisions = relationship("Decision", back_populates="user", cascade="all, delete-orphan")
@@ -31,10 +109,15 @@ class User(Base):
 # Decision model
 class Decision(Base):
     __tablename__ = "decisions"
+    __table_args__ = (
+        # Personal and team lists, newest first; id makes the order total for keyset paging
+        Index("ix_decisions_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_decisions_team_created_id", "team_id", "created_at", "id"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    team_id = Column(String, ForeignKey("teams.id", ondelete="SET NULL"), nullable=True)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    team_id = Column(IdType, ForeignKey("teams.id", ondelete="SET NULL"), nullable=True)
     title = Column(String, nullable=False)
     context = Column(Text, nullable=True)
     choice_made = Column(Text, nullable=True)
@@ -42,8 +125,8 @@ class Decision(Base):
     status = Column(String, default="pending")  # pending, reviewed
     outcome = Column(String, default="unknown")  # success, failure, unknown
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="decisions")
@@ -56,11 +139,14 @@ class Decision(Base):
 # Tag model
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        Index("ix_tags_user", "user_id"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     user = relationship("User", back_populates="tags")
@@ -70,9 +156,13 @@ class Tag(Base):
 # Decision-Tag association
 class DecisionTag(Base):
     __tablename__ = "decision_tags"
+    __table_args__ = (
+        # The primary key covers decision_id lookups; this covers tag_id
+        Index("ix_decision_tags_tag", "tag_id"),
+    )
     
-    decision_id = Column(String, ForeignKey("decisions.id", ondelete="CASCADE"), primary_key=True)
-    tag_id = Column(String, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+    decision_id = Column(IdType, ForeignKey("decisions.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(IdType, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
     
     # Relationships
     decision = relationship("Decision", back_populates="tags")
@@ -80,30 +170,79 @@ class DecisionTag(Base):
 
 
 # Comment model
+# Byte-order strings on every backend, so materialized paths sort the same
+# way in Postgres (whose default collation ignores punctuation) as in SQLite.
+PathType = String().with_variant(postgresql.VARCHAR(collation="C"), "postgresql")
+
+
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        # Comment pages walk a decision's comments oldest first
+        Index("ix_comments_decision_created_id", "decision_id", "created_at", "id"),
+        # Threads: a subtree is a path prefix range...
+        Index("ix_comments_decision_path", "decision_id", "path"),
+        # ...and one level of it is the same range at a single depth
+        Index("ix_comments_decision_depth_path", "decision_id", "depth", "path"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    decision_id = Column(String, ForeignKey("decisions.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    decision_id = Column(IdType, ForeignKey("decisions.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Replies: parent_id is informational; the tree is read through
+    # path, one thread_segment() per ancestor and the comment itself.
+    parent_id = Column(IdType, nullable=True)
+    depth = Column(Integer, nullable=False, default=0)
+    path = Column(PathType, nullable=False)
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     decision = relationship("Decision", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
 
+# Materialized comment paths. A segment is "<created_at><id>/" with created_at
+# as fixed-width YYYYMMDDHHMMSS, so siblings sort oldest first (ties by id),
+# a parent sorts before its replies, and a subtree is every path starting
+# with its root's. Migration 8 backfills the same format in SQL.
+MAX_COMMENT_DEPTH = 16
+
+
+def thread_segment(created_at: datetime, comment_id: str) -> str:
+    return f"{created_at:%Y%m%d%H%M%S}{comment_id}/"
+
+
+def subtree_end(path: str) -> str:
+    """Exclusive upper bound of the paths under `path`: '0' is the character after '/'"""
+    return path[:-1] + "0"
+
+
+@event.listens_for(Comment, "before_insert")
+def _start_thread(mapper, connection, comment: Comment):
+    """A comment inserted without a path starts its own thread"""
+    if comment.path is None:
+        comment.id = comment.id or generate_uuid()
+        comment.created_at = comment.created_at or datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        comment.path = thread_segment(comment.created_at, comment.id)
+
+
 # Vote model
 class Vote(Base):
     __tablename__ = "votes"
+    __table_args__ = (
+        # One vote per user per decision
+        Index("uq_votes_decision_user", "decision_id", "user_id", unique=True),
+        # Voter lists page through a decision's votes oldest first
+        Index("ix_votes_decision_created_id", "decision_id", "created_at", "id"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    decision_id = Column(String, ForeignKey("decisions.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    decision_id = Column(IdType, ForeignKey("decisions.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     vote = Column(String, nullable=False)  # approve, reject, abstain
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     decision = relationship("Decision", back_populates="votes")
@@ -114,11 +253,11 @@ class Vote(Base):
 class Team(Base):
     __tablename__ = "teams"
     
-    id = Column(String, primary_key=True, default=generate_uuid)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     invite_code = Column(String, unique=True, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     decisions = relationship("Decision", back_populates="team")
@@ -129,12 +268,17 @@ class Team(Base):
 # Team Member model
 class TeamMember(Base):
     __tablename__ = "team_members"
+    __table_args__ = (
+        # One membership per user per team
+        Index("uq_team_members_team_user", "team_id", "user_id", unique=True),
+        Index("ix_team_members_user", "user_id"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    team_id = Column(String, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    team_id = Column(IdType, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     role = Column(String, default="member")  # owner, admin, member
-    joined_at = Column(DateTime, server_default=func.now())
+    joined_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     team = relationship("Team", back_populates="members")
@@ -144,12 +288,15 @@ class TeamMember(Base):
 # Message model (Team Chat)
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_team_created", "team_id", "created_at"),
+    )
     
-    id = Column(String, primary_key=True, default=generate_uuid)
-    team_id = Column(String, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    team_id = Column(IdType, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
     
     # Relationships
     team = relationship("Team", back_populates="messages")
@@ -159,15 +306,68 @@ class Message(Base):
 # Whiteboard model
 class Whiteboard(Base):
     __tablename__ = "whiteboards"
+    __table_args__ = (
+        Index("ix_whiteboards_team_updated", "team_id", "updated_at"),
+        # Personal boards filter on team_id IS NULL
+        Index("ix_whiteboards_user_team_updated", "user_id", "team_id", "updated_at"),
+    )
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    team_id = Column(String, ForeignKey("teams.id", ondelete="CASCADE"), nullable=True)
+    id = Column(IdType, primary_key=True, default=generate_uuid)
+    user_id = Column(IdType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    team_id = Column(IdType, ForeignKey("teams.id", ondelete="CASCADE"), nullable=True)
     name = Column(String, nullable=False)
     data = Column(Text, nullable=False, default="[]") # JSON string of shapes
-    created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    created_at = Column(Timestamp, server_default=func.now())
+    updated_at = Column(Timestamp, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User")
     team = relationship("Team")
+
+
+# Change counter per cache scope ("decisions:team:<id>", "chat:<team id>", ...).
+# Bumped by database triggers on every write (migrations.py, migration 4) and
+# read by conditional GETs to build ETags (etags.py).
+class ScopeVersion(Base):
+    __tablename__ = "scope_versions"
+
+    scope = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Running decision counts per "user:<id>" (decisions they created) and
+# "team:<id>". Maintained by database triggers in the same transaction as the
+# decision write (migrations.py, migration 5); repair drift with
+# python migrations.py --verify-stats / --rebuild-stats.
+class DecisionStats(Base):
+    __tablename__ = "decision_stats"
+
+    scope = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    success = Column(Integer, nullable=False, default=0)
+    failure = Column(Integer, nullable=False, default=0)
+    unknown = Column(Integer, nullable=False, default=0)
+    pending = Column(Integer, nullable=False, default=0)
+    in_progress = Column(Integer, nullable=False, default=0)
+    reviewed = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+
+
+# Approve/reject/abstain counts per decision, maintained by triggers on votes
+# (migrations.py, migration 6) so vote summaries read one row.
+class VoteTally(Base):
+    __tablename__ = "vote_tallies"
+
+    decision_id = Column(IdType, primary_key=True)
+    approve = Column(Integer, nullable=False, default=0)
+    reject = Column(Integer, nullable=False, default=0)
+    abstain = Column(Integer, nullable=False, default=0)
+
+
+# Comments per decision, maintained by triggers on comments (migrations.py,
+# migration 7) so count badges read one row per decision.
+class CommentCount(Base):
+    __tablename__ = "comment_counts"
+
+    decision_id = Column(IdType, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
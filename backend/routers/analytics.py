@@ -0,0 +1,232 @@
+"""
+Decision analytics computed in the database.
+
+The analytics page used to download every decision and count them in the
+browser. /analytics/summary returns the same figures from two GROUP BY
+queries (outcome x status x confidence, and outcome per week/month), so the
+payload size depends on the number of groups, not the number of decisions.
+
+Summaries are cached per scope, keyed on the scope's version counter from
+scope_versions, so any decision write in the scope makes the next request
+recompute (on every worker) without explicit invalidation.
+
+/analytics/stats reads the trigger-maintained decision_stats row for the
+scope: a primary-key lookup, however many decisions the scope holds.
+"""
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime, timedelta, timezone
+from database import get_read_db
+from models import Decision, DecisionStats, User
+from auth import get_current_user
+from authz import Memberships, get_memberships
+from cache import TTLCache
+from etags import check_etag
+from routers.decisions import list_scopes
+import os
+
+ANALYTICS_CACHE_MAX_ENTRIES = int(os.getenv("ANALYTICS_CACHE_MAX_ENTRIES", "1024"))
+ANALYTICS_CACHE_TTL_SECONDS = float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "300"))
+MAX_PERIODS = 104
+
+OUTCOMES = ["success", "failure", "unknown"]
+STATUSES = ["pending", "in_progress", "reviewed", "done"]
+CONFIDENCE_LEVELS = [1, 2, 3, 4, 5]
+
+analytics_cache = TTLCache(max_entries=ANALYTICS_CACHE_MAX_ENTRIES, ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS)
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["analytics"]
+)
+
+# Pydantic models
+class BreakdownRow(BaseModel):
+    outcome: Optional[str]
+    status: Optional[str]
+    confidence_level: Optional[int]
+    count: int
+
+class ConfidenceStats(BaseModel):
+    level: int
+    count: int
+    success: int
+    success_rate: Optional[float]
+
+class PeriodStats(BaseModel):
+    period: date  # first day of the week (Monday) or month
+    total: int
+    by_outcome: Dict[str, int]
+
+class DecisionCounts(BaseModel):
+    total: int
+    success: int
+    failure: int
+    unknown: int
+    pending: int
+    in_progress: int
+    reviewed: int
+    done: int
+
+class AnalyticsSummary(BaseModel):
+    scope: str
+    bucket: str
+    total: int
+    by_outcome: Dict[str, int]
+    by_status: Dict[str, int]
+    average_confidence: Optional[float]
+    success_rate: Optional[float]
+    completion_rate: Optional[float]
+    confidence: List[ConfidenceStats]
+    periods: List[PeriodStats]
+    breakdown: List[BreakdownRow]
+
+
+def _scope_filter(user_id: str, team_id: Optional[str]):
+    return Decision.team_id == team_id if team_id else Decision.user_id == user_id
+
+
+def stats_scope(user_id: str, team_id: Optional[str] = None) -> str:
+    return f"team:{team_id}" if team_id else f"user:{user_id}"
+
+
+def load_decision_stats(db: Session, scope: str) -> dict:
+    """Counts for a decision_stats scope; zeros if the scope has no decisions"""
+    stats = db.get(DecisionStats, scope)
+    return {name: getattr(stats, name) if stats else 0 for name in DecisionCounts.model_fields}
+
+
+def period_starts(bucket: str, periods: int, today: date) -> List[date]:
+    """Start dates of the last `periods` weeks or months, oldest first, ending with the current one"""
+    if bucket == "week":
+        current = today - timedelta(days=today.weekday())
+        return [current - timedelta(weeks=n) for n in range(periods - 1, -1, -1)]
+    starts = []
+    year, month = today.year, today.month
+    for _ in range(periods):
+        starts.append(date(year, month, 1))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return starts[::-1]
+
+
+def period_expression(dialect: str, bucket: str):
+    """created_at truncated to its week (Monday) or month, as 'YYYY-MM-DD'"""
+    if dialect == "postgresql":
+        return func.to_char(func.date_trunc(bucket, Decision.created_at), "YYYY-MM-DD")
+    if bucket == "week":
+        return func.date(Decision.created_at, "-6 days", "weekday 1")
+    return func.strftime("%Y-%m-01", Decision.created_at)
+
+
+def breakdown_query(user_id: str, team_id: Optional[str] = None):
+    return (
+        select(Decision.outcome, Decision.status, Decision.confidence_level, func.count())
+        .where(_scope_filter(user_id, team_id))
+        .group_by(Decision.outcome, Decision.status, Decision.confidence_level)
+    )
+
+
+def period_query(dialect: str, bucket: str, since: date, user_id: str, team_id: Optional[str] = None):
+    period = period_expression(dialect, bucket).label("period")
+    return (
+        select(period, Decision.outcome, func.count())
+        .where(_scope_filter(user_id, team_id), Decision.created_at >= datetime.combine(since, datetime.min.time()))
+        .group_by(period, Decision.outcome)
+    )
+
+
+def _rate(part: int, whole: int) -> Optional[float]:
+    return round(part / whole, 4) if whole else None
+
+
+def summarize(breakdown: list, period_rows: list, starts: List[date]) -> dict:
+    """Fold the grouped rows into the figures the analytics page shows"""
+    by_outcome = dict.fromkeys(OUTCOMES, 0)
+    by_status = dict.fromkeys(STATUSES, 0)
+    levels = {level: [0, 0] for level in CONFIDENCE_LEVELS}
+    total = confidence_sum = 0
+    for outcome, status, confidence, count in breakdown:
+        total += count
+        by_outcome[outcome] = by_outcome.get(outcome, 0) + count
+        by_status[status] = by_status.get(status, 0) + count
+        if confidence is not None:
+            confidence_sum += confidence * count
+            if confidence in levels:
+                levels[confidence][0] += count
+                if outcome == "success":
+                    levels[confidence][1] += count
+
+    periods = {start.isoformat(): dict.fromkeys(OUTCOMES, 0) for start in starts}
+    for period, outcome, count in period_rows:
+        # Rows from before the first bucket's start can't appear (the query filters on it)
+        counts = periods.get(str(period)[:10])
+        if counts is not None:
+            counts[outcome] = counts.get(outcome, 0) + count
+
+    return {
+        "total": total,
+        "by_outcome": by_outcome,
+        "by_status": by_status,
+        "average_confidence": round(confidence_sum / total, 2) if total else None,
+        "success_rate": _rate(by_outcome["success"], total),
+        "completion_rate": _rate(by_status["done"], total),
+        "confidence": [
+            {"level": level, "count": count, "success": success, "success_rate": _rate(success, count)}
+            for level, (count, success) in levels.items()
+        ],
+        "periods": [
+            {"period": start, "total": sum(counts.values()), "by_outcome": counts}
+            for start, counts in zip(starts, periods.values())
+        ],
+        "breakdown": [
+            {"outcome": outcome, "status": status, "confidence_level": confidence, "count": count}
+            for outcome, status, confidence, count in breakdown
+        ],
+    }
+
+
+@router.get("/summary", response_model=AnalyticsSummary)
+def get_summary(
+    request: Request,
+    response: Response,
+    team_id: Optional[str] = None,
+    bucket: Literal["week", "month"] = "month",
+    periods: int = Query(6, ge=1, le=MAX_PERIODS),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Decision counts by outcome, status, confidence and period for the user's or a team's decisions"""
+    if team_id:
+        memberships.require_member(team_id)
+    scope = list_scopes(current_user.id, team_id)[0]
+    starts = period_starts(bucket, periods, datetime.now(timezone.utc).date())
+    # The buckets move with the calendar, so a new current bucket is a new ETag even without writes
+    versions = check_etag(db, request, response, current_user.id, [scope], salt=starts[0].isoformat())
+    # The version changes with every decision write in the scope, retiring stale entries
+    key = (scope, versions.get(scope, 0), bucket, starts[0])
+    summary = analytics_cache.get(key)
+    if summary is None:
+        dialect = db.get_bind().dialect.name
+        breakdown = db.execute(breakdown_query(current_user.id, team_id)).all()
+        period_rows = db.execute(period_query(dialect, bucket, starts[0], current_user.id, team_id)).all()
+        summary = summarize(breakdown, period_rows, starts)
+        analytics_cache.set(key, summary)
+
+    return {"scope": scope, "bucket": bucket, **summary}
+
+
+@router.get("/stats", response_model=DecisionCounts)
+def get_stats(
+    team_id: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Running decision counts for the user's or a team's decisions"""
+    if team_id:
+        memberships.require_member(team_id)
+    return load_decision_stats(db, stats_scope(current_user.id, team_id))
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db
+from models import User
+from auth import get_password_hash_async, verify_password_async, create_access_token
+from routers.auth_routes import UserRegister, UserLogin, TokenResponse
+
+# AsyncSession implementation of routers/auth_routes.py, mounted ahead of it when ASYNC_DB is set
+router = APIRouter(
+    prefix="/auth",
+    tags=["auth"]
+)
+
+
+async def _get_user_by_email(db: AsyncSession, email: str):
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    # Hand the connection back to the pool before the slow hashing step;
+    # the loaded (now detached) user keeps its attributes
+    await db.close()
+    return user
+
+
+@router.post("/register", response_model=TokenResponse)
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
+    """Register a new user"""
+    # Check if email exists
+    existing = await _get_user_by_email(db, user_data.email)
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
+    # Create user
+    user = User(
+        email=user_data.email,
+        password_hash=await get_password_hash_async(user_data.password),
+        full_name=user_data.full_name
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    
+    # Create token
+    access_token = create_access_token(data={"sub": user.id})
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user
+    }
+
+
+@router.post("/login", response_model=TokenResponse)
+async def login(credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login and get access token"""
+    user = await _get_user_by_email(db, credentials.email)
+    
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_password_async(credentials.password, user.password_hash)
+    
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+    
+    # Opt-in upgrade of hashes made with different rounds (PASSWORD_REHASH_ON_LOGIN)
+    if new_hash:
+        # The lookup closed the session, so the user is detached: re-attach it
+        user.password_hash = new_hash
+        db.add(user)
+        await db.commit()
+    
+    # Create token
+    access_token = create_access_token(data={"sub": user.id})
+    
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user": user
+    }
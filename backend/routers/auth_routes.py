@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from database import get_db
 from models import User
-from auth import get_password_hash, verify_password, create_access_token
+from auth import get_password_hash_async, verify_password_async, create_access_token
 
 router = APIRouter(
     prefix="/auth",
@@ -34,11 +35,28 @@ class TokenResponse(BaseModel):
     user: UserResponse
 
 
+def _get_user_by_email(db: Session, email: str):
+    user = db.query(User).filter(User.email == email).first()
+    # Hand the connection back to the pool before the slow hashing step;
+    # the loaded (now detached) user keeps its attributes
+    db.close()
+    return user
+
+
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+# Register and login are async so that waiting on the password hashing pool
+# does not hold a threadpool thread; DB work is pushed back onto the threadpool.
 @router.post("/register", response_model=TokenResponse)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if email exists
-    existing = db.query(User).filter(User.email == user_data.email).first()
+    existing = await run_in_threadpool(_get_user_by_email, db, user_data.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,12 +66,10 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     # Create user
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await get_password_hash_async(user_data.password),
         full_name=user_data.full_name
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    user = await run_in_threadpool(_save_user, db, user)
     
     # Create token
     access_token = create_access_token(data={"sub": user.id})
@@ -66,16 +82,25 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """Login and get access token"""
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = await run_in_threadpool(_get_user_by_email, db, credentials.email)
+    
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await verify_password_async(credentials.password, user.password_hash)
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
     
+    # Opt-in upgrade of hashes made with different rounds (PASSWORD_REHASH_ON_LOGIN)
+    if new_hash:
+        user.password_hash = new_hash
+        user = await run_in_threadpool(_save_user, db, user)
+    
     # Create token
     access_token = create_access_token(data={"sub": user.id})
     
@@ -7,6 +7,7 @@ import random
 from database import get_db
 from models import Decision, User
 from auth import get_current_user
+from routers.analytics import load_decision_stats, stats_scope
 
 router = APIRouter(
     prefix="/bot",
@@ -24,39 +25,43 @@ class BotResponse(BaseModel):
 @router.post("/query", response_model=BotResponse)
 def query_bot(query_data: BotQuery, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     query = query_data.query.lower()
-    user_decisions = db.query(Decision).filter(Decision.user_id == current_user.id).all()
+    # Counts come from decision_stats; only the few rows shown as sources are loaded
+    stats = load_decision_stats(db, stats_scope(current_user.id))
+
+    def latest(*criteria, limit: int = 3):
+        return (
+            db.query(Decision.id, Decision.title)
+            .filter(Decision.user_id == current_user.id, *criteria)
+            .order_by(Decision.created_at.desc(), Decision.id.desc())
+            .limit(limit)
+            .all()
+        )
     
     # Simple rule-based logic for MVP
     
     # 1. Count decisions
     if "how many decisions" in query or "total decisions" in query:
-        count = len(user_decisions)
-        return {"answer": f"You have logged a total of {count} decisions so far."}
+        return {"answer": f"You have logged a total of {stats['total']} decisions so far."}
     
     # 2. Successful outcomes
     if "successful" in query or "success" in query:
-        success_decisions = [d for d in user_decisions if d.outcome == 'success']
-        count = len(success_decisions)
-        sources = [{"title": d.title, "id": d.id} for d in success_decisions[:3]]
+        sources = [{"title": d.title, "id": d.id} for d in latest(Decision.outcome == 'success')]
         return {
-            "answer": f"You have {count} decisions marked as successful.",
+            "answer": f"You have {stats['success']} decisions marked as successful.",
             "sources": sources
         }
     
     # 3. Pending/Open decisions
     if "pending" in query or "open" in query:
-        pending_decisions = [d for d in user_decisions if d.status == 'pending']
-        count = len(pending_decisions)
-        sources = [{"title": d.title, "id": d.id} for d in pending_decisions[:3]]
+        sources = [{"title": d.title, "id": d.id} for d in latest(Decision.status == 'pending')]
         return {
-            "answer": f"You have {count} pending decisions waiting for review.",
+            "answer": f"You have {stats['pending']} pending decisions waiting for review.",
             "sources": sources
         }
     
     # 4. Recent decisions
     if "recent" in query or "latest" in query:
-        recent = sorted(user_decisions, key=lambda x: x.created_at, reverse=True)[:3]
-        sources = [{"title": d.title, "id": d.id} for d in recent]
+        sources = [{"title": d.title, "id": d.id} for d in latest()]
         return {
             "answer": "Here are your most recent decisions:",
             "sources": sources
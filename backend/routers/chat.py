@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
-from database import get_db
-from models import Message, User, TeamMember
+from database import get_db, get_read_db
+from models import Message, User
 from auth import get_current_user
+from authz import Memberships, get_memberships
+from etags import check_etag
 
 router = APIRouter(
     prefix="/chat",
@@ -30,16 +32,11 @@ class MessageResponse(BaseModel):
         orm_mode = True
 
 @router.get("/{team_id}", response_model=List[MessageResponse])
-def get_messages(team_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_messages(request: Request, response: Response, team_id: str, db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user), memberships: Memberships = Depends(get_memberships)):
     # Check if user is member of the team
-    member = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id
-    ).first()
-    
-    if not member:
-        raise HTTPException(status_code=403, detail="Not a member of this team")
+    memberships.require_member(team_id)
 
+    check_etag(db, request, response, current_user.id, [f"chat:{team_id}"])
     messages = db.query(Message).filter(Message.team_id == team_id).order_by(Message.created_at.asc()).limit(50).all()
     
     # Format response to include user details
@@ -63,15 +60,9 @@ def get_messages(team_id: str, db: Session = Depends(get_db), current_user: User
     return results
 
 @router.post("/", response_model=MessageResponse)
-def send_message(message: MessageCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def send_message(message: MessageCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user), memberships: Memberships = Depends(get_memberships)):
     # Check if user is member of the team
-    member = db.query(TeamMember).filter(
-        TeamMember.team_id == message.team_id,
-        TeamMember.user_id == current_user.id
-    ).first()
-    
-    if not member:
-        raise HTTPException(status_code=403, detail="Not a member of this team")
+    memberships.require_member(message.team_id)
 
     new_message = Message(
         team_id=message.team_id,
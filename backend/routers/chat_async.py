@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from database import get_async_db, get_async_read_db
+from models import Message, User
+from auth import get_current_user_async
+from authz import Memberships, get_memberships_async
+from etags import check_etag
+from routers.chat import MessageCreate, MessageResponse
+
+# AsyncSession implementation of routers/chat.py, mounted ahead of it when ASYNC_DB is set
+router = APIRouter(
+    prefix="/chat",
+    tags=["chat"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.get("/{team_id}", response_model=List[MessageResponse])
+async def get_messages(request: Request, response: Response, team_id: str, db: AsyncSession = Depends(get_async_read_db), current_user: User = Depends(get_current_user_async), memberships: Memberships = Depends(get_memberships_async)):
+    # Check if user is member of the team
+    memberships.require_member(team_id)
+    await db.run_sync(check_etag, request, response, current_user.id, [f"chat:{team_id}"])
+
+    # Senders come back in the same query instead of one lookup per message
+    result = await db.execute(
+        select(Message, User)
+        .join(User, User.id == Message.user_id)
+        .where(Message.team_id == team_id)
+        .order_by(Message.created_at.asc())
+        .limit(50)
+    )
+    
+    return [
+        {
+            "id": msg.id,
+            "team_id": msg.team_id,
+            "user_id": msg.user_id,
+            "content": msg.content,
+            "created_at": msg.created_at,
+            "user": {
+                "id": sender.id,
+                "full_name": sender.full_name,
+                "email": sender.email
+            }
+        }
+        for msg, sender in result.all()
+    ]
+
+@router.post("/", response_model=MessageResponse)
+async def send_message(message: MessageCreate, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user_async), memberships: Memberships = Depends(get_memberships_async)):
+    # Check if user is member of the team
+    memberships.require_member(message.team_id)
+
+    new_message = Message(
+        team_id=message.team_id,
+        user_id=current_user.id,
+        content=message.content
+    )
+    db.add(new_message)
+    await db.commit()
+    await db.refresh(new_message)
+    
+    user_data = {
+        "id": current_user.id,
+        "full_name": current_user.full_name,
+        "email": current_user.email
+    }
+    
+    return {
+        "id": new_message.id,
+        "team_id": new_message.team_id,
+        "user_id": new_message.user_id,
+        "content": new_message.content,
+        "created_at": new_message.created_at,
+        "user": user_data
+    }
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List
-from datetime import datetime
-from database import get_db
-from models import Comment, Decision, User
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, tuple_, union_all
+from sqlalchemy.orm import Session, joinedload
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+from datetime import datetime, timezone
+from database import get_db, get_read_db
+from models import Comment, CommentCount, Decision, User, MAX_COMMENT_DEPTH, generate_uuid, thread_segment, subtree_end
 from auth import get_current_user
+from authz import Memberships, get_memberships, require_decision_access, decision_owners_query
+from etags import check_etag
+from cursors import pack_cursor, unpack_cursor, encode_cursor, decode_cursor
 
 router = APIRouter(
     prefix="/comments",
@@ -16,6 +20,7 @@ router = APIRouter(
 class CommentCreate(BaseModel):
     decision_id: str
     content: str
+    parent_id: Optional[str] = None  # reply to this comment
 
 class CommentUpdate(BaseModel):
     content: str
@@ -25,37 +30,316 @@ class CommentResponse(BaseModel):
     decision_id: str
     user_id: str
     content: str
+    parent_id: Optional[str] = None
+    depth: int = 0
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
 
+class CommentAuthor(BaseModel):
+    id: str
+    full_name: Optional[str] = None
+
+class CommentWithAuthor(CommentResponse):
+    author: Optional[CommentAuthor] = None
+
+class CommentPage(BaseModel):
+    items: List[CommentWithAuthor]
+    next_cursor: Optional[str] = None
+
+class CommentThread(CommentWithAuthor):
+    replies: List[CommentWithAuthor]  # the first replies under this comment, in thread order
+    more_replies: bool
+
+class CommentThreadPage(BaseModel):
+    items: List[CommentThread]
+    next_cursor: Optional[str] = None
+
+class CommentCountsRequest(BaseModel):
+    decision_ids: List[str] = Field(..., min_length=1, max_length=200)
+
+class CommentCountEntry(BaseModel):
+    decision_id: str
+    count: int
+
+class CommentCountsResponse(BaseModel):
+    counts: List[CommentCountEntry]
+    unavailable: List[str]  # missing, or not visible to the caller
+
+DEFAULT_COMMENT_PAGE = 50
+MAX_COMMENT_PAGE = 200
+DEFAULT_THREAD_PAGE = 20
+MAX_THREAD_PAGE = 100
+DEFAULT_THREAD_REPLIES = 3
+MAX_THREAD_REPLIES = 50
+
+
+def comment_with_author(comment: Comment) -> dict:
+    """CommentWithAuthor from a comment whose user is loaded"""
+    return {
+        **CommentResponse.model_validate(comment).model_dump(),
+        "author": {"id": comment.user.id, "full_name": comment.user.full_name} if comment.user else None,
+    }
+
+
+def comments_query(decision_id: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """A decision's comments with their authors (one join), oldest first; keyset-paged when limit is set"""
+    query = (
+        select(Comment)
+        .options(joinedload(Comment.user))
+        .where(Comment.decision_id == decision_id)
+    )
+    if cursor:
+        query = query.where(tuple_(Comment.created_at, Comment.id) > decode_cursor(cursor))
+    query = query.order_by(Comment.created_at, Comment.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+# --- Threads ----------------------------------------------------------------
+# Thread order is path order (models.thread_segment): each comment before its
+# replies, siblings oldest first. A subtree is the path range
+# [path, subtree_end(path)), one level of it is that range at a single depth,
+# so every read below is a range scan on (decision_id, path) or
+# (decision_id, depth, path).
+
+def encode_path_cursor(path: str) -> str:
+    return pack_cursor([path])
+
+
+def decode_path_cursor(cursor: str) -> str:
+    try:
+        (path,) = unpack_cursor(cursor)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(path, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return path
+
+
+def _in_thread(query, decision_id: str, within: Optional[str], depth: Optional[int], after: Optional[str]):
+    query = query.where(Comment.decision_id == decision_id)
+    if depth is not None:
+        query = query.where(Comment.depth == depth)
+    if within is not None:
+        query = query.where(Comment.path >= within, Comment.path < subtree_end(within))
+    if after is not None:
+        query = query.where(Comment.path > after)
+    return query.order_by(Comment.path)
+
+
+def thread_query(decision_id: str, within: Optional[str] = None, depth: Optional[int] = None, after: Optional[str] = None, limit: Optional[int] = None):
+    """
+    A decision's comments with their authors in thread order: the subtree
+    rooted at path `within` (the whole decision when None), only those at
+    `depth` if given, resuming after path `after`; limit fetches one extra row
+    to detect a next page.
+    """
+    query = _in_thread(select(Comment).options(joinedload(Comment.user)), decision_id, within, depth, after)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def thread_replies_query(decision_id: str, root_paths: List[str], per_thread: int):
+    """
+    The first per_thread + 1 replies under each root, in one statement: a
+    UNION ALL of limited range scans, so the cost follows the page, not the
+    length of the threads. Unordered; build_thread_page sorts by path.
+    """
+    arms = [
+        _in_thread(select(Comment.id), decision_id, within=path, depth=None, after=path).limit(per_thread + 1).subquery().select()
+        for path in root_paths
+    ]
+    ids = union_all(*arms) if len(arms) > 1 else arms[0]
+    return select(Comment).options(joinedload(Comment.user)).where(Comment.id.in_(ids))
+
+
+def thread_root(path: str) -> str:
+    return path[:path.index("/") + 1]
+
 
-@router.get("/decision/{decision_id}", response_model=List[CommentResponse])
+def build_thread_page(roots: list, replies: list, size: int, per_thread: int) -> dict:
+    """CommentThreadPage from a limit + 1 page of top-level comments and their reply previews"""
+    page = roots[:size]
+    by_root = {}
+    for reply in sorted(replies, key=lambda c: c.path):
+        by_root.setdefault(thread_root(reply.path), []).append(reply)
+    items = []
+    for root in page:
+        under = by_root.get(root.path, [])
+        items.append({
+            **comment_with_author(root),
+            "replies": [comment_with_author(c) for c in under[:per_thread]],
+            "more_replies": len(under) > per_thread,
+        })
+    return {"items": items, "next_cursor": encode_path_cursor(page[-1].path) if len(roots) > size else None}
+
+
+def path_page(rows: list, size: int) -> dict:
+    page = rows[:size]
+    return {
+        "items": [comment_with_author(c) for c in page],
+        "next_cursor": encode_path_cursor(page[-1].path) if len(rows) > size else None,
+    }
+
+
+def _get_visible_comment(db: Session, memberships: Memberships, comment_id: str) -> Comment:
+    comment = db.get(Comment, comment_id)
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    require_decision_access(db, memberships, comment.decision_id, "view")
+    return comment
+
+
+def comment_counts_query(decision_ids):
+    return select(CommentCount.decision_id, CommentCount.count).where(CommentCount.decision_id.in_(list(decision_ids)))
+
+
+def comment_counts(decision_ids: List[str], visible: List[str], counts: list) -> dict:
+    """CommentCountsResponse in request order; decisions without a counter row have no comments"""
+    count_by_id = dict(counts)
+    requested = list(dict.fromkeys(decision_ids))
+    visible = set(visible)
+    return {
+        "counts": [
+            {"decision_id": decision_id, "count": count_by_id.get(decision_id, 0)}
+            for decision_id in requested if decision_id in visible
+        ],
+        "unavailable": [decision_id for decision_id in requested if decision_id not in visible],
+    }
+
+
+@router.get("/decision/{decision_id}", response_model=Union[List[CommentWithAuthor], CommentPage])
 def get_comments(
+    request: Request,
+    response: Response,
     decision_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
-    """Get all comments for a decision"""
-    return db.query(Comment).filter(
-        Comment.decision_id == decision_id
-    ).order_by(Comment.created_at).all()
+    """Get a decision's comments, oldest first, each with its author. Passing
+    limit and/or cursor returns a keyset-paginated page: {items, next_cursor}"""
+    require_decision_access(db, memberships, decision_id, "view")
+    size = None if limit is None and cursor is None else min(limit or DEFAULT_COMMENT_PAGE, MAX_COMMENT_PAGE)
+    check_etag(db, request, response, current_user.id, [f"decision:{decision_id}"])
+    rows = db.execute(comments_query(decision_id, cursor, size)).scalars().all()
+    if size is None:
+        return [comment_with_author(c) for c in rows]
+    page = rows[:size]
+    return {
+        "items": [comment_with_author(c) for c in page],
+        "next_cursor": encode_cursor(page[-1]) if len(rows) > size else None,
+    }
+
+
+@router.post("/counts", response_model=CommentCountsResponse)
+def get_comment_counts(
+    request: CommentCountsRequest,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Comment counts for many decisions (e.g. list badges) from the maintained counters, in two queries"""
+    owners = db.execute(decision_owners_query(request.decision_ids)).all()
+    visible = [row.id for row in memberships.accessible(owners)]
+    counts = db.execute(comment_counts_query(visible)).all() if visible else []
+    return comment_counts(request.decision_ids, visible, counts)
+
+
+@router.get("/decision/{decision_id}/threads", response_model=CommentThreadPage)
+def get_threads(
+    request: Request,
+    response: Response,
+    decision_id: str,
+    limit: int = Query(DEFAULT_THREAD_PAGE, ge=1, le=MAX_THREAD_PAGE),
+    cursor: Optional[str] = None,
+    replies: int = Query(DEFAULT_THREAD_REPLIES, ge=0, le=MAX_THREAD_REPLIES),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """A page of top-level comments, oldest first, each with its first `replies`
+    replies in thread order; more_replies says whether the thread goes on"""
+    require_decision_access(db, memberships, decision_id, "view")
+    after = decode_path_cursor(cursor) if cursor else None
+    check_etag(db, request, response, current_user.id, [f"decision:{decision_id}"])
+    roots = db.execute(thread_query(decision_id, depth=0, after=after, limit=limit)).scalars().all()
+    previews = []
+    if replies and roots:
+        previews = db.execute(thread_replies_query(decision_id, [root.path for root in roots[:limit]], replies)).scalars().all()
+    return build_thread_page(roots, previews, limit, replies)
+
+
+@router.get("/{comment_id}/replies", response_model=CommentPage)
+def get_replies(
+    request: Request,
+    response: Response,
+    comment_id: str,
+    limit: int = Query(DEFAULT_COMMENT_PAGE, ge=1, le=MAX_COMMENT_PAGE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Direct replies to a comment, oldest first"""
+    comment = _get_visible_comment(db, memberships, comment_id)
+    after = decode_path_cursor(cursor) if cursor else None
+    check_etag(db, request, response, current_user.id, [f"decision:{comment.decision_id}"])
+    rows = db.execute(thread_query(comment.decision_id, within=comment.path, depth=comment.depth + 1, after=after, limit=limit)).scalars().all()
+    return path_page(rows, limit)
+
+
+@router.get("/{comment_id}/thread", response_model=CommentPage)
+def get_thread(
+    request: Request,
+    response: Response,
+    comment_id: str,
+    limit: int = Query(DEFAULT_COMMENT_PAGE, ge=1, le=MAX_COMMENT_PAGE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """A comment and every reply under it at any depth, in thread order"""
+    comment = _get_visible_comment(db, memberships, comment_id)
+    after = decode_path_cursor(cursor) if cursor else None
+    check_etag(db, request, response, current_user.id, [f"decision:{comment.decision_id}"])
+    rows = db.execute(thread_query(comment.decision_id, within=comment.path, after=after, limit=limit)).scalars().all()
+    return path_page(rows, limit)
 
 
 @router.post("/", response_model=CommentResponse)
 def create_comment(
     comment: CommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
-    """Create a comment"""
+    """Create a comment, or a reply when parent_id is set"""
+    require_decision_access(db, memberships, comment.decision_id, "comment on")
     db_comment = Comment(
         decision_id=comment.decision_id,
         user_id=current_user.id,
         content=comment.content
     )
+    if comment.parent_id:
+        parent = db.get(Comment, comment.parent_id)
+        if not parent or parent.decision_id != comment.decision_id:
+            raise HTTPException(status_code=404, detail="Parent comment not found")
+        if parent.depth + 1 >= MAX_COMMENT_DEPTH:
+            raise HTTPException(status_code=400, detail=f"Replies nest at most {MAX_COMMENT_DEPTH} levels deep")
+        db_comment.id = generate_uuid()
+        db_comment.created_at = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        db_comment.parent_id = parent.id
+        db_comment.depth = parent.depth + 1
+        db_comment.path = parent.path + thread_segment(db_comment.created_at, db_comment.id)
     db.add(db_comment)
     db.commit()
     db.refresh(db_comment)
@@ -90,7 +374,7 @@ def delete_comment(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Delete a comment"""
+    """Delete a comment; one with replies keeps its row with a blank body so the thread stays intact"""
     db_comment = db.query(Comment).filter(
         Comment.id == comment_id,
         Comment.user_id == current_user.id
@@ -99,6 +383,15 @@ def delete_comment(
     if not db_comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    db.delete(db_comment)
+    # Replies may be other users' comments, so they are never deleted with it
+    has_replies = db.query(Comment.id).filter(
+        Comment.decision_id == db_comment.decision_id,
+        Comment.path > db_comment.path,
+        Comment.path < subtree_end(db_comment.path)
+    ).first() is not None
+    if has_replies:
+        db_comment.content = ""
+    else:
+        db.delete(db_comment)
     db.commit()
     return {"detail": "Comment deleted successfully"}
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends
+from models import User
+from auth import get_current_user, principal_cache
+from authz import membership_cache
+from routers.analytics import analytics_cache
+from hashing import password_hasher
+from database import sqlite_pragma_report, pool_status, read_engine
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"]
+)
+
+
+@router.get("/auth-cache")
+def get_auth_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters for the principal cache"""
+    return principal_cache.stats()
+
+
+@router.get("/membership-cache")
+def get_membership_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters for the team membership cache"""
+    return membership_cache.stats()
+
+
+@router.get("/analytics-cache")
+def get_analytics_cache_stats(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters for the analytics summary cache"""
+    return analytics_cache.stats()
+
+
+@router.get("/password-hasher")
+def get_password_hasher_stats(current_user: User = Depends(get_current_user)):
+    """Sizing and rejection count of the password hashing pool"""
+    return {
+        "workers": password_hasher.workers,
+        "max_pending": password_hasher.max_pending,
+        "rejected": password_hasher.rejected
+    }
+
+
+@router.get("/sqlite")
+def get_sqlite_settings(current_user: User = Depends(get_current_user)):
+    """Effective SQLite pragmas for the current profile"""
+    return sqlite_pragma_report()
+
+
+@router.get("/pool")
+def get_pool_status(current_user: User = Depends(get_current_user)):
+    """Connection pool occupancy and checkout-wait histogram"""
+    status = pool_status()
+    if read_engine is not None:
+        status["read_replica"] = pool_status(read_engine)
+    return status
@@ -1,11 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
-from database import get_db
-from models import Decision, User
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import select, insert, update, delete, tuple_, func, literal_column, or_, and_
+from sqlalchemy.sql import table, column
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, selectinload
+from pydantic import BaseModel, Field, ValidationError
+from typing import Optional, List, Union, Dict, Any, Literal, Tuple, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import csv
+import io
+import json
+import os
+from database import get_db, get_read_db
+from models import Decision, User, Comment, Vote, Tag, DecisionTag, generate_uuid
 from auth import get_current_user
+from authz import Memberships, get_memberships, decision_owners_query, require_decision_access
+from etags import check_etag
+from cursors import pack_cursor, unpack_cursor, encode_cursor, decode_cursor
+from importer import IMPORT_BATCH_SIZE, run_import
+from routers.comments import CommentWithAuthor, comment_with_author
+from routers.votes import VoteSummary, summarize_votes
+from routers.tags import TagResponse
 
 router = APIRouter(
     prefix="/decisions",
@@ -49,31 +66,377 @@ class DecisionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DecisionPage(BaseModel):
+    items: List[DecisionResponse]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # only with include_total=true
+    total_is_estimate: bool = False
 
-@router.get("/", response_model=List[DecisionResponse])
+class DecisionFieldsPage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+# Full rows, a page of them, or the same with only the projected columns
+DecisionListResponse = Union[List[DecisionResponse], DecisionPage, List[Dict[str, Any]], DecisionFieldsPage]
+class DecisionSearchResult(DecisionResponse):
+    score: float
+
+class DecisionSearchPage(BaseModel):
+    items: List[DecisionSearchResult]
+    next_cursor: Optional[str] = None
+
+
+MAX_BULK_OPERATIONS = 1000
+
+class BulkOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None  # update / delete
+    data: Optional[Dict[str, Any]] = None  # DecisionCreate for create, DecisionUpdate for update
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation] = Field(..., max_length=MAX_BULK_OPERATIONS)
+
+class BulkResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: int
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    applied: int
+    results: List[BulkResult]
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# include_total counts exactly up to this many rows, then falls back to the planner's estimate
+DECISION_COUNT_EXACT_LIMIT = int(os.getenv("DECISION_COUNT_EXACT_LIMIT", "1000"))
+
+# view=summary: what list views (KanbanBoard, DecisionCard) render; skips the Text columns
+SUMMARY_FIELDS = ["id", "team_id", "title", "confidence_level", "status", "outcome", "created_at", "updated_at"]
+
+
+def projected_fields(view: Optional[str], fields: Optional[str]) -> Optional[List[str]]:
+    """Columns to return for view=summary or fields=a,b,c; None means full rows"""
+    if fields:
+        names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [name for name in names if name not in DecisionResponse.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        return names or None
+    if view == "summary":
+        return SUMMARY_FIELDS
+    return None
+
+
+@dataclass
+class DecisionFilters:
+    status: List[str] = field(default_factory=list)
+    outcome: List[str] = field(default_factory=list)
+    min_confidence: Optional[int] = None
+    max_confidence: Optional[int] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    tags: List[str] = field(default_factory=list)
+    tag_match: str = "any"  # any | all
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def decision_filters(
+    status: Optional[List[str]] = Query(None),
+    outcome: Optional[List[str]] = Query(None),
+    min_confidence: Optional[int] = None,
+    max_confidence: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    updated_after: Optional[datetime] = None,
+    updated_before: Optional[datetime] = None,
+    tag: Optional[List[str]] = Query(None, description="Tag id; repeat for several"),
+    tag_match: str = Query("any", pattern="^(any|all)$"),
+) -> DecisionFilters:
+    """Query-string filters for decision lists. Repeated status/outcome/tag
+    values are OR-ed; tag_match=all requires every tag. Date windows are
+    inclusive of *_after and exclusive of *_before"""
+    return DecisionFilters(
+        status=status or [],
+        outcome=outcome or [],
+        min_confidence=min_confidence,
+        max_confidence=max_confidence,
+        created_after=_utc_naive(created_after),
+        created_before=_utc_naive(created_before),
+        updated_after=_utc_naive(updated_after),
+        updated_before=_utc_naive(updated_before),
+        tags=tag or [],
+        tag_match=tag_match,
+    )
+
+
+def apply_filters(query, filters: DecisionFilters):
+    """AND the filters onto a select() over decisions"""
+    if filters.status:
+        query = query.where(Decision.status.in_(filters.status))
+    if filters.outcome:
+        query = query.where(Decision.outcome.in_(filters.outcome))
+    if filters.min_confidence is not None:
+        query = query.where(Decision.confidence_level >= filters.min_confidence)
+    if filters.max_confidence is not None:
+        query = query.where(Decision.confidence_level <= filters.max_confidence)
+    if filters.created_after is not None:
+        query = query.where(Decision.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(Decision.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        query = query.where(Decision.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        query = query.where(Decision.updated_at < filters.updated_before)
+    if filters.tags:
+        tags = set(filters.tags)
+        tagged = select(DecisionTag.decision_id).where(DecisionTag.tag_id.in_(tags))
+        if filters.tag_match == "all" and len(tags) > 1:
+            tagged = tagged.group_by(DecisionTag.decision_id).having(func.count(DecisionTag.tag_id) == len(tags))
+        query = query.where(Decision.id.in_(tagged))
+    return query
+
+
+def decision_list_query(user_id: str, team_id: Optional[str] = None, cursor: Optional[str] = None, limit: Optional[int] = None, columns: Optional[List[str]] = None, filters: Optional[DecisionFilters] = None):
+    """Team or personal decisions, newest first; keyset-paged when limit is set.
+    With columns, selects just those (plus the keyset columns) instead of whole rows"""
+    if columns:
+        selected = list(dict.fromkeys(columns + ["created_at", "id"]))
+        query = select(*[getattr(Decision, name) for name in selected])
+    else:
+        query = select(Decision)
+    
+    if team_id:
+        query = query.where(Decision.team_id == team_id)
+    else:
+        query = query.where(Decision.user_id == user_id)
+    
+    if filters is not None:
+        query = apply_filters(query, filters)
+    
+    if cursor:
+        query = query.where(tuple_(Decision.created_at, Decision.id) < decode_cursor(cursor))
+    
+    query = query.order_by(Decision.created_at.desc(), Decision.id.desc())
+    if limit is not None:
+        # One extra row tells us whether another page exists
+        query = query.limit(limit + 1)
+    return query
+
+
+def list_scopes(user_id: str, team_id: Optional[str]) -> List[str]:
+    return [f"decisions:team:{team_id}"] if team_id else [f"decisions:user:{user_id}"]
+
+
+def search_scopes(memberships: Memberships) -> List[str]:
+    """Search covers the user's decisions and those of every team they are in"""
+    return [f"decisions:user:{memberships.user_id}", f"teams:user:{memberships.user_id}"] + [
+        f"decisions:team:{team_id}" for team_id in sorted(memberships.team_ids)
+    ]
+
+
+def page_size(limit: Optional[int], cursor: Optional[str], include_total: bool = False) -> Optional[int]:
+    """None keeps the legacy unpaged list; otherwise clamp to MAX_PAGE_SIZE"""
+    if limit is None and cursor is None and not include_total:
+        return None
+    return min(limit or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+
+
+class ExplainJson(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) <statement>, executed with the statement's own bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(ExplainJson, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def count_decisions(db: Session, query) -> Tuple[int, bool]:
+    """
+    (total, is_estimate) for an unpaged decision_list_query. Counting stops
+    after DECISION_COUNT_EXACT_LIMIT rows; past that Postgres reports the
+    planner's row estimate instead of scanning every match. SQLite has no
+    row estimates, so it finishes the exact count.
+    """
+    query = query.order_by(None).with_only_columns(Decision.id)
+    capped = select(func.count()).select_from(query.limit(DECISION_COUNT_EXACT_LIMIT + 1).subquery())
+    total = db.execute(capped).scalar()
+    if total <= DECISION_COUNT_EXACT_LIMIT:
+        return total, False
+    
+    if db.get_bind().dialect.name == "postgresql":
+        plan = db.execute(ExplainJson(query)).scalar()
+        return max(int(plan[0]["Plan"]["Plan Rows"]), total), True
+    return db.execute(select(func.count()).select_from(query.subquery())).scalar(), False
+
+
+def project_rows(rows: list, columns: Optional[List[str]]) -> list:
+    if columns is None:
+        return rows
+    return [{name: getattr(row, name) for name in columns} for row in rows]
+
+
+def build_page(rows: list, limit: int, columns: Optional[List[str]] = None) -> dict:
+    items = rows[:limit]
+    next_cursor = encode_cursor(items[-1]) if len(rows) > limit else None
+    return {"items": project_rows(items, columns), "next_cursor": next_cursor}
+
+
+@router.get("/", response_model=DecisionListResponse)
 def get_decisions(
+    request: Request,
+    response: Response,
     team_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    view: Optional[str] = Query(None, pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    include_total: bool = False,
+    filters: DecisionFilters = Depends(decision_filters),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
-    """Get all decisions for user or team"""
-    query = db.query(Decision)
-    
+    """Get decisions for user or team. Passing limit and/or cursor returns
+    a keyset-paginated page: {items, next_cursor}. view=summary or
+    fields=id,title,... return only those columns. include_total adds
+    total (and total_is_estimate) to the page"""
     if team_id:
-        query = query.filter(Decision.team_id == team_id)
+        memberships.require_member(team_id)
+    size = page_size(limit, cursor, include_total)
+    columns = projected_fields(view, fields)
+    check_etag(db, request, response, current_user.id, list_scopes(current_user.id, team_id))
+    result = db.execute(decision_list_query(current_user.id, team_id, cursor, size, columns, filters))
+    rows = result.all() if columns else result.scalars().all()
+    
+    if size is None:
+        return project_rows(rows, columns)
+    page = build_page(rows, size, columns)
+    if include_total:
+        page["total"], page["total_is_estimate"] = count_decisions(
+            db, decision_list_query(current_user.id, team_id, filters=filters)
+        )
+    return page
+
+
+# --- Full-text search -------------------------------------------------------
+# The index lives outside the ORM model (see migrations 3 and 9): on SQLite
+# an FTS5 table keyed by decisions_search_keys and kept in sync by triggers,
+# on Postgres a generated tsvector column with a GIN index. Scores are
+# "higher is better" on both.
+
+decisions_fts = table("decisions_fts", column("rowid"))
+decisions_search_keys = table("decisions_search_keys", column("search_key"), column("decision_id"))
+
+
+def search_terms(q: str) -> str:
+    """FTS5 query requiring every word of q; quoting keeps user input out of the query syntax"""
+    words = (word.replace('"', "") for word in q.split())
+    return " ".join(f'"{word}"' for word in words if word)
+
+
+def encode_search_cursor(score: float, decision_id: str) -> str:
+    return pack_cursor([score, decision_id])
+
+
+def decode_search_cursor(cursor: str):
+    try:
+        score, decision_id = unpack_cursor(cursor)
+        return float(score), str(decision_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decision_search_query(dialect: str, user_id: str, team_ids: Iterable[str], q: str, team_id: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """Decisions matching q that the user owns or shares a team with, best match first"""
+    if dialect == "sqlite":
+        match = literal_column("decisions_fts")
+        # bm25 column weights follow the declared order: title, context, choice_made, notes
+        score = -func.bm25(match, 10.0, 4.0, 4.0, 2.0)
+        query = (
+            select(Decision, score.label("score"))
+            .select_from(decisions_fts)
+            .join(decisions_search_keys, decisions_search_keys.c.search_key == decisions_fts.c.rowid)
+            .join(Decision, Decision.id == decisions_search_keys.c.decision_id)
+            .where(match.match(search_terms(q)))
+        )
     else:
-        query = query.filter(Decision.user_id == current_user.id)
+        vector = literal_column("decisions.search_vector")
+        tsquery = func.websearch_to_tsquery("english", q)
+        score = func.ts_rank_cd(vector, tsquery)
+        query = select(Decision, score.label("score")).where(vector.op("@@")(tsquery))
+    
+    query = query.where(or_(Decision.user_id == user_id, Decision.team_id.in_(set(team_ids))))
+    if team_id:
+        query = query.where(Decision.team_id == team_id)
+    
+    if cursor:
+        after_score, after_id = decode_search_cursor(cursor)
+        query = query.where(or_(score < after_score, and_(score == after_score, Decision.id < after_id)))
     
-    return query.order_by(Decision.created_at.desc()).all()
+    return query.order_by(score.desc(), Decision.id.desc()).limit(limit + 1)
+
+
+def build_search_page(rows: list, limit: int) -> dict:
+    items = rows[:limit]
+    next_cursor = encode_search_cursor(items[-1].score, items[-1].Decision.id) if len(rows) > limit else None
+    return {
+        "items": [
+            DecisionSearchResult(**DecisionResponse.model_validate(row.Decision).model_dump(), score=row.score)
+            for row in items
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/search", response_model=DecisionSearchPage)
+def search_decisions(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1),
+    team_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Full-text search over title, context, choice_made and notes of the
+    decisions the user can see, ranked by relevance"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and not search_terms(q):
+        return {"items": [], "next_cursor": None}
+    check_etag(db, request, response, current_user.id, search_scopes(memberships))
+    rows = db.execute(decision_search_query(dialect, current_user.id, memberships.team_ids, q, team_id, cursor, limit)).all()
+    return build_search_page(rows, limit)
 
 
 @router.post("/", response_model=DecisionResponse)
 def create_decision(
     decision: DecisionCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Create a new decision"""
+    if decision.team_id:
+        memberships.require_member(decision.team_id)
     db_decision = Decision(
         user_id=current_user.id,
         team_id=decision.team_id,
@@ -91,37 +454,262 @@ def create_decision(
     return db_decision
 
 
-@router.put("/{decision_id}", response_model=DecisionResponse)
-def update_decision(
+# --- Detail page -------------------------------------------------------------
+# Everything the decision page shows, in four queries however many comments,
+# votes and tags there are: the decision, then one selectin query per
+# collection with its users/tags joined in.
+
+class DecisionDetail(DecisionResponse):
+    comments: List[CommentWithAuthor]
+    votes: VoteSummary
+    tags: List[TagResponse]
+
+
+def decision_detail_query(decision_id: str):
+    return select(Decision).where(Decision.id == decision_id).options(
+        selectinload(Decision.comments).joinedload(Comment.user),
+        selectinload(Decision.votes).joinedload(Vote.user),
+        selectinload(Decision.tags).joinedload(DecisionTag.tag),
+    )
+
+
+def build_decision_detail(decision: Decision, current_user_id: str) -> dict:
+    """DecisionDetail from a decision loaded by decision_detail_query()"""
+    comments = sorted(decision.comments, key=lambda c: (c.created_at, c.id))
+    votes = sorted(decision.votes, key=lambda v: (v.created_at, v.id))
+    ballots = [(v.user_id, v.user.full_name if v.user else None, v.vote) for v in votes]
+    return {
+        **DecisionResponse.model_validate(decision).model_dump(),
+        "comments": [comment_with_author(c) for c in comments],
+        "votes": summarize_votes(decision.id, ballots, current_user_id),
+        "tags": sorted((link.tag for link in decision.tags if link.tag is not None), key=lambda t: t.name),
+    }
+
+
+@router.get("/{decision_id}/full", response_model=DecisionDetail)
+def get_decision_detail(
+    request: Request,
+    response: Response,
     decision_id: str,
-    decision: DecisionUpdate,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """A decision with its comments, vote summary and tags"""
+    require_decision_access(db, memberships, decision_id, "view")
+    check_etag(db, request, response, current_user.id, [f"decision:{decision_id}"])
+    decision = db.execute(decision_detail_query(decision_id)).scalars().first()
+    if decision is None:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    return build_decision_detail(decision, current_user.id)
+
+
+# --- Export ------------------------------------------------------------------
+# Rows are streamed in yield_per batches (a server-side cursor on Postgres),
+# so memory stays flat however many decisions are exported. Tags and vote
+# tallies are fetched per batch with one query each.
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_INCLUDES = {"tags", "votes"}
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+VOTE_CHOICES = ["approve", "reject", "abstain"]
+
+
+def export_includes(include: Optional[str]) -> List[str]:
+    names = [name.strip() for name in (include or "").split(",") if name.strip()]
+    unknown = sorted(set(names) - EXPORT_INCLUDES)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include: {', '.join(unknown)}")
+    return [name for name in ("tags", "votes") if name in names]
+
+
+def export_query(user_id: str, team_id: Optional[str], filters: DecisionFilters):
+    query = decision_list_query(user_id, team_id, columns=list(DecisionResponse.model_fields), filters=filters)
+    return query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def export_tags_query(decision_ids: List[str]):
+    return (
+        select(DecisionTag.decision_id, Tag.name)
+        .join(Tag, Tag.id == DecisionTag.tag_id)
+        .where(DecisionTag.decision_id.in_(decision_ids))
+        .order_by(Tag.name)
+    )
+
+
+def export_votes_query(decision_ids: List[str]):
+    return (
+        select(Vote.decision_id, Vote.vote, func.count())
+        .where(Vote.decision_id.in_(decision_ids))
+        .group_by(Vote.decision_id, Vote.vote)
+    )
+
+
+def export_header(export_format: str, includes: List[str]) -> str:
+    if export_format != "csv":
+        return ""
+    columns = list(DecisionResponse.model_fields)
+    if "tags" in includes:
+        columns.append("tags")
+    if "votes" in includes:
+        columns += [f"votes_{choice}" for choice in VOTE_CHOICES]
+    return _csv_line(columns)
+
+
+def _csv_line(values: list) -> str:
+    out = io.StringIO()
+    csv.writer(out).writerow(values)
+    return out.getvalue()
+
+
+def encode_export_batch(export_format: str, rows: list, includes: List[str], tag_rows=(), vote_rows=()) -> str:
+    """One batch of rows as NDJSON lines or CSV records"""
+    tags: Dict[str, List[str]] = {}
+    for decision_id, name in tag_rows:
+        tags.setdefault(decision_id, []).append(name)
+    votes: Dict[str, Dict[str, int]] = {}
+    for decision_id, vote, count in vote_rows:
+        votes.setdefault(decision_id, dict.fromkeys(VOTE_CHOICES, 0))[vote] = count
+
+    chunk = []
+    for row in rows:
+        record = {
+            name: value.isoformat() if isinstance(value, datetime) else value
+            for name, value in ((name, getattr(row, name)) for name in DecisionResponse.model_fields)
+        }
+        tallies = votes.get(record["id"], dict.fromkeys(VOTE_CHOICES, 0))
+        if export_format == "csv":
+            values = list(record.values())
+            if "tags" in includes:
+                values.append(";".join(tags.get(record["id"], [])))
+            if "votes" in includes:
+                values += [tallies.get(choice, 0) for choice in VOTE_CHOICES]
+            chunk.append(_csv_line(values))
+        else:
+            if "tags" in includes:
+                record["tags"] = tags.get(record["id"], [])
+            if "votes" in includes:
+                record["votes"] = tallies
+            chunk.append(json.dumps(record) + "\n")
+    return "".join(chunk)
+
+
+def export_response(stream, export_format: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="decisions.{export_format}"'},
+    )
+
+
+@router.get("/export")
+def export_decisions(
+    team_id: Optional[str] = None,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include: Optional[str] = Query(None, description="Comma-separated: tags, votes"),
+    filters: DecisionFilters = Depends(decision_filters),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Stream the user's or a team's decisions as NDJSON or CSV"""
+    if team_id:
+        memberships.require_member(team_id)
+    includes = export_includes(include)
+    query = export_query(current_user.id, team_id, filters)
+
+    def stream():
+        yield export_header(export_format, includes)
+        for rows in db.execute(query).partitions():
+            ids = [row.id for row in rows]
+            tag_rows = db.execute(export_tags_query(ids)).all() if "tags" in includes else ()
+            vote_rows = db.execute(export_votes_query(ids)).all() if "votes" in includes else ()
+            yield encode_export_batch(export_format, rows, includes, tag_rows, vote_rows)
+
+    return export_response(stream(), export_format)
+
+
+# --- Import ------------------------------------------------------------------
+
+class ImportRecordError(BaseModel):
+    record: int
+    detail: str
+
+class ImportSummary(BaseModel):
+    processed: int
+    imported: int
+    skipped_existing: int
+    rejected: int
+    batches: int
+    checkpoint: int  # input records consumed; pass as skip to resume
+    errors: List[ImportRecordError]
+    error: Optional[str]
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+@router.post("/import", response_model=ImportSummary)
+def import_decisions(
+    file: UploadFile = File(...),
+    team_id: Optional[str] = None,
+    import_format: Optional[Literal["ndjson", "csv"]] = Query(None, alias="format", description="Defaults to the file extension"),
+    skip: int = Query(0, ge=0, description="Records to skip, e.g. a previous run's checkpoint"),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=50000),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
-    """Update a decision"""
+    """Import decisions from an NDJSON or CSV upload in batched inserts (see importer.py)"""
+    if team_id:
+        memberships.require_member(team_id)
+    import_format = import_format or ("csv" if (file.filename or "").endswith(".csv") else "ndjson")
+    # The upload is spooled to disk, so it is read line by line here
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    summary = run_import(db, stream, import_format, current_user.id, team_id, batch_size, skip)
+    if summary["error"]:
+        # Batches before the checkpoint are committed; retry with skip=checkpoint
+        return JSONResponse(status_code=500, content=ImportSummary(**summary).model_dump())
+    return summary
+
+
+def _get_authorized_decision(db: Session, decision_id: str, memberships: Memberships, action: str) -> Decision:
     db_decision = db.query(Decision).filter(Decision.id == decision_id).first()
     
     if not db_decision:
         raise HTTPException(status_code=404, detail="Decision not found")
-
-    # Check permissions: owner OR team member
-    is_owner = db_decision.user_id == current_user.id
-    is_team_member = False
-    
-    if db_decision.team_id:
-        from models import TeamMember
-        team_membership = db.query(TeamMember).filter(
-            TeamMember.team_id == db_decision.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if team_membership:
-            is_team_member = True
     
-    if not (is_owner or is_team_member):
-        raise HTTPException(status_code=403, detail="Not authorized to update this decision")
-    
-    if not db_decision:
+    # Owner OR team member
+    memberships.require_access(db_decision.user_id, db_decision.team_id, f"Not authorized to {action} this decision")
+    return db_decision
+
+
+@router.get("/{decision_id}", response_model=DecisionResponse)
+def get_decision(
+    request: Request,
+    response: Response,
+    decision_id: str,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """A single decision, without its comments, votes or tags"""
+    require_decision_access(db, memberships, decision_id, "view")
+    check_etag(db, request, response, current_user.id, [f"decision:{decision_id}"])
+    decision = db.get(Decision, decision_id)
+    if decision is None:
         raise HTTPException(status_code=404, detail="Decision not found")
+    return decision
+
+
+@router.put("/{decision_id}", response_model=DecisionResponse)
+def update_decision(
+    decision_id: str,
+    decision: DecisionUpdate,
+    db: Session = Depends(get_db),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Update a decision"""
+    db_decision = _get_authorized_decision(db, decision_id, memberships, "update")
     
     update_data = decision.dict(exclude_unset=True)
     for key, value in update_data.items():
@@ -136,32 +724,108 @@ def update_decision(
 def delete_decision(
     decision_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Delete a decision"""
-    """Delete a decision"""
-    # Find decision by ID first
-    db_decision = db.query(Decision).filter(Decision.id == decision_id).first()
-    
-    if not db_decision:
-        raise HTTPException(status_code=404, detail="Decision not found")
-        
-    # Check permissions: owner OR team member
-    is_owner = db_decision.user_id == current_user.id
-    is_team_member = False
-    
-    if db_decision.team_id:
-        from models import TeamMember
-        team_membership = db.query(TeamMember).filter(
-            TeamMember.team_id == db_decision.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if team_membership:
-            is_team_member = True
-    
-    if not (is_owner or is_team_member):
-        raise HTTPException(status_code=403, detail="Not authorized to delete this decision")
+    db_decision = _get_authorized_decision(db, decision_id, memberships, "delete")
     
     db.delete(db_decision)
     db.commit()
     return {"detail": "Decision deleted successfully"}
+
+
+# --- Bulk operations --------------------------------------------------------
+# The sync and async handlers share these: one lookup for the whole batch,
+# a pure planning pass, then one statement per kind of write.
+
+def bulk_target_query(operations: List[BulkOperation]):
+    """Owner and team of every decision the batch updates or deletes"""
+    ids = {op.id for op in operations if op.op != "create" and op.id}
+    if not ids:
+        return None
+    return decision_owners_query(ids)
+
+
+def plan_bulk(operations: List[BulkOperation], memberships: Memberships, targets: dict):
+    """
+    Validate and authorize every operation without touching the database.
+    targets maps decision id -> (user_id, team_id). Returns the per-item
+    results and the rows to insert, the rows to update and the ids to delete.
+    """
+    results, inserts, updates, deletes = [], [], [], []
+    seen = set()
+    for index, operation in enumerate(operations):
+        result = {"index": index, "op": operation.op, "id": operation.id, "status": 200, "detail": None}
+        results.append(result)
+        try:
+            if operation.op == "create":
+                data = DecisionCreate(**(operation.data or {}))
+                if data.team_id and not memberships.is_member(data.team_id):
+                    result.update(status=403, detail="Not a member of this team")
+                    continue
+                row = {**data.model_dump(), "id": generate_uuid(), "user_id": memberships.user_id}
+                result["id"] = row["id"]
+                inserts.append(row)
+                continue
+            
+            if not operation.id:
+                result.update(status=400, detail="id is required")
+                continue
+            if operation.id in seen:
+                result.update(status=400, detail="Decision appears more than once in this batch")
+                continue
+            seen.add(operation.id)
+            if operation.id not in targets:
+                result.update(status=404, detail="Decision not found")
+                continue
+            if not memberships.can_access(*targets[operation.id]):
+                result.update(status=403, detail=f"Not authorized to {operation.op} this decision")
+                continue
+            
+            if operation.op == "update":
+                changes = DecisionUpdate(**(operation.data or {})).model_dump(exclude_unset=True)
+                if changes:
+                    updates.append({**changes, "id": operation.id})
+            else:
+                deletes.append(operation.id)
+        except ValidationError as e:
+            result.update(status=422, detail="; ".join(
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+            ))
+    return results, inserts, updates, deletes
+
+
+def bulk_write_statements(inserts: list, updates: list, deletes: list) -> list:
+    """(statement, parameters) pairs that apply a planned batch"""
+    statements = []
+    if inserts:
+        statements.append((insert(Decision), inserts))
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany per set of changed columns
+        statements.append((update(Decision), updates))
+    if deletes:
+        # Children first; SQLite does not enforce ON DELETE CASCADE by default
+        for model in (Comment, Vote, DecisionTag):
+            statements.append((delete(model).where(model.decision_id.in_(deletes)), None))
+        statements.append((delete(Decision).where(Decision.id.in_(deletes)), None))
+    return statements
+
+
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_decisions(
+    request: BulkRequest,
+    db: Session = Depends(get_db),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Create, update and delete many decisions in one transaction. Items that
+    fail validation or permission checks are reported and skipped"""
+    operations = request.operations
+    target_query = bulk_target_query(operations)
+    targets = {row.id: (row.user_id, row.team_id) for row in db.execute(target_query)} if target_query is not None else {}
+    
+    results, inserts, updates, deletes = plan_bulk(operations, memberships, targets)
+    for statement, params in bulk_write_statements(inserts, updates, deletes):
+        db.execute(statement, params)
+    db.commit()
+    
+    return {"applied": len(inserts) + len(updates) + len(deletes), "results": results}
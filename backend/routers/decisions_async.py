@@ -0,0 +1,239 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from database import get_async_db, get_async_read_db
+from models import Decision, User
+from auth import get_current_user_async
+from authz import Memberships, get_memberships_async, require_decision_access
+from etags import check_etag
+from routers.decisions import (
+    DecisionCreate, DecisionUpdate, DecisionResponse, DecisionListResponse, DecisionSearchPage,
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, search_terms, decision_search_query, build_search_page,
+    decision_list_query, page_size, build_page, projected_fields, project_rows,
+    DecisionFilters, decision_filters, count_decisions, list_scopes, search_scopes,
+    BulkRequest, BulkResponse, bulk_target_query, plan_bulk, bulk_write_statements,
+    DecisionDetail, decision_detail_query, build_decision_detail,
+    export_includes, export_query, export_tags_query, export_votes_query, export_header,
+    encode_export_batch, export_response
+)
+
+# AsyncSession implementation of routers/decisions.py, mounted ahead of it when ASYNC_DB is set
+router = APIRouter(
+    prefix="/decisions",
+    tags=["decisions"]
+)
+
+
+async def _get_authorized_decision(db: AsyncSession, decision_id: str, memberships: Memberships, action: str) -> Decision:
+    db_decision = (await db.execute(select(Decision).where(Decision.id == decision_id))).scalars().first()
+    
+    if not db_decision:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    
+    # Owner OR team member
+    memberships.require_access(db_decision.user_id, db_decision.team_id, f"Not authorized to {action} this decision")
+    return db_decision
+
+
+@router.get("/", response_model=DecisionListResponse)
+async def get_decisions(
+    request: Request,
+    response: Response,
+    team_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    view: Optional[str] = Query(None, pattern="^(full|summary)$"),
+    fields: Optional[str] = None,
+    include_total: bool = False,
+    filters: DecisionFilters = Depends(decision_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Get decisions for user or team. Passing limit and/or cursor returns
+    a keyset-paginated page: {items, next_cursor}. view=summary or
+    fields=id,title,... return only those columns. include_total adds
+    total (and total_is_estimate) to the page"""
+    if team_id:
+        memberships.require_member(team_id)
+    size = page_size(limit, cursor, include_total)
+    columns = projected_fields(view, fields)
+    await db.run_sync(check_etag, request, response, current_user.id, list_scopes(current_user.id, team_id))
+    result = await db.execute(decision_list_query(current_user.id, team_id, cursor, size, columns, filters))
+    rows = result.all() if columns else result.scalars().all()
+    
+    if size is None:
+        return project_rows(rows, columns)
+    page = build_page(rows, size, columns)
+    if include_total:
+        page["total"], page["total_is_estimate"] = await db.run_sync(
+            count_decisions, decision_list_query(current_user.id, team_id, filters=filters)
+        )
+    return page
+
+
+@router.get("/search", response_model=DecisionSearchPage)
+async def search_decisions(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1),
+    team_id: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Full-text search over title, context, choice_made and notes of the
+    decisions the user can see, ranked by relevance"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and not search_terms(q):
+        return {"items": [], "next_cursor": None}
+    await db.run_sync(check_etag, request, response, current_user.id, search_scopes(memberships))
+    rows = (await db.execute(decision_search_query(dialect, current_user.id, memberships.team_ids, q, team_id, cursor, limit))).all()
+    return build_search_page(rows, limit)
+
+
+@router.post("/", response_model=DecisionResponse)
+async def create_decision(
+    decision: DecisionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Create a new decision"""
+    if decision.team_id:
+        memberships.require_member(decision.team_id)
+    db_decision = Decision(
+        user_id=current_user.id,
+        team_id=decision.team_id,
+        title=decision.title,
+        context=decision.context,
+        choice_made=decision.choice_made,
+        confidence_level=decision.confidence_level,
+        status=decision.status,
+        outcome=decision.outcome,
+        notes=decision.notes
+    )
+    db.add(db_decision)
+    await db.commit()
+    await db.refresh(db_decision)
+    return db_decision
+
+
+@router.get("/export")
+async def export_decisions(
+    team_id: Optional[str] = None,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    include: Optional[str] = Query(None, description="Comma-separated: tags, votes"),
+    filters: DecisionFilters = Depends(decision_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Stream the user's or a team's decisions as NDJSON or CSV"""
+    if team_id:
+        memberships.require_member(team_id)
+    includes = export_includes(include)
+    query = export_query(current_user.id, team_id, filters)
+
+    async def stream():
+        yield export_header(export_format, includes)
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            ids = [row.id for row in rows]
+            tag_rows = (await db.execute(export_tags_query(ids))).all() if "tags" in includes else ()
+            vote_rows = (await db.execute(export_votes_query(ids))).all() if "votes" in includes else ()
+            yield encode_export_batch(export_format, rows, includes, tag_rows, vote_rows)
+
+    return export_response(stream(), export_format)
+
+
+@router.get("/{decision_id}/full", response_model=DecisionDetail)
+async def get_decision_detail(
+    request: Request,
+    response: Response,
+    decision_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """A decision with its comments, vote summary and tags"""
+    await db.run_sync(require_decision_access, memberships, decision_id, "view")
+    await db.run_sync(check_etag, request, response, current_user.id, [f"decision:{decision_id}"])
+    decision = (await db.execute(decision_detail_query(decision_id))).scalars().first()
+    if decision is None:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    return build_decision_detail(decision, current_user.id)
+
+
+@router.get("/{decision_id}", response_model=DecisionResponse)
+async def get_decision(
+    request: Request,
+    response: Response,
+    decision_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """A single decision, without its comments, votes or tags"""
+    await db.run_sync(require_decision_access, memberships, decision_id, "view")
+    await db.run_sync(check_etag, request, response, current_user.id, [f"decision:{decision_id}"])
+    decision = await db.get(Decision, decision_id)
+    if decision is None:
+        raise HTTPException(status_code=404, detail="Decision not found")
+    return decision
+
+
+@router.put("/{decision_id}", response_model=DecisionResponse)
+async def update_decision(
+    decision_id: str,
+    decision: DecisionUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Update a decision"""
+    db_decision = await _get_authorized_decision(db, decision_id, memberships, "update")
+    
+    update_data = decision.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_decision, key, value)
+    
+    await db.commit()
+    await db.refresh(db_decision)
+    return db_decision
+
+
+@router.delete("/{decision_id}")
+async def delete_decision(
+    decision_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Delete a decision"""
+    db_decision = await _get_authorized_decision(db, decision_id, memberships, "delete")
+    
+    await db.delete(db_decision)
+    await db.commit()
+    return {"detail": "Decision deleted successfully"}
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_decisions(
+    request: BulkRequest,
+    db: AsyncSession = Depends(get_async_db),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Create, update and delete many decisions in one transaction. Items that
+    fail validation or permission checks are reported and skipped"""
+    operations = request.operations
+    target_query = bulk_target_query(operations)
+    targets = {row.id: (row.user_id, row.team_id) for row in await db.execute(target_query)} if target_query is not None else {}
+    
+    results, inserts, updates, deletes = plan_bulk(operations, memberships, targets)
+    for statement, params in bulk_write_statements(inserts, updates, deletes):
+        await db.execute(statement, params)
+    await db.commit()
+    
+    return {"applied": len(inserts) + len(updates) + len(deletes), "results": results}
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List
@@ -6,6 +6,8 @@ from datetime import datetime
 from database import get_db
 from models import Tag, DecisionTag, User
 from auth import get_current_user
+from authz import Memberships, get_memberships, require_decision_access
+from etags import check_etag
 
 router = APIRouter(
     prefix="/tags",
@@ -31,10 +33,13 @@ class DecisionTagRequest(BaseModel):
 
 @router.get("/", response_model=List[TagResponse])
 def get_tags(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all tags for user"""
+    check_etag(db, request, response, current_user.id, [f"tags:user:{current_user.id}"])
     return db.query(Tag).filter(Tag.user_id == current_user.id).all()
 
 
@@ -76,9 +81,10 @@ def delete_tag(
 def add_tag_to_decision(
     request: DecisionTagRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Add tag to decision"""
+    require_decision_access(db, memberships, request.decision_id, "tag")
     dt = DecisionTag(decision_id=request.decision_id, tag_id=request.tag_id)
     db.add(dt)
     db.commit()
@@ -89,9 +95,10 @@ def add_tag_to_decision(
 def remove_tag_from_decision(
     request: DecisionTagRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Remove tag from decision"""
+    require_decision_access(db, memberships, request.decision_id, "tag")
     db.query(DecisionTag).filter(
         DecisionTag.decision_id == request.decision_id,
         DecisionTag.tag_id == request.tag_id
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
@@ -6,6 +7,8 @@ from datetime import datetime
 from database import get_db
 from models import Team, TeamMember, User
 from auth import get_current_user
+from authz import Memberships, get_memberships, invalidate_memberships
+from etags import check_etag
 import random
 import string
 
@@ -39,27 +42,29 @@ class JoinTeamRequest(BaseModel):
 
 @router.get("/", response_model=List[TeamResponse])
 def get_teams(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Get all teams for user"""
-    memberships = db.query(TeamMember).filter(
-        TeamMember.user_id == current_user.id
-    ).all()
+    check_etag(db, request, response, current_user.id, [f"teams:user:{current_user.id}"])
+    if not memberships.team_ids:
+        return []
     
-    teams = []
-    for membership in memberships:
-        team = db.query(Team).filter(Team.id == membership.team_id).first()
-        if team:
-            teams.append({
-                "id": team.id,
-                "name": team.name,
-                "description": team.description,
-                "invite_code": team.invite_code,
-                "created_at": team.created_at,
-                "role": membership.role
-            })
-    return teams
+    teams = db.query(Team).filter(Team.id.in_(memberships.team_ids)).order_by(Team.created_at).all()
+    return [
+        {
+            "id": team.id,
+            "name": team.name,
+            "description": team.description,
+            "invite_code": team.invite_code,
+            "created_at": team.created_at,
+            "role": memberships.role(team.id)
+        }
+        for team in teams
+    ]
 
 
 @router.post("/", response_model=TeamResponse)
@@ -109,7 +114,7 @@ def join_team(
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     
-    # Check if already member
+    # Check if already member (against the table: this worker's membership cache may lag another's join)
     existing = db.query(TeamMember).filter(
         TeamMember.team_id == team.id,
         TeamMember.user_id == current_user.id
@@ -124,7 +129,12 @@ def join_team(
         role="member"
     )
     db.add(membership)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent join of the same user committed first
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Already a member")
     
     return {
         "id": team.id,
@@ -140,18 +150,16 @@ def join_team(
 def delete_team(
     team_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Delete a team (owner only)"""
-    membership = db.query(TeamMember).filter(
-        TeamMember.team_id == team_id,
-        TeamMember.user_id == current_user.id,
-        TeamMember.role == "owner"
-    ).first()
-    
-    if not membership:
+    if memberships.role(team_id) != "owner":
         raise HTTPException(status_code=403, detail="Not authorized")
     
+    # Bulk deletes skip the ORM listeners, so drop every member's cached memberships here
+    member_ids = [user_id for (user_id,) in db.query(TeamMember.user_id).filter(TeamMember.team_id == team_id)]
+    db.query(TeamMember).filter(TeamMember.team_id == team_id).delete()
     db.query(Team).filter(Team.id == team_id).delete()
     db.commit()
+    invalidate_memberships(*member_ids)
     return {"detail": "Team deleted successfully"}
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-from database import get_db
-from models import Vote, User
+from database import get_db, get_read_db
+from models import Vote, VoteTally, User, generate_uuid
 from auth import get_current_user
+from authz import Memberships, get_memberships, require_decision_access, decision_owners_query
+from etags import check_etag
+from cursors import encode_cursor, decode_cursor
 
 router = APIRouter(
     prefix="/votes",
@@ -34,72 +39,169 @@ class VoteSummary(BaseModel):
     abstain_count: int
     user_vote: Optional[str]
     voters: List[dict]
+    next_voters_cursor: Optional[str] = None
+
+class VoteSummariesRequest(BaseModel):
+    decision_ids: List[str] = Field(..., min_length=1, max_length=200)
+
+class VoteTallySummary(BaseModel):
+    decision_id: str
+    approve_count: int
+    reject_count: int
+    abstain_count: int
+    user_vote: Optional[str]
+
+class VoteSummariesResponse(BaseModel):
+    summaries: List[VoteTallySummary]
+    unavailable: List[str]  # missing, or not visible to the caller
+
+MAX_VOTERS_PAGE = 200
+VOTE_CHOICES = ["approve", "reject", "abstain"]
+
+
+def summarize_votes(decision_id: str, ballots: list, current_user_id: str) -> dict:
+    """VoteSummary from (user_id, voter name or None, vote) per vote"""
+    return {
+        "decision_id": decision_id,
+        "approve_count": sum(1 for _, _, vote in ballots if vote == "approve"),
+        "reject_count": sum(1 for _, _, vote in ballots if vote == "reject"),
+        "abstain_count": sum(1 for _, _, vote in ballots if vote == "abstain"),
+        "user_vote": next((vote for user_id, _, vote in ballots if user_id == current_user_id), None),
+        "voters": [
+            {"user_id": user_id, "name": name if name is not None else "Unknown", "vote": vote}
+            for user_id, name, vote in ballots
+        ],
+    }
+
+
+# Counts come from vote_tallies (kept in step with votes by triggers), so a
+# summary is a fixed handful of indexed lookups however many people voted.
+
+def vote_tallies_query(decision_ids):
+    return select(VoteTally.decision_id, VoteTally.approve, VoteTally.reject, VoteTally.abstain).where(
+        VoteTally.decision_id.in_(list(decision_ids))
+    )
+
+
+def own_votes_query(decision_ids, user_id: str):
+    return select(Vote.decision_id, Vote.vote).where(Vote.decision_id.in_(list(decision_ids)), Vote.user_id == user_id)
+
+
+def voters_query(decision_id: str, cursor: Optional[str] = None, limit: Optional[int] = None):
+    """A decision's voters with their names, oldest vote first; keyset-paged when limit is set"""
+    query = (
+        select(Vote.id, Vote.created_at, Vote.user_id, User.full_name, Vote.vote)
+        .outerjoin(User, User.id == Vote.user_id)
+        .where(Vote.decision_id == decision_id)
+    )
+    if cursor:
+        query = query.where(tuple_(Vote.created_at, Vote.id) > decode_cursor(cursor))
+    query = query.order_by(Vote.created_at, Vote.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    return query
+
+
+def vote_summary(decision_id: str, tally, user_vote: Optional[str], voter_rows: list, limit: Optional[int] = None) -> dict:
+    """VoteSummary from a vote_tallies row (or None), the caller's vote and a voters page"""
+    page = voter_rows[:limit] if limit is not None else voter_rows
+    return {
+        "decision_id": decision_id,
+        **{f"{choice}_count": getattr(tally, choice) if tally else 0 for choice in VOTE_CHOICES},
+        "user_vote": user_vote,
+        "voters": [
+            {"user_id": row.user_id, "name": row.full_name if row.full_name is not None else "Unknown", "vote": row.vote}
+            for row in page
+        ],
+        "next_voters_cursor": encode_cursor(page[-1]) if limit is not None and len(voter_rows) > limit else None,
+    }
+
+
+def vote_summaries(decision_ids: List[str], visible: List[str], tallies: list, own_votes: list) -> dict:
+    """VoteSummariesResponse in request order from the three set-based lookups"""
+    tally_by_id = {row.decision_id: row for row in tallies}
+    own_by_id = dict(own_votes)
+    requested = list(dict.fromkeys(decision_ids))
+    visible = set(visible)
+    return {
+        "summaries": [
+            {
+                "decision_id": decision_id,
+                **{f"{choice}_count": getattr(tally_by_id.get(decision_id), choice, 0) for choice in VOTE_CHOICES},
+                "user_vote": own_by_id.get(decision_id),
+            }
+            for decision_id in requested if decision_id in visible
+        ],
+        "unavailable": [decision_id for decision_id in requested if decision_id not in visible],
+    }
 
 
 @router.get("/decision/{decision_id}", response_model=VoteSummary)
 def get_votes(
+    request: Request,
+    response: Response,
     decision_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    voters_limit: Optional[int] = Query(None, ge=1, le=MAX_VOTERS_PAGE, description="Page the voter list; all voters if omitted"),
+    voters_cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Get vote summary for a decision"""
-    votes = db.query(Vote).filter(Vote.decision_id == decision_id).all()
-    
-    approve_count = sum(1 for v in votes if v.vote == "approve")
-    reject_count = sum(1 for v in votes if v.vote == "reject")
-    abstain_count = sum(1 for v in votes if v.vote == "abstain")
-    
-    user_vote = next((v.vote for v in votes if v.user_id == current_user.id), None)
-    
-    voters = []
-    for v in votes:
-        user = db.query(User).filter(User.id == v.user_id).first()
-        voters.append({
-            "user_id": v.user_id,
-            "name": user.full_name if user else "Unknown",
-            "vote": v.vote
-        })
-    
-    return {
-        "decision_id": decision_id,
-        "approve_count": approve_count,
-        "reject_count": reject_count,
-        "abstain_count": abstain_count,
-        "user_vote": user_vote,
-        "voters": voters
-    }
+    require_decision_access(db, memberships, decision_id, "view")
+    check_etag(db, request, response, current_user.id, [f"decision:{decision_id}"])
+    tally = db.execute(vote_tallies_query([decision_id])).first()
+    own = db.execute(own_votes_query([decision_id], current_user.id)).first()
+    voters = db.execute(voters_query(decision_id, voters_cursor, voters_limit)).all()
+    return vote_summary(decision_id, tally, own.vote if own else None, voters, voters_limit)
+
+
+@router.post("/summaries", response_model=VoteSummariesResponse)
+def get_vote_summaries(
+    request: VoteSummariesRequest,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
+):
+    """Tallies and the caller's vote for many decisions (e.g. a dashboard page) in three queries"""
+    owners = db.execute(decision_owners_query(request.decision_ids)).all()
+    visible = [row.id for row in memberships.accessible(owners)]
+    tallies = db.execute(vote_tallies_query(visible)).all() if visible else []
+    own = db.execute(own_votes_query(visible, current_user.id)).all() if visible else []
+    return vote_summaries(request.decision_ids, visible, tallies, own)
+
+
+def vote_upsert_statement(dialect: str, decision_id: str, user_id: str, vote: str):
+    """
+    Cast or change a vote in one statement: INSERT ... ON CONFLICT
+    (decision_id, user_id) DO UPDATE ... RETURNING the row. The unique index
+    makes concurrent casts by the same user converge on a single row.
+    """
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = insert(Vote).values(id=generate_uuid(), decision_id=decision_id, user_id=user_id, vote=vote)
+    statement = statement.on_conflict_do_update(
+        index_elements=[Vote.decision_id, Vote.user_id],
+        set_={"vote": statement.excluded.vote},
+    )
+    return statement.returning(Vote.id, Vote.decision_id, Vote.user_id, Vote.vote, Vote.created_at)
 
 
 @router.post("/", response_model=VoteResponse)
 def cast_vote(
     vote: VoteCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Cast or update a vote"""
-    if vote.vote not in ["approve", "reject", "abstain"]:
+    if vote.vote not in VOTE_CHOICES:
         raise HTTPException(status_code=400, detail="Invalid vote type")
+    require_decision_access(db, memberships, vote.decision_id, "vote on")
     
-    existing = db.query(Vote).filter(
-        Vote.decision_id == vote.decision_id,
-        Vote.user_id == current_user.id
-    ).first()
-    
-    if existing:
-        existing.vote = vote.vote
-        db.commit()
-        db.refresh(existing)
-        return existing
-    else:
-        db_vote = Vote(
-            decision_id=vote.decision_id,
-            user_id=current_user.id,
-            vote=vote.vote
-        )
-        db.add(db_vote)
-        db.commit()
-        db.refresh(db_vote)
-        return db_vote
+    statement = vote_upsert_statement(db.get_bind().dialect.name, vote.decision_id, current_user.id, vote.vote)
+    row = db.execute(statement).one()
+    db.commit()
+    return row
 
 
 @router.delete("/decision/{decision_id}")
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from database import get_async_db, get_async_read_db
+from models import Vote, User
+from auth import get_current_user_async
+from authz import Memberships, get_memberships_async, require_decision_access, decision_owners_query
+from etags import check_etag
+from routers.votes import (
+    VoteCreate, VoteResponse, VoteSummary, MAX_VOTERS_PAGE, VoteSummariesRequest, VoteSummariesResponse,
+    VOTE_CHOICES, vote_tallies_query, own_votes_query, voters_query, vote_summary, vote_summaries,
+    vote_upsert_statement
+)
+
+# AsyncSession implementation of routers/votes.py, mounted ahead of it when ASYNC_DB is set
+router = APIRouter(
+    prefix="/votes",
+    tags=["votes"]
+)
+
+
+@router.get("/decision/{decision_id}", response_model=VoteSummary)
+async def get_votes(
+    request: Request,
+    response: Response,
+    decision_id: str,
+    voters_limit: Optional[int] = Query(None, ge=1, le=MAX_VOTERS_PAGE, description="Page the voter list; all voters if omitted"),
+    voters_cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Get vote summary for a decision"""
+    await db.run_sync(require_decision_access, memberships, decision_id, "view")
+    await db.run_sync(check_etag, request, response, current_user.id, [f"decision:{decision_id}"])
+    tally = (await db.execute(vote_tallies_query([decision_id]))).first()
+    own = (await db.execute(own_votes_query([decision_id], current_user.id))).first()
+    voters = (await db.execute(voters_query(decision_id, voters_cursor, voters_limit))).all()
+    return vote_summary(decision_id, tally, own.vote if own else None, voters, voters_limit)
+
+
+@router.post("/summaries", response_model=VoteSummariesResponse)
+async def get_vote_summaries(
+    request: VoteSummariesRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Tallies and the caller's vote for many decisions (e.g. a dashboard page) in three queries"""
+    owners = (await db.execute(decision_owners_query(request.decision_ids))).all()
+    visible = [row.id for row in memberships.accessible(owners)]
+    tallies = (await db.execute(vote_tallies_query(visible))).all() if visible else []
+    own = (await db.execute(own_votes_query(visible, current_user.id))).all() if visible else []
+    return vote_summaries(request.decision_ids, visible, tallies, own)
+
+
+@router.post("/", response_model=VoteResponse)
+async def cast_vote(
+    vote: VoteCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+    memberships: Memberships = Depends(get_memberships_async)
+):
+    """Cast or update a vote"""
+    if vote.vote not in VOTE_CHOICES:
+        raise HTTPException(status_code=400, detail="Invalid vote type")
+    await db.run_sync(require_decision_access, memberships, vote.decision_id, "vote on")
+    
+    statement = vote_upsert_statement(db.get_bind().dialect.name, vote.decision_id, current_user.id, vote.vote)
+    row = (await db.execute(statement)).one()
+    await db.commit()
+    return row
+
+
+@router.delete("/decision/{decision_id}")
+async def remove_vote(
+    decision_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Remove user's vote"""
+    await db.execute(delete(Vote).where(
+        Vote.decision_id == decision_id,
+        Vote.user_id == current_user.id
+    ))
+    await db.commit()
+    return {"detail": "Vote removed successfully"}
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
-from database import get_db
-from models import Whiteboard, User, TeamMember
+from database import get_db, get_read_db
+from models import Whiteboard, User
 from auth import get_current_user
+from authz import Memberships, get_memberships
+from etags import check_etag
 import json
 
 router = APIRouter(
@@ -35,66 +37,67 @@ class WhiteboardResponse(BaseModel):
     class Config:
         from_attributes = True
 
+def _require_board_access(wb, memberships: Memberships):
+    # Team boards: any member; personal boards: the owner only
+    if wb.team_id:
+        memberships.require_member(wb.team_id, detail="Not authorized")
+    elif wb.user_id != memberships.user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
 @router.get("/", response_model=List[WhiteboardResponse])
 def get_whiteboards(
+    request: Request,
+    response: Response,
     team_id: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     """Get whiteboards for user or team"""
     query = db.query(Whiteboard)
     
     if team_id:
         # Verify membership
-        member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if not member:
-            raise HTTPException(status_code=403, detail="Not a member of this team")
+        memberships.require_member(team_id)
         query = query.filter(Whiteboard.team_id == team_id)
+        scope = f"whiteboards:team:{team_id}"
     else:
         # Personal whiteboards
         query = query.filter(Whiteboard.user_id == current_user.id, Whiteboard.team_id.is_(None))
+        scope = f"whiteboards:user:{current_user.id}"
     
+    check_etag(db, request, response, current_user.id, [scope])
     return query.order_by(Whiteboard.updated_at.desc()).all()
 
 @router.get("/{wb_id}", response_model=WhiteboardResponse)
 def get_whiteboard(
+    request: Request,
+    response: Response,
     wb_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
-    wb = db.query(Whiteboard).filter(Whiteboard.id == wb_id).first()
+    # Only the columns the access check needs; the board data loads after the ETag check
+    wb = db.query(Whiteboard.user_id, Whiteboard.team_id).filter(Whiteboard.id == wb_id).first()
     if not wb:
         raise HTTPException(status_code=404, detail="Whiteboard not found")
     
     # Check access
-    if wb.team_id:
-        member = db.query(TeamMember).filter(
-            TeamMember.team_id == wb.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if not member:
-            raise HTTPException(status_code=403, detail="Not authorized")
-    elif wb.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return wb
+    _require_board_access(wb, memberships)
+    
+    check_etag(db, request, response, current_user.id, [f"whiteboard:{wb_id}"])
+    return db.query(Whiteboard).filter(Whiteboard.id == wb_id).first()
 
 @router.post("/", response_model=WhiteboardResponse)
 def create_whiteboard(
     wb: WhiteboardCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    memberships: Memberships = Depends(get_memberships)
 ):
     if wb.team_id:
-        member = db.query(TeamMember).filter(
-            TeamMember.team_id == wb.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if not member:
-            raise HTTPException(status_code=403, detail="Not a member of this team")
+        memberships.require_member(wb.team_id)
 
     db_wb = Whiteboard(
         user_id=current_user.id,
@@ -112,22 +115,14 @@ def update_whiteboard(
     wb_id: str,
     wb_update: WhiteboardUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    memberships: Memberships = Depends(get_memberships)
 ):
     db_wb = db.query(Whiteboard).filter(Whiteboard.id == wb_id).first()
     if not db_wb:
         raise HTTPException(status_code=404, detail="Whiteboard not found")
 
     # Check update permissions (simplified: owner or team member)
-    if db_wb.team_id:
-        member = db.query(TeamMember).filter(
-            TeamMember.team_id == db_wb.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
-        if not member:
-             raise HTTPException(status_code=403, detail="Not authorized")
-    elif db_wb.user_id != current_user.id:
-         raise HTTPException(status_code=403, detail="Not authorized")
+    _require_board_access(db_wb, memberships)
 
     if wb_update.name is not None:
         db_wb.name = wb_update.name
@@ -4,6 +4,12 @@ Tests all endpoints: auth, decisions, tags, comments, votes, teams
 """
 
 import requests
+import base64
+import csv
+import io
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import time
 import random
 import string
@@ -151,6 +157,193 @@ def test_update_decision():
         print_result("Update decision", False, str(e))
         return False
 
+def test_paginate_decisions():
+    """Test walking decisions with limit/cursor keyset pagination"""
+    try:
+        for i in range(2):
+            requests.post(f"{BASE_URL}/decisions/", json={"title": f"Page Decision {i}"}, headers=auth_header())
+        seen = []
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            res = requests.get(f"{BASE_URL}/decisions/", params=params, headers=auth_header())
+            if res.status_code != 200:
+                break
+            page = res.json()
+            seen.extend(d["id"] for d in page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        full = [d["id"] for d in requests.get(f"{BASE_URL}/decisions/", headers=auth_header()).json()]
+        crafted = base64.urlsafe_b64encode(json.dumps(["2024-01-01T00:00:00", {"x": 1}]).encode()).decode()
+        bad = requests.get(f"{BASE_URL}/decisions/", params={"cursor": crafted}, headers=auth_header())
+        passed = res.status_code == 200 and len(seen) == 3 and seen == full and bad.status_code == 400
+        print_result("Paginate decisions", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Paginate decisions", False, str(e))
+        return False
+
+def test_decision_summary_view():
+    """Test view=summary and fields= return only the projected columns"""
+    try:
+        res = requests.get(f"{BASE_URL}/decisions/", params={"view": "summary", "limit": 2}, headers=auth_header())
+        summary = res.json()["items"] if res.status_code == 200 else []
+        fields_res = requests.get(f"{BASE_URL}/decisions/", params={"fields": "id,title"}, headers=auth_header())
+        bad = requests.get(f"{BASE_URL}/decisions/", params={"fields": "id,password"}, headers=auth_header())
+        passed = (
+            res.status_code == 200 and len(summary) == 2
+            and all("title" in d and "context" not in d and "notes" not in d for d in summary)
+            and fields_res.status_code == 200
+            and all(set(d) == {"id", "title"} for d in fields_res.json())
+            and bad.status_code == 400
+        )
+        print_result("Decision summary view", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Decision summary view", False, str(e))
+        return False
+
+def test_bulk_decisions():
+    """Test a mixed create/update/delete batch with per-item results"""
+    try:
+        res = requests.post(f"{BASE_URL}/decisions/bulk", json={"operations": [
+            {"op": "create", "data": {"title": "Bulk A"}},
+            {"op": "create", "data": {"title": "Bulk B", "status": "reviewed"}},
+            {"op": "create", "data": {"context": "missing title"}},
+        ]}, headers=auth_header())
+        created = [r["id"] for r in res.json()["results"][:2]]
+        res2 = requests.post(f"{BASE_URL}/decisions/bulk", json={"operations": [
+            {"op": "update", "id": created[0], "data": {"outcome": "success"}},
+            {"op": "delete", "id": created[1]},
+            {"op": "delete", "id": "does-not-exist"},
+        ]}, headers=auth_header())
+        statuses = [r["status"] for r in res.json()["results"] + res2.json()["results"]]
+        ids = {d["id"]: d for d in requests.get(f"{BASE_URL}/decisions/", headers=auth_header()).json()}
+        passed = (
+            statuses == [200, 200, 422, 200, 200, 404]
+            and res2.json()["applied"] == 2
+            and ids.get(created[0], {}).get("outcome") == "success"
+            and created[1] not in ids
+        )
+        print_result("Bulk decisions", passed, res2.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Bulk decisions", False, str(e))
+        return False
+
+def test_search_decisions():
+    """Test full-text search ranks matching decisions and skips the rest"""
+    try:
+        requests.post(f"{BASE_URL}/decisions/bulk", json={"operations": [
+            {"op": "create", "data": {"title": "Choose a message broker", "context": "Kafka or RabbitMQ"}},
+            {"op": "create", "data": {"title": "Office snacks", "notes": "kafka-themed cookies"}},
+            {"op": "create", "data": {"title": "Hiring plan"}},
+        ]}, headers=auth_header())
+        res = requests.get(f"{BASE_URL}/decisions/search", params={"q": "kafka"}, headers=auth_header())
+        titles = [d["title"] for d in res.json()["items"]] if res.status_code == 200 else []
+        page = requests.get(f"{BASE_URL}/decisions/search", params={"q": "kafka", "limit": 1}, headers=auth_header()).json()
+        rest = requests.get(f"{BASE_URL}/decisions/search", params={"q": "kafka", "limit": 1, "cursor": page["next_cursor"]}, headers=auth_header()).json()
+        passed = (
+            titles == ["Choose a message broker", "Office snacks"]
+            and [d["title"] for d in page["items"] + rest["items"]] == titles
+            and rest["next_cursor"] is None
+        )
+        print_result("Search decisions", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Search decisions", False, str(e))
+        return False
+
+def test_filter_decisions():
+    """Test server-side status/confidence/tag filters with a total count"""
+    try:
+        ops = [{"op": "create", "data": {"title": f"Filter {i}", "confidence_level": i, "status": "reviewed" if i % 2 else "pending", "outcome": "failure"}}
+               for i in range(1, 6)]
+        res = requests.post(f"{BASE_URL}/decisions/bulk", json={"operations": ops}, headers=auth_header())
+        ids = [r["id"] for r in res.json()["results"]]
+        tag_a = requests.post(f"{BASE_URL}/tags/", json={"name": f"FilterA{random.randint(1000,9999)}"}, headers=auth_header()).json()["id"]
+        tag_b = requests.post(f"{BASE_URL}/tags/", json={"name": f"FilterB{random.randint(1000,9999)}"}, headers=auth_header()).json()["id"]
+        for decision_id, tag_id in [(ids[0], tag_a), (ids[1], tag_a), (ids[1], tag_b), (ids[2], tag_b)]:
+            requests.post(f"{BASE_URL}/tags/decision", json={"decision_id": decision_id, "tag_id": tag_id}, headers=auth_header())
+        
+        def titles(params):
+            page = requests.get(f"{BASE_URL}/decisions/", params={**params, "include_total": "true"}, headers=auth_header()).json()
+            return sorted(d["title"] for d in page["items"]), page["total"]
+        
+        reviewed = titles({"status": "reviewed", "outcome": ["failure", "unknown"], "min_confidence": 2, "created_after": "2000-01-01T00:00:00Z"})
+        any_tag = titles({"tag": [tag_a, tag_b]})
+        all_tags = titles({"tag": [tag_a, tag_b], "tag_match": "all"})
+        passed = (
+            reviewed == (["Filter 3", "Filter 5"], 2)
+            and any_tag == (["Filter 1", "Filter 2", "Filter 3"], 3)
+            and all_tags == (["Filter 2"], 1)
+        )
+        print_result("Filter decisions", passed, f"{reviewed} {any_tag} {all_tags}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Filter decisions", False, str(e))
+        return False
+
+def test_conditional_get():
+    """Test If-None-Match gets a 304 until the decision list changes"""
+    try:
+        first = requests.get(f"{BASE_URL}/decisions/", headers=auth_header())
+        etag = first.headers.get("ETag")
+        repeat = requests.get(f"{BASE_URL}/decisions/", headers={**auth_header(), "If-None-Match": etag})
+        requests.post(f"{BASE_URL}/decisions/", json={"title": "ETag buster"}, headers=auth_header())
+        changed = requests.get(f"{BASE_URL}/decisions/", headers={**auth_header(), "If-None-Match": etag})
+        passed = (
+            bool(etag) and repeat.status_code == 304 and repeat.content == b""
+            and changed.status_code == 200 and changed.headers.get("ETag") != etag
+        )
+        print_result("Conditional GET", passed, f"{etag} {repeat.status_code} {changed.status_code}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Conditional GET", False, str(e))
+        return False
+
+def test_analytics_summary():
+    """Test the analytics summary follows decision writes"""
+    try:
+        url = f"{BASE_URL}/analytics/summary"
+        before = requests.get(url, headers=auth_header()).json()
+        listed = requests.get(f"{BASE_URL}/decisions/?include_total=true&limit=1", headers=auth_header()).json()
+        requests.post(f"{BASE_URL}/decisions/", json={"title": "Analytics sample", "outcome": "success", "confidence_level": 5}, headers=auth_header())
+        after = requests.get(url, headers=auth_header()).json()
+        weekly = requests.get(f"{url}?bucket=week&periods=4", headers=auth_header()).json()
+        level5 = lambda summary: next(c for c in summary["confidence"] if c["level"] == 5)
+        passed = (
+            before["total"] == listed["total"]
+            and after["total"] == before["total"] + 1
+            and after["by_outcome"]["success"] == before["by_outcome"]["success"] + 1
+            and level5(after)["success"] == level5(before)["success"] + 1
+            and len(after["periods"]) == 6 and after["periods"][-1]["total"] == before["periods"][-1]["total"] + 1
+            and len(weekly["periods"]) == 4 and weekly["periods"][-1]["total"] >= 1
+        )
+        print_result("Analytics summary", passed, f"{before} {after}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Analytics summary", False, str(e))
+        return False
+
+def test_decision_stats():
+    """Test the running stats agree with the aggregated summary"""
+    try:
+        stats = requests.get(f"{BASE_URL}/analytics/stats", headers=auth_header()).json()
+        summary = requests.get(f"{BASE_URL}/analytics/summary", headers=auth_header()).json()
+        passed = (
+            stats["total"] == summary["total"] and stats["success"] == summary["by_outcome"]["success"]
+            and stats["pending"] == summary["by_status"]["pending"]
+        )
+        print_result("Decision stats", passed, f"{stats} {summary}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Decision stats", False, str(e))
+        return False
+
 def test_create_tag():
     """Test creating a tag"""
     global test_tag_id
@@ -218,6 +411,66 @@ def test_update_comment():
         print_result("Update comment", False, str(e))
         return False
 
+def test_paginate_comments():
+    """Test comment pages walk the full list with authors, and counts match it"""
+    try:
+        for n in range(2):
+            requests.post(f"{BASE_URL}/comments/", json={"decision_id": test_decision_id, "content": f"Reply {n}"}, headers=auth_header())
+        full = requests.get(f"{BASE_URL}/comments/decision/{test_decision_id}", headers=auth_header()).json()
+        paged, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = requests.get(f"{BASE_URL}/comments/decision/{test_decision_id}", params=params, headers=auth_header()).json()
+            paged.extend(page["items"])
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        missing = str(uuid.uuid4())
+        res = requests.post(f"{BASE_URL}/comments/counts", json={"decision_ids": [test_decision_id, missing]}, headers=auth_header())
+        counts = res.json()
+        bad_cursor = requests.get(f"{BASE_URL}/comments/decision/{test_decision_id}?cursor=nope", headers=auth_header())
+        passed = (
+            len(full) == 3 and [c["id"] for c in paged] == [c["id"] for c in full]
+            and all(c["author"] and c["author"]["id"] == c["user_id"] for c in paged)
+            and res.status_code == 200 and counts["counts"] == [{"decision_id": test_decision_id, "count": 3}]
+            and counts["unavailable"] == [missing]
+            and bad_cursor.status_code == 400
+        )
+        print_result("Paginate comments", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Paginate comments", False, str(e))
+        return False
+
+def test_comment_threads():
+    """Test replies come back as threads, single levels and subtrees in thread order"""
+    try:
+        def post(content, parent_id):
+            return requests.post(f"{BASE_URL}/comments/", json={"decision_id": test_decision_id, "content": content, "parent_id": parent_id}, headers=auth_header())
+        reply = post("First reply", test_comment_id).json()
+        nested = post("Nested reply", reply["id"]).json()
+        second = post("Second reply", test_comment_id).json()
+        orphan = post("Lost reply", str(uuid.uuid4()))
+        threads = requests.get(f"{BASE_URL}/comments/decision/{test_decision_id}/threads?replies=2", headers=auth_header()).json()
+        thread = next(t for t in threads["items"] if t["id"] == test_comment_id)
+        level = requests.get(f"{BASE_URL}/comments/{test_comment_id}/replies", headers=auth_header()).json()
+        subtree = requests.get(f"{BASE_URL}/comments/{test_comment_id}/thread", headers=auth_header()).json()
+        passed = (
+            reply["parent_id"] == test_comment_id and nested["depth"] == 2 and orphan.status_code == 404
+            and all(t["depth"] == 0 for t in threads["items"])
+            and sorted(c["id"] for c in level["items"]) == sorted([reply["id"], second["id"]])
+            # Same-second siblings order by id; either way a reply's own replies follow it directly
+            and [c["id"] for c in subtree["items"]] == [test_comment_id] + [
+                i for c in level["items"] for i in ([c["id"], nested["id"]] if c["id"] == reply["id"] else [c["id"]])
+            ]
+            and [r["id"] for r in thread["replies"]] == [c["id"] for c in subtree["items"][1:3]] and thread["more_replies"]
+        )
+        print_result("Comment threads", passed, json.dumps(threads) if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Comment threads", False, str(e))
+        return False
+
 def test_create_team():
     """Test creating a team"""
     global test_team_id
@@ -236,6 +489,39 @@ def test_create_team():
         print_result("Create team", False, str(e))
         return False
 
+def test_team_access():
+    """Test a non-member gets 403 listing, creating in, importing into or chatting in a team,
+    or reading a team decision's comments, until they join; comments on a missing decision are 404"""
+    try:
+        other = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": random_email(), "password": "testpassword123", "full_name": "Other User"
+        }).json()
+        other_header = {"Authorization": f"Bearer {other['access_token']}"}
+        team_decision = requests.post(f"{BASE_URL}/decisions/", json={"title": "Team only", "team_id": test_team_id}, headers=auth_header()).json()
+        
+        refused = [
+            requests.get(f"{BASE_URL}/decisions/", params={"team_id": test_team_id}, headers=other_header).status_code,
+            requests.post(f"{BASE_URL}/decisions/", json={"title": "Sneaky", "team_id": test_team_id}, headers=other_header).status_code,
+            requests.post(f"{BASE_URL}/decisions/import", params={"team_id": test_team_id}, headers=other_header,
+                          files={"file": ("sneaky.ndjson", b'{"title": "Sneaky"}\n')}).status_code,
+            requests.get(f"{BASE_URL}/chat/{test_team_id}", headers=other_header).status_code,
+            requests.get(f"{BASE_URL}/comments/decision/{team_decision['id']}", headers=other_header).status_code,
+        ]
+        missing = requests.get(f"{BASE_URL}/comments/decision/{uuid.uuid4()}", headers=other_header).status_code
+        invite_code = next(t["invite_code"] for t in requests.get(f"{BASE_URL}/teams/", headers=auth_header()).json() if t["id"] == test_team_id)
+        requests.post(f"{BASE_URL}/teams/join", json={"invite_code": invite_code}, headers=other_header)
+        allowed = requests.get(f"{BASE_URL}/decisions/", params={"team_id": test_team_id}, headers=other_header)
+        
+        passed = (
+            refused == [403] * 5 and missing == 404
+            and allowed.status_code == 200 and team_decision["id"] in [d["id"] for d in allowed.json()]
+        )
+        print_result("Team access", passed, f"{refused} {missing} {allowed.status_code}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Team access", False, str(e))
+        return False
+
 def test_get_teams():
     """Test getting user's teams"""
     try:
@@ -273,6 +559,158 @@ def test_get_votes():
         print_result("Get votes", False, str(e))
         return False
 
+def test_concurrent_votes():
+    """Test many simultaneous casts by one user leave exactly one vote"""
+    try:
+        choices = ["approve", "reject", "abstain"]
+        def cast(n):
+            return requests.post(f"{BASE_URL}/votes/", json={"decision_id": test_decision_id, "vote": choices[n % 3]}, headers=auth_header())
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            responses = list(pool.map(cast, range(64)))
+        final = cast(0)
+        summary = requests.get(f"{BASE_URL}/votes/decision/{test_decision_id}", headers=auth_header()).json()
+        ids = {r.json()["id"] for r in responses if r.status_code == 200}
+        passed = (
+            all(r.status_code == 200 for r in responses) and len(ids) == 1 and final.json()["id"] in ids
+            and summary["approve_count"] == 1 and summary["reject_count"] == 0 and summary["abstain_count"] == 0
+            and len(summary["voters"]) == 1
+        )
+        print_result("Concurrent votes", passed, f"{[r.status_code for r in responses]} {ids} {summary}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Concurrent votes", False, str(e))
+        return False
+
+def test_vote_voters_page():
+    """Test the voter list pages without changing the tallies"""
+    try:
+        url = f"{BASE_URL}/votes/decision/{test_decision_id}"
+        page = requests.get(f"{url}?voters_limit=1", headers=auth_header()).json()
+        bad = requests.get(f"{url}?voters_limit=1&voters_cursor=garbage", headers=auth_header())
+        passed = (
+            page["approve_count"] == 1 and page["user_vote"] == "approve"
+            and len(page["voters"]) == 1 and page["next_voters_cursor"] is None
+            and bad.status_code == 400
+        )
+        print_result("Vote voters page", passed, f"{page} {bad.status_code}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Vote voters page", False, str(e))
+        return False
+
+def test_vote_summaries():
+    """Test batch vote summaries match the single-decision summary and hide foreign decisions"""
+    try:
+        single = requests.get(f"{BASE_URL}/votes/decision/{test_decision_id}", headers=auth_header()).json()
+        missing = str(uuid.uuid4())
+        res = requests.post(f"{BASE_URL}/votes/summaries", json={"decision_ids": [test_decision_id, missing, test_decision_id]}, headers=auth_header())
+        batch = res.json()
+        too_many = requests.post(f"{BASE_URL}/votes/summaries", json={"decision_ids": [missing] * 201}, headers=auth_header())
+        summary = batch["summaries"][0] if batch.get("summaries") else {}
+        passed = (
+            res.status_code == 200 and len(batch["summaries"]) == 1 and batch["unavailable"] == [missing]
+            and all(summary[k] == single[k] for k in ("approve_count", "reject_count", "abstain_count", "user_vote"))
+            and too_many.status_code == 422
+        )
+        print_result("Vote summaries", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Vote summaries", False, str(e))
+        return False
+
+def test_decision_detail():
+    """Test the composite detail matches the separate comment/vote endpoints"""
+    try:
+        requests.post(f"{BASE_URL}/tags/decision", json={"decision_id": test_decision_id, "tag_id": test_tag_id}, headers=auth_header())
+        res = requests.get(f"{BASE_URL}/decisions/{test_decision_id}/full", headers=auth_header())
+        detail = res.json()
+        comments = requests.get(f"{BASE_URL}/comments/decision/{test_decision_id}", headers=auth_header()).json()
+        votes = requests.get(f"{BASE_URL}/votes/decision/{test_decision_id}", headers=auth_header()).json()
+        repeat = requests.get(f"{BASE_URL}/decisions/{test_decision_id}/full", headers={**auth_header(), "If-None-Match": res.headers.get("ETag")})
+        passed = (
+            res.status_code == 200 and detail["id"] == test_decision_id
+            and [c["id"] for c in detail["comments"]] == [c["id"] for c in comments]
+            and all(c["author"] and c["author"]["id"] == c["user_id"] for c in detail["comments"])
+            and detail["votes"] == votes
+            and test_tag_id in [t["id"] for t in detail["tags"]]
+            and repeat.status_code == 304
+        )
+        print_result("Decision detail", passed, res.text if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Decision detail", False, str(e))
+        return False
+
+def test_get_decision():
+    """Test fetching a single decision for the edit page, and a missing one"""
+    try:
+        res = requests.get(f"{BASE_URL}/decisions/{test_decision_id}", headers=auth_header())
+        missing = requests.get(f"{BASE_URL}/decisions/{uuid.uuid4()}", headers=auth_header())
+        passed = (
+            res.status_code == 200 and res.json()["id"] == test_decision_id
+            and "comments" not in res.json() and missing.status_code == 404
+        )
+        print_result("Get decision", passed, f"{res.text} {missing.status_code}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Get decision", False, str(e))
+        return False
+
+def test_export_decisions():
+    """Test NDJSON and CSV exports stream every decision with tags and vote tallies"""
+    try:
+        listed = requests.get(f"{BASE_URL}/decisions/?include_total=true&limit=1", headers=auth_header()).json()
+        res = requests.get(f"{BASE_URL}/decisions/export?include=tags,votes", headers=auth_header(), stream=True)
+        records = [json.loads(line) for line in res.iter_lines() if line]
+        exported = next(r for r in records if r["id"] == test_decision_id)
+        csv_res = requests.get(f"{BASE_URL}/decisions/export?format=csv&include=votes", headers=auth_header())
+        csv_rows = list(csv.DictReader(io.StringIO(csv_res.text)))
+        bad = requests.get(f"{BASE_URL}/decisions/export?include=everything", headers=auth_header())
+        passed = (
+            res.headers["content-type"].startswith("application/x-ndjson")
+            and len(records) == listed["total"] == len(csv_rows)
+            and exported["votes"]["approve"] == 1 and len(exported["tags"]) == 1
+            and next(r for r in csv_rows if r["id"] == test_decision_id)["votes_approve"] == "1"
+            and bad.status_code == 400
+        )
+        print_result("Export decisions", passed, f"{len(records)} {listed['total']} {len(csv_rows)} {exported}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Export decisions", False, str(e))
+        return False
+
+def test_import_decisions():
+    """Test NDJSON/CSV import: rejects bad records, skips known ids, resolves tags, resumes"""
+    try:
+        known_id = str(uuid.uuid4())
+        ndjson = "\n".join([
+            json.dumps({"title": "Imported A", "tags": ["imported", "batch"]}),
+            json.dumps({"id": known_id, "title": "Imported B", "outcome": "success", "created_at": "2020-01-05T10:00:00Z"}),
+            json.dumps({"context": "no title"}),
+            "not json",
+        ])
+        upload = lambda body, name="decisions.ndjson", query="": requests.post(
+            f"{BASE_URL}/decisions/import{query}", files={"file": (name, body)}, headers=auth_header()
+        ).json()
+        first = upload(ndjson)
+        again = upload(ndjson, query="?skip=1")
+        csv_result = upload("title,tags,confidence_level\nCSV import,imported;csv,4\n", name="decisions.csv")
+        tags = [t["name"] for t in requests.get(f"{BASE_URL}/tags/", headers=auth_header()).json()]
+        imported = requests.get(f"{BASE_URL}/decisions/search?q=Imported", headers=auth_header()).json()
+        passed = (
+            first["imported"] == 2 and first["rejected"] == 2 and [e["record"] for e in first["errors"]] == [3, 4]
+            and first["checkpoint"] == 4
+            and again["processed"] == 3 and again["imported"] == 0 and again["skipped_existing"] == 1
+            and csv_result["imported"] == 1
+            and {"imported", "batch", "csv"} <= set(tags) and tags.count("imported") == 1
+            and any(item["id"] == known_id for item in imported["items"])
+        )
+        print_result("Import decisions", passed, f"{first} {again} {csv_result}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Import decisions", False, str(e))
+        return False
+
 def test_delete_comment():
     """Test deleting a comment"""
     try:
@@ -284,6 +722,35 @@ def test_delete_comment():
         print_result("Delete comment", False, str(e))
         return False
 
+def test_delete_comment_with_replies():
+    """Test deleting a comment with replies blanks it and keeps another user's reply; a reply-less one is removed"""
+    try:
+        other = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": random_email(), "password": "testpassword123", "full_name": "Replying User"
+        }).json()
+        other_header = {"Authorization": f"Bearer {other['access_token']}"}
+        invite_code = next(t["invite_code"] for t in requests.get(f"{BASE_URL}/teams/", headers=auth_header()).json() if t["id"] == test_team_id)
+        requests.post(f"{BASE_URL}/teams/join", json={"invite_code": invite_code}, headers=other_header)
+        decision = requests.post(f"{BASE_URL}/decisions/", json={"title": "Discussed", "team_id": test_team_id}, headers=auth_header()).json()
+        comment = requests.post(f"{BASE_URL}/comments/", json={"decision_id": decision["id"], "content": "Opening"}, headers=auth_header()).json()
+        reply = requests.post(f"{BASE_URL}/comments/", json={"decision_id": decision["id"], "content": "Not yours", "parent_id": comment["id"]}, headers=other_header).json()
+        leaf = requests.post(f"{BASE_URL}/comments/", json={"decision_id": decision["id"], "content": "Standalone"}, headers=auth_header()).json()
+        
+        refused = requests.delete(f"{BASE_URL}/comments/{reply['id']}", headers=auth_header()).status_code
+        deleted = [requests.delete(f"{BASE_URL}/comments/{c['id']}", headers=auth_header()).status_code for c in (comment, leaf)]
+        remaining = {c["id"]: c for c in requests.get(f"{BASE_URL}/comments/decision/{decision['id']}", headers=other_header).json()}
+        
+        passed = (
+            refused == 404 and deleted == [200, 200]
+            and remaining[comment["id"]]["content"] == "" and remaining[reply["id"]]["content"] == "Not yours"
+            and leaf["id"] not in remaining
+        )
+        print_result("Delete comment with replies", passed, f"{refused} {deleted} {remaining}" if not passed else "")
+        return passed
+    except Exception as e:
+        print_result("Delete comment with replies", False, str(e))
+        return False
+
 def test_delete_tag():
     """Test deleting a tag"""
     try:
@@ -332,16 +799,35 @@ def run_all_tests():
         ("Create Decision", test_create_decision),
         ("Get Decisions", test_get_decisions),
         ("Update Decision", test_update_decision),
+        ("Paginate Decisions", test_paginate_decisions),
+        ("Decision Summary View", test_decision_summary_view),
+        ("Bulk Decisions", test_bulk_decisions),
+        ("Search Decisions", test_search_decisions),
+        ("Filter Decisions", test_filter_decisions),
+        ("Conditional GET", test_conditional_get),
+        ("Analytics Summary", test_analytics_summary),
+        ("Decision Stats", test_decision_stats),
         ("Create Tag", test_create_tag),
         ("Get Tags", test_get_tags),
         ("Create Comment", test_create_comment),
         ("Get Comments", test_get_comments),
         ("Update Comment", test_update_comment),
+        ("Paginate Comments", test_paginate_comments),
+        ("Comment Threads", test_comment_threads),
         ("Create Team", test_create_team),
         ("Get Teams", test_get_teams),
+        ("Team Access", test_team_access),
         ("Cast Vote", test_create_vote),
         ("Get Votes", test_get_votes),
+        ("Concurrent Votes", test_concurrent_votes),
+        ("Vote Voters Page", test_vote_voters_page),
+        ("Vote Summaries", test_vote_summaries),
+        ("Decision Detail", test_decision_detail),
+        ("Get Decision", test_get_decision),
+        ("Export Decisions", test_export_decisions),
+        ("Import Decisions", test_import_decisions),
         ("Delete Comment", test_delete_comment),
+        ("Delete Comment With Replies", test_delete_comment_with_replies),
         ("Delete Tag", test_delete_tag),
         ("Delete Decision", test_delete_decision),
         ("Unauthorized Access", test_unauthorized_access),
@@ -0,0 +1,47 @@
+"""
+Password hashing pool tests for DecisionLog
+Runs a real spawn process pool in-process (no server needed):
+
+    python test_hashing.py
+"""
+import asyncio
+import os
+from hashing import PasswordHasher, HashingPoolBroken, verify_password
+
+
+def print_result(test_name: str, passed: bool, details: str = ""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {test_name}")
+    if details and not passed:
+        print(f"       Details: {details}")
+    return passed
+
+
+def test_broken_pool_is_rebuilt():
+    """A worker dying fails that call with HashingPoolBroken; the next call gets a fresh pool"""
+    hasher = PasswordHasher(workers=1, max_pending=4)
+
+    async def scenario():
+        broken = hasher._get_executor()
+        try:
+            await hasher._run(os._exit, 1)
+            failed = None
+        except HashingPoolBroken as e:
+            failed = e
+        new_hash = await hasher.hash("poolpass123")
+        return broken, failed, new_hash
+
+    try:
+        broken, failed, new_hash = asyncio.run(scenario())
+        passed = (
+            isinstance(failed, HashingPoolBroken)
+            and hasher._executor is not broken
+            and verify_password("poolpass123", new_hash)[0]
+        )
+    finally:
+        hasher.shutdown()
+    assert print_result("Broken hashing pool is rebuilt", passed, f"{failed!r} {new_hash[:30]}")
+
+
+if __name__ == "__main__":
+    test_broken_pool_is_rebuilt()
@@ -0,0 +1,63 @@
+"""
+Login rehash test for DecisionLog
+Logs in through the async auth router with PASSWORD_REHASH_ON_LOGIN and
+checks the upgraded hash is stored. Runs the app in-process against a
+scratch SQLite file (no server needed):
+
+    python test_rehash.py
+"""
+import os
+import tempfile
+
+SCRATCH_DB = os.path.join(tempfile.gettempdir(), "test_rehash.db")
+for suffix in ("", "-wal", "-shm"):
+    if os.path.exists(SCRATCH_DB + suffix):
+        os.remove(SCRATCH_DB + suffix)
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{SCRATCH_DB}",
+    "ASYNC_DB": "true",
+    "PASSWORD_REHASH_ON_LOGIN": "true",
+    "PASSWORD_HASH_WORKERS": "0",
+})
+
+from fastapi.testclient import TestClient
+from passlib.hash import sha256_crypt
+from database import SessionLocal
+from hashing import PASSWORD_HASH_ROUNDS
+from models import User
+from main import app
+
+
+def print_result(test_name: str, passed: bool, details: str = ""):
+    status = "✅ PASS" if passed else "❌ FAIL"
+    print(f"{status}: {test_name}")
+    if details and not passed:
+        print(f"       Details: {details}")
+    return passed
+
+
+def stored_hash(email: str) -> str:
+    with SessionLocal() as db:
+        return db.query(User).filter(User.email == email).one().password_hash
+
+
+def test_async_login_saves_rehash():
+    """A hash made with other rounds is replaced on async login"""
+    email = "rehash@example.com"
+    old_rounds = PASSWORD_HASH_ROUNDS + 1000
+    with SessionLocal() as db:
+        db.add(User(email=email, password_hash=sha256_crypt.using(rounds=old_rounds).hash("rehashpass123"), full_name="Rehash"))
+        db.commit()
+    with TestClient(app) as client:
+        res = client.post("/auth/login", json={"email": email, "password": "rehashpass123"})
+    new_hash = stored_hash(email)
+    passed = (
+        res.status_code == 200
+        and sha256_crypt.from_string(new_hash).rounds == PASSWORD_HASH_ROUNDS
+        and sha256_crypt.verify("rehashpass123", new_hash)
+    )
+    return print_result("Async login stores the rehashed password", passed, f"{res.status_code} {new_hash[:30]}")
+
+
+if __name__ == "__main__":
+    test_async_login_saves_rehash()
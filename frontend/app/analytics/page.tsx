@@ -9,17 +9,21 @@ import {
     Calendar, ArrowLeft, CheckCircle, XCircle, HelpCircle
 } from 'lucide-react'
 
-interface Decision {
-    id: string
-    title: string
-    confidence_level: number
-    status: 'pending' | 'in_progress' | 'reviewed' | 'done'
-    outcome: 'success' | 'failure' | 'unknown'
-    created_at: string
+type Outcome = 'success' | 'failure' | 'unknown'
+
+interface AnalyticsSummary {
+    total: number
+    by_outcome: Record<Outcome, number>
+    by_status: Record<'pending' | 'in_progress' | 'reviewed' | 'done', number>
+    average_confidence: number | null
+    success_rate: number | null
+    completion_rate: number | null
+    confidence: { level: number, count: number, success: number, success_rate: number | null }[]
+    periods: { period: string, total: number, by_outcome: Record<Outcome, number> }[]
 }
 
 export default function AnalyticsPage() {
-    const [decisions, setDecisions] = useState<Decision[]>([])
+    const [summary, setSummary] = useState<AnalyticsSummary | null>(null)
     const [loading, setLoading] = useState(true)
     const [user, setUser] = useState<any>(null)
     const router = useRouter()
@@ -35,21 +39,22 @@ export default function AnalyticsPage() {
                 return
             }
             setUser(JSON.parse(savedUser))
-            fetchDecisions(token)
+            fetchSummary(token)
         }
         checkUser()
     }, [router])
 
-    const fetchDecisions = async (token: string) => {
+    const fetchSummary = async (token: string) => {
         try {
-            const res = await fetch(`${backendUrl}/decisions/`, {
+            // Aggregated server-side; the response size doesn't grow with the number of decisions
+            const res = await fetch(`${backendUrl}/analytics/summary?bucket=month&periods=6`, {
                 headers: { 'Authorization': `Bearer ${token}` }
             })
             if (res.ok) {
-                setDecisions(await res.json())
+                setSummary(await res.json())
             }
         } catch (error) {
-            console.error("Failed to fetch decisions", error)
+            console.error("Failed to fetch analytics", error)
         } finally {
             setLoading(false)
         }
@@ -57,60 +62,40 @@ export default function AnalyticsPage() {
 
     // Analytics calculations
     const analytics = useMemo(() => {
-        const total = decisions.length
-        const success = decisions.filter(d => d.outcome === 'success').length
-        const failure = decisions.filter(d => d.outcome === 'failure').length
-        const unknown = decisions.filter(d => d.outcome === 'unknown').length
-
-        // Status counts
-        const pending = decisions.filter(d => d.status === 'pending').length
-        const inProgress = decisions.filter(d => d.status === 'in_progress').length
-        const reviewed = decisions.filter(d => d.status === 'reviewed').length
-        const done = decisions.filter(d => d.status === 'done').length
-
-        const avgConfidence = total > 0
-            ? (decisions.reduce((sum, d) => sum + d.confidence_level, 0) / total).toFixed(1)
-            : '0'
+        const total = summary?.total ?? 0
+        const outcomes = summary?.by_outcome ?? { success: 0, failure: 0, unknown: 0 }
+        const statuses = summary?.by_status ?? { pending: 0, in_progress: 0, reviewed: 0, done: 0 }
+        const percent = (rate: number | null | undefined) => Math.round((rate ?? 0) * 100)
 
-        // Monthly breakdown
-        const monthlyData: { [key: string]: { success: number, failure: number, unknown: number } } = {}
-        decisions.forEach(d => {
-            const month = new Date(d.created_at).toLocaleDateString('en-US', { month: 'short', year: 'numeric' })
-            if (!monthlyData[month]) {
-                monthlyData[month] = { success: 0, failure: 0, unknown: 0 }
-            }
-            monthlyData[month][d.outcome]++
-        })
-
-        // Confidence distribution
-        const confidenceDist = [0, 0, 0, 0, 0]
-        decisions.forEach(d => {
-            if (d.confidence_level >= 1 && d.confidence_level <= 5) {
-                confidenceDist[d.confidence_level - 1]++
-            }
-        })
+        // Months with activity, labelled like "Jan 2025"
+        const monthlyData: [string, Record<Outcome, number>][] = (summary?.periods ?? [])
+            .filter(p => p.total > 0)
+            .map(p => [
+                new Date(p.period).toLocaleDateString('en-US', { month: 'short', year: 'numeric', timeZone: 'UTC' }),
+                p.by_outcome
+            ])
 
-        // Success rate by confidence level
-        const successByConfidence = [1, 2, 3, 4, 5].map(level => {
-            const atLevel = decisions.filter(d => d.confidence_level === level)
-            const successes = atLevel.filter(d => d.outcome === 'success').length
-            return atLevel.length > 0 ? Math.round((successes / atLevel.length) * 100) : 0
-        })
+        const levels = summary?.confidence ?? []
 
         return {
             total,
-            success,
-            failure,
-            unknown,
-            statusCounts: { pending, inProgress, reviewed, done },
-            avgConfidence,
-            successRate: total > 0 ? Math.round((success / total) * 100) : 0,
-            completionRate: total > 0 ? Math.round((done / total) * 100) : 0,
-            monthlyData: Object.entries(monthlyData).slice(-6),
-            confidenceDist,
-            successByConfidence
+            success: outcomes.success,
+            failure: outcomes.failure,
+            unknown: outcomes.unknown,
+            statusCounts: {
+                pending: statuses.pending,
+                inProgress: statuses.in_progress,
+                reviewed: statuses.reviewed,
+                done: statuses.done
+            },
+            avgConfidence: (summary?.average_confidence ?? 0).toFixed(1),
+            successRate: percent(summary?.success_rate),
+            completionRate: percent(summary?.completion_rate),
+            monthlyData,
+            confidenceDist: levels.map(l => l.count),
+            successByConfidence: levels.map(l => percent(l.success_rate))
         }
-    }, [decisions])
+    }, [summary])
 
     if (loading) {
         return (
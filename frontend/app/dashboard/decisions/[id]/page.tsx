@@ -21,20 +21,15 @@ export default function EditDecisionPage() {
             }
 
             try {
-                // Fetch all decisions and find the one with matching ID
-                const res = await fetch(`${API_URL}/decisions/`, {
+                const res = await fetch(`${API_URL}/decisions/${id}`, {
                     headers: { 'Authorization': `Bearer ${token}` }
                 })
 
                 if (res.ok) {
-                    const decisions = await res.json()
-                    const found = decisions.find((d: any) => d.id === id)
-                    if (found) {
-                        setDecision(found)
-                    } else {
-                        alert("Decision not found")
-                        router.push('/dashboard')
-                    }
+                    setDecision(await res.json())
+                } else {
+                    alert("Decision not found")
+                    router.push('/dashboard')
                 }
             } catch (error) {
                 console.error("Error fetching decision", error)
@@ -26,6 +26,13 @@ interface Decision {
     team_id?: string
 }
 
+interface DecisionDetail extends Decision {
+    notes: string | null
+    comments: { id: string, content: string, created_at: string, author: { full_name: string | null } | null }[]
+    votes: { approve_count: number, reject_count: number, abstain_count: number, user_vote: string | null }
+    tags: { id: string, name: string }[]
+}
+
 type SortOption = 'newest' | 'oldest' | 'confidence' | 'outcome'
 type FilterOutcome = 'all' | 'success' | 'failure' | 'unknown'
 type FilterStatus = 'all' | 'pending' | 'in_progress' | 'reviewed' | 'done'
@@ -47,6 +54,7 @@ export default function Dashboard() {
     const [showFilters, setShowFilters] = useState(false)
     const [showExport, setShowExport] = useState(false)
     const [selectedTeamId, setSelectedTeamId] = useState<string | null>(null)
+    const [detail, setDetail] = useState<DecisionDetail | null>(null)
 
     const backendUrl = API_BASE_URL
 
@@ -112,6 +120,24 @@ export default function Dashboard() {
         }
     }
 
+    // Read-only view: the decision with its comments, votes and tags in one request
+    const openDetail = async (id: string) => {
+        try {
+            const token = localStorage.getItem('token')
+            if (!token) return
+            const res = await fetch(`${backendUrl}/decisions/${id}/full`, {
+                headers: { 'Authorization': `Bearer ${token}` }
+            })
+            if (res.ok) {
+                setDetail(await res.json())
+            } else {
+                alert("Decision not found")
+            }
+        } catch (error) {
+            console.error("Failed to load decision", error)
+        }
+    }
+
     const handleDelete = async (id: string) => {
         if (!confirm("Delete this decision?")) return
         try {
@@ -506,12 +532,91 @@ export default function Dashboard() {
                     ) : (
                         <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-4 animate-in fade-in slide-in-from-bottom-2 duration-300">
                             {filteredDecisions.map(decision => (
-                                <DecisionCard key={decision.id} decision={decision} onDelete={handleDelete} />
+                                <DecisionCard key={decision.id} decision={decision} onDelete={handleDelete} onOpen={openDetail} />
                             ))}
                         </div>
                     )
                 )}
             </div>
+
+            {/* Decision detail */}
+            {detail && (
+                <div className="fixed inset-0 bg-black/50 flex items-center justify-center z-50" onClick={() => setDetail(null)}>
+                    <div className="notion-card p-6 w-full max-w-2xl mx-4 max-h-[85vh] overflow-y-auto" onClick={e => e.stopPropagation()}>
+                        <div className="flex items-start justify-between gap-4 mb-4">
+                            <div>
+                                <span className="text-[10px] font-medium px-2 py-0.5 rounded-full uppercase tracking-wide bg-[var(--bg-tertiary)] text-[var(--text-secondary)]">
+                                    {detail.status}
+                                </span>
+                                <h3 className="text-lg font-semibold text-[var(--text-primary)] mt-2">{detail.title}</h3>
+                            </div>
+                            <Link href={`/dashboard/decisions/${detail.id}`} className="btn-secondary text-sm shrink-0">
+                                Edit
+                            </Link>
+                        </div>
+
+                        {detail.tags.length > 0 && (
+                            <div className="flex flex-wrap gap-1.5 mb-4">
+                                {detail.tags.map(tag => (
+                                    <span key={tag.id} className="text-xs px-2 py-0.5 rounded-md bg-[var(--bg-tertiary)] text-[var(--text-secondary)]">
+                                        {tag.name}
+                                    </span>
+                                ))}
+                            </div>
+                        )}
+
+                        <div className="space-y-3 text-sm mb-6">
+                            <div>
+                                <p className="text-xs font-medium text-[var(--text-tertiary)] uppercase tracking-wide mb-1">Context</p>
+                                <p className="text-[var(--text-secondary)] whitespace-pre-wrap">{detail.context || "No context provided."}</p>
+                            </div>
+                            {detail.choice_made && (
+                                <div>
+                                    <p className="text-xs font-medium text-[var(--text-tertiary)] uppercase tracking-wide mb-1">Choice made</p>
+                                    <p className="text-[var(--text-secondary)] whitespace-pre-wrap">{detail.choice_made}</p>
+                                </div>
+                            )}
+                            {detail.notes && (
+                                <div>
+                                    <p className="text-xs font-medium text-[var(--text-tertiary)] uppercase tracking-wide mb-1">Notes</p>
+                                    <p className="text-[var(--text-secondary)] whitespace-pre-wrap">{detail.notes}</p>
+                                </div>
+                            )}
+                        </div>
+
+                        <div className="flex items-center gap-4 text-sm mb-6 pt-4 border-t border-[var(--border-default)]">
+                            <span className="text-[var(--accent-green)]">{detail.votes.approve_count} approve</span>
+                            <span className="text-[var(--accent-red)]">{detail.votes.reject_count} reject</span>
+                            <span className="text-[var(--text-tertiary)]">{detail.votes.abstain_count} abstain</span>
+                            {detail.votes.user_vote && (
+                                <span className="ml-auto text-xs text-[var(--text-tertiary)]">You voted {detail.votes.user_vote}</span>
+                            )}
+                        </div>
+
+                        <div>
+                            <p className="text-xs font-medium text-[var(--text-tertiary)] uppercase tracking-wide mb-2">
+                                Comments ({detail.comments.length})
+                            </p>
+                            {detail.comments.length === 0 ? (
+                                <p className="text-sm text-[var(--text-tertiary)]">No comments yet</p>
+                            ) : (
+                                <div className="space-y-3">
+                                    {detail.comments.map(comment => (
+                                        <div key={comment.id} className="text-sm">
+                                            <p className="text-xs text-[var(--text-tertiary)]">
+                                                {comment.author?.full_name || 'Unknown'} · {new Date(comment.created_at).toLocaleDateString('en-US', { month: 'short', day: 'numeric' })}
+                                            </p>
+                                            <p className="text-[var(--text-secondary)] whitespace-pre-wrap">
+                                                {comment.content || <span className="italic text-[var(--text-tertiary)]">Deleted</span>}
+                                            </p>
+                                        </div>
+                                    ))}
+                                </div>
+                            )}
+                        </div>
+                    </div>
+                </div>
+            )}
         </div>
     )
 }
@@ -17,9 +17,10 @@ interface Decision {
 interface Props {
     decision: Decision
     onDelete: (id: string) => void
+    onOpen?: (id: string) => void
 }
 
-export default function DecisionCard({ decision, onDelete }: Props) {
+export default function DecisionCard({ decision, onDelete, onOpen }: Props) {
     const router = useRouter()
     const [showActions, setShowActions] = useState(false)
 
@@ -61,7 +62,7 @@ export default function DecisionCard({ decision, onDelete }: Props) {
     return (
         <div
             className="notion-card p-4 group cursor-pointer hover:shadow-md transition-all duration-200"
-            onClick={() => router.push(`/dashboard/decisions/${decision.id}`)}
+            onClick={() => onOpen ? onOpen(decision.id) : router.push(`/dashboard/decisions/${decision.id}`)}
         >
             {/* Header */}
             <div className="flex items-start justify-between gap-2 mb-3">